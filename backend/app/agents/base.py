@@ -224,6 +224,7 @@ class BaseAgent(ABC):
         response_model: Type[BaseModel],
         system_prompt: Optional[str] = None,
         temperature: float = 0.0,
+        use_cache: bool = False,
         **template_vars: Any
     ) -> BaseModel:
         """
@@ -236,6 +237,8 @@ class BaseAgent(ABC):
             response_model: Pydantic model for structured output
             system_prompt: Optional system prompt for the LLM
             temperature: Sampling temperature
+            use_cache: Reuse a cached response for a repeated prompt. Off by default so
+                repeated agent runs still get fresh content/replies.
             **template_vars: Additional variables for template rendering
 
         Returns:
@@ -249,7 +252,8 @@ class BaseAgent(ABC):
             prompt=prompt,
             response_model=response_model,
             system_prompt=system_prompt,
-            temperature=temperature
+            temperature=temperature,
+            use_cache=use_cache
         )
 
         return result
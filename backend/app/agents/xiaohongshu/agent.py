@@ -127,7 +127,7 @@ class XiaohongshuAgent(BaseAgent):
             user_topic: str=None,
             user_style: str=None,
             user_target_audience: str=None,
-            knowledge_base_path: str = DEFAULT_KNOWLEDGE_PATH,
+            knowledge_base_path: str = str(DEFAULT_KNOWLEDGE_PATH),
             mcp_server_url: str = "http://localhost:18060/mcp",
             **kwargs
     ) -> None:
@@ -147,6 +147,8 @@ class XiaohongshuAgent(BaseAgent):
         self.user_name = user_name
         self.user_id = user_id
         self.task_id = task_id
+        # 绑定了 task_id 的任务日志记录器，创建一次后复用
+        self.task_logger = logger.bind(task_id=task_id, bindtype=LogBindType.TASK_LOG)
         self.knowledge_base_path = knowledge_base_path
         self.user_query = user_query
         self.user_topic = user_topic
@@ -865,7 +867,7 @@ class XiaohongshuAgent(BaseAgent):
         interaction_count = interaction_count or self.interaction_note_count
         interaction_count = max(1, min(5, interaction_count))
         
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"开始搜索主题相关笔记进行互动: 主题={topic}, 数量={interaction_count}"
         )
         
@@ -874,7 +876,7 @@ class XiaohongshuAgent(BaseAgent):
             search_results = await self.search_feeds(keyword=topic, limit=interaction_count)
             
             if not search_results:
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).warning(
+                self.task_logger.warning(
                     f"未搜索到主题相关的笔记: {topic}"
                 )
                 return {"success": False, "message": "未搜索到相关笔记", "interacted_count": 0}
@@ -943,7 +945,7 @@ class XiaohongshuAgent(BaseAgent):
                             await asyncio.sleep(random.randint(2, 5))
                             like_result = await self.like_feed(feed_id=feed_id, xsec_token=xsec_token, unlike=False)
                             if like_result.get('success'):
-                                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                                self.task_logger.info(
                                     f"点赞笔记成功: feed_id={feed_id}"
                                 )
                             
@@ -951,7 +953,7 @@ class XiaohongshuAgent(BaseAgent):
                             await asyncio.sleep(random.randint(2, 5))
                             favorite_result = await self.favorite_feed(feed_id=feed_id, xsec_token=xsec_token, unfavorite=False)
                             if favorite_result.get('success'):
-                                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                                self.task_logger.info(
                                     f"收藏笔记成功: feed_id={feed_id}"
                                 )
                             
@@ -971,7 +973,7 @@ class XiaohongshuAgent(BaseAgent):
                                         xsec_token=xsec_token
                                     )
                                     if comment_result.get('success'):
-                                        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                                        self.task_logger.info(
                                             f"评论笔记成功: feed_id={feed_id}, 评论={comment_obj.content[:50]}..."
                                         )
                                 except Exception as e:
@@ -994,7 +996,7 @@ class XiaohongshuAgent(BaseAgent):
                     logger.warning(f"处理搜索结果失败: {e}")
                     continue
             
-            logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+            self.task_logger.info(
                 f"主题笔记互动完成: 成功互动 {interacted_count} 条笔记"
             )
             
@@ -1071,7 +1073,7 @@ class XiaohongshuAgent(BaseAgent):
         评论自己的历史笔记（抽取自原 run 方法）
         """
         previous_notes_title = await self.get_n_last_notes_title(self.comment_note_nums)
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"获取到的前{self.comment_note_nums}篇笔记标题: {previous_notes_title}"
         )
         
@@ -1087,18 +1089,18 @@ class XiaohongshuAgent(BaseAgent):
                 note_id, xsecToken = note_info['data']['note']['noteId'], note_info['data']['note']['xsecToken']
                 logger.debug(f"获取到的id和token：{note_id}, {xsecToken}")
                 # 评论该笔记
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                self.task_logger.info(
                     f"开始评论笔记: {note_title}"
                 )
                 new_comments_obj = await self.generate_comment(note_content=note_content, comments=comments)
                 new_comments = new_comments_obj.content
 
                 await self.post_comment(feed_id=note_id, content=new_comments, xsec_token=xsecToken)
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                self.task_logger.info(
                     f"发表评论{new_comments[:50]}成功"
                 )
             except Exception as e:
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).warning(
+                self.task_logger.warning(
                     f"评论历史笔记{note_title}失败：{e}"
                 )
                 continue
@@ -1125,7 +1127,7 @@ class XiaohongshuAgent(BaseAgent):
             user_query=self.user_query,
             previous_notes_title=previous_notes_title
         )
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"生成的小红书内容: {res}"
         )
 
@@ -1135,7 +1137,7 @@ class XiaohongshuAgent(BaseAgent):
             task_id=self.task_id, 
             output_dir=get_user_images_path(self.user_id)
         )
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"根据生成内容生成小红书海报图片：{generate_image_path}"
         )
 
@@ -1146,7 +1148,7 @@ class XiaohongshuAgent(BaseAgent):
             tags=res.get('tags'),
             images=[generate_image_path]
         )
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"小红书笔记发布完成"
         )
 
@@ -1156,7 +1158,7 @@ class XiaohongshuAgent(BaseAgent):
             res['create_time'] = datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S')
             res['task_id'] = self.task_id
             f.write(json.dumps(res, ensure_ascii=False) + '\n')
-        logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+        self.task_logger.info(
             f"账号{self.user_id}, 任务{self.task_id}完成记录"
         )
 
@@ -1191,7 +1193,7 @@ class XiaohongshuAgent(BaseAgent):
             
             if self.mode == TaskMode.STANDARD:
                 # 标准模式：互动 + 发布
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                self.task_logger.info(
                     "执行标准模式：互动主题笔记 → 评论历史笔记 → 发布新笔记"
                 )
                 
@@ -1209,7 +1211,7 @@ class XiaohongshuAgent(BaseAgent):
                 
             elif self.mode == TaskMode.INTERACTION:
                 # 互动模式：仅互动
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                self.task_logger.info(
                     "执行互动模式：互动主题笔记 → 评论历史笔记"
                 )
                 
@@ -1224,7 +1226,7 @@ class XiaohongshuAgent(BaseAgent):
                 
             elif self.mode == TaskMode.PUBLISH:
                 # 发布模式：仅发布
-                logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG).info(
+                self.task_logger.info(
                     "执行发布模式：发布新笔记"
                 )
                 
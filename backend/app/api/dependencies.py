@@ -26,6 +26,24 @@ def get_dispatcher() -> TaskDispatcher:
     return _dispatcher_instance
 
 
+async def init_dispatcher() -> TaskDispatcher:
+    """
+    在应用启动时创建全局 TaskDispatcher 实例并加载历史任务
+    
+    状态文件读取和各任务的 TaskManager 重建都放到线程池中，任务逐个恢复，不阻塞事件循环
+    
+    Returns:
+        TaskDispatcher: 调度器实例
+    """
+    global _dispatcher_instance
+    if _dispatcher_instance is None:
+        logger.info("初始化 TaskDispatcher 实例（异步加载历史任务）")
+        dispatcher = TaskDispatcher(load_state=False)
+        await dispatcher.load_state_async()
+        _dispatcher_instance = dispatcher
+    return _dispatcher_instance
+
+
 def reset_dispatcher():
     """
     重置调度器实例（主要用于测试）
@@ -165,12 +165,63 @@ async def startup_event():
     except Exception as e:
         logger.error(f"启动时检查注册码状态失败: {e}", exc_info=True)
 
+    # 创建调度器并加载历史任务（文件读取在线程池中进行，TaskManager 在线程池中逐个重建）
+    try:
+        from app.api.dependencies import init_dispatcher
+
+        await init_dispatcher()
+    except Exception as e:
+        logger.error(f"初始化任务调度器失败: {e}", exc_info=True)
+
+    # 后台预热 LLM 连接（TLS 握手），不阻塞启动；未配置 API Key 时跳过
+    try:
+        from app.core.llm import get_llm_service
+
+        app.state.llm_warm_up_task = asyncio.create_task(_warm_up_llm(get_llm_service()))
+    except ValueError:
+        logger.info("未配置 LLM API Key，跳过连接预热")
+    except Exception as e:
+        logger.error(f"LLM 连接预热失败: {e}", exc_info=True)
+
+
+async def _warm_up_llm(llm_service) -> None:
+    """预热 LLM 服务连接池"""
+    if await llm_service.warm_up():
+        logger.info("✅ LLM 连接预热完成")
+    else:
+        logger.warning("⚠️ LLM 连接预热失败，首次调用将重新建立连接")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭事件"""
     logger.info("任务调度器 API 服务关闭")
 
+    # 将调度器中尚未写入的状态落盘
+    try:
+        from app.api import dependencies
+
+        if dependencies._dispatcher_instance is not None:
+            await dependencies._dispatcher_instance.flush_state()
+    except Exception as e:
+        logger.error(f"保存调度器状态失败: {e}", exc_info=True)
+
+    # 关闭注册码验证复用的 HTTP 连接
+    try:
+        from app.core.license_manager import close_http_client
+
+        await close_http_client()
+    except Exception as e:
+        logger.error(f"关闭注册码 HTTP 客户端失败: {e}", exc_info=True)
+
+    # 关闭 LLM 服务共享的 HTTP 连接池
+    try:
+        from app.core.llm import close_http_client as close_llm_http_client
+
+        await close_llm_http_client()
+    except Exception as e:
+        logger.error(f"关闭 LLM HTTP 客户端失败: {e}", exc_info=True)
+
 
 if __name__ == "__main__":
     import uvicorn
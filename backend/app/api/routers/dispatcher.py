@@ -24,17 +24,8 @@ async def get_dispatcher_status(
     """
     all_tasks = dispatcher.all_tasks
     
-    # 统计各状态任务数量
-    status_count = {
-        TaskStatus.PENDING: 0,
-        TaskStatus.RUNNING: 0,
-        TaskStatus.PAUSED: 0,
-        TaskStatus.COMPLETED: 0,
-        TaskStatus.ERROR: 0
-    }
-    
-    for task_info in all_tasks.values():
-        status_count[task_info.status] = status_count.get(task_info.status, 0) + 1
+    # 统计各状态任务数量（直接读取调度器的状态索引）
+    status_count = dispatcher.count_tasks_by_status()
     
     # 获取当前运行的任务信息
     current_running_task = None
@@ -19,9 +19,10 @@ from .context import (
     RuntimeContext,
     HistoryContext,
     ActionLog,
+    StepState,
     StepStatus,
 )
-from .llm import LLMService
+from .llm import LLMService, StructuredOutputTypeError
 from .prompts import PromptEngine, prompt_engine, render_template
 
 __all__ = [
@@ -30,8 +31,10 @@ __all__ = [
     "RuntimeContext",
     "HistoryContext",
     "ActionLog",
+    "StepState",
     "StepStatus",
     "LLMService",
+    "StructuredOutputTypeError",
     "PromptEngine",
     "prompt_engine",
     "render_template",
@@ -9,10 +9,13 @@ Author: Senior Python Backend Architect
 """
 
 import json
+import sys
+import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 
 class MetaContext(BaseModel):
@@ -58,14 +61,23 @@ class MetaContext(BaseModel):
         return v
 
 
+class StepState(str, Enum):
+    """Lifecycle state of an execution plan step."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+
 class StepStatus(BaseModel):
     """Represents the status of an execution plan step."""
 
     step_id: str = Field(description="Unique identifier for the step")
     description: str = Field(description="Description of what the step does")
     agent_name: Optional[str] = Field(default=None, description="Agent responsible for this step")
-    status: str = Field(
-        default="pending",
+    status: StepState = Field(
+        default=StepState.PENDING,
         description="Current status: pending, running, success, failed"
     )
     started_at: Optional[datetime] = Field(default=None, description="When the step started")
@@ -73,14 +85,6 @@ class StepStatus(BaseModel):
     error_message: Optional[str] = Field(default=None, description="Error message if failed")
     result: Optional[Dict[str, Any]] = Field(default=None, description="Step execution result")
 
-    @validator('status')
-    def validate_status(cls, v):
-        """Validate status values."""
-        valid_statuses = {'pending', 'running', 'success', 'failed'}
-        if v not in valid_statuses:
-            raise ValueError(f"Status must be one of: {valid_statuses}")
-        return v
-
 
 class RuntimeContext(BaseModel):
     """
@@ -148,14 +152,16 @@ class RuntimeContext(BaseModel):
             return True
         return False
 
-    def set_step_status(self, step_id: str, status: str, error_message: Optional[str] = None, result: Optional[Dict[str, Any]] = None):
+    def set_step_status(self, step_id: str, status: Union[StepState, str], error_message: Optional[str] = None, result: Optional[Dict[str, Any]] = None):
         """Update the status of a specific step."""
+        # Callers passing the enum skip the string -> enum lookup
+        status = status if isinstance(status, StepState) else StepState(status)
         for step in self.execution_plan:
             if step.step_id == step_id:
                 step.status = status
-                if status == "running" and not step.started_at:
+                if status is StepState.RUNNING and not step.started_at:
                     step.started_at = datetime.now()
-                elif status in {"success", "failed"}:
+                elif status is StepState.SUCCESS or status is StepState.FAILED:
                     step.completed_at = datetime.now()
                     step.error_message = error_message
                     step.result = result
@@ -165,12 +171,29 @@ class RuntimeContext(BaseModel):
 class ActionLog(BaseModel):
     """Represents a single action in the execution history."""
 
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: int = Field(
+        default_factory=time.time_ns,
+        description="Epoch timestamp in nanoseconds when the action was logged"
+    )
     agent_name: str = Field(description="Name of the agent performing the action")
     action: str = Field(description="Description of the action performed")
     result: Optional[Dict[str, Any]] = Field(default=None, description="Action result")
     duration_ms: Optional[int] = Field(default=None, description="Action duration in milliseconds")
 
+    @validator('timestamp', pre=True)
+    def convert_legacy_timestamp(cls, v):
+        """Accept datetime / ISO strings from older serialized contexts."""
+        if isinstance(v, str):
+            v = datetime.fromisoformat(v)
+        if isinstance(v, datetime):
+            return int(v.timestamp() * 1_000_000_000)
+        return v
+
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO-formatted local time, computed only when displayed."""
+        return datetime.fromtimestamp(self.timestamp / 1_000_000_000).isoformat()
+
 
 class HistoryContext(BaseModel):
     """
@@ -223,6 +246,11 @@ class Context(BaseModel):
     runtime: RuntimeContext = Field(description="Dynamic runtime context layer")
     history: HistoryContext = Field(description="Historical context layer")
 
+    # Mutations applied since the last snapshot_base(); None until a base is taken so
+    # contexts that never use delta snapshots record nothing. Only mutations made through
+    # Context methods are captured, not direct edits of runtime/history.
+    _mutation_log: Optional[List[Tuple[Any, ...]]] = PrivateAttr(default=None)
+
     class Config:
         """Pydantic configuration."""
         json_encoders = {
@@ -300,6 +328,123 @@ class Context(BaseModel):
         """
         return cls.model_validate(data)
 
+    # Delta Snapshot Methods
+    def snapshot_base(self) -> str:
+        """
+        Serialize the full state as a new base and reset the mutation log.
+
+        Returns:
+            JSON string of the base state
+        """
+        self._mutation_log = []
+        return self.model_dump_json()
+
+    def get_mutations(self) -> List[Tuple[Any, ...]]:
+        """
+        Get the mutations recorded since the last snapshot_base().
+
+        Returns:
+            List of (operation, *args) tuples
+        """
+        return list(self._mutation_log or ())
+
+    def _record(self, *mutation: Any):
+        """Append a mutation to the log if delta snapshots are active."""
+        if self._mutation_log is not None:
+            self._mutation_log.append(mutation)
+
+    @classmethod
+    def restore(cls, base: str, mutations: List[Tuple[Any, ...]]) -> "Context":
+        """
+        Restore a context from a base snapshot plus the mutations recorded after it.
+
+        Args:
+            base: JSON string returned by snapshot_base()
+            mutations: Mutations returned by get_mutations()
+
+        Returns:
+            Context instance
+        """
+        context = cls.from_json(base)
+        for operation, *args in mutations:
+            if operation == "add_step":
+                context.runtime.execution_plan.append(StepStatus.model_validate(args[0]))
+            elif operation == "log_action":
+                context.history.action_log.append(ActionLog.model_validate(args[0]))
+            elif operation == "set_shared_data":
+                context.runtime.blackboard[args[0]] = args[1]
+            elif operation == "add_memory":
+                context.history.add_memory(args[0])
+            elif operation == "set_step":
+                plan = context.runtime.execution_plan
+                step = StepStatus.model_validate(args[0])
+                for index, existing in enumerate(plan):
+                    if existing.step_id == step.step_id:
+                        plan[index] = step
+                        break
+            elif operation == "set_step_index":
+                context.runtime.current_step_index = args[0]
+            elif operation == "remove_shared_data":
+                context.runtime.blackboard.pop(args[0], None)
+            elif operation == "clear_blackboard":
+                context.runtime.blackboard.clear()
+            elif operation == "set_interrupt_flag":
+                context.runtime.interrupt_flags[args[0]] = args[1]
+            elif operation == "clear_interrupt_flag":
+                context.runtime.interrupt_flags.pop(args[0], None)
+            elif operation == "set_last_checkpoint_at":
+                context.history.last_checkpoint_at = args[0]
+            elif operation == "restore_from_snapshot":
+                context.restore_from_snapshot(args[0])
+            else:
+                raise ValueError(f"Unknown mutation: {operation}")
+        return context
+
+    def add_step(self, description: str, agent_name: Optional[str] = None) -> str:
+        """
+        Add a step to the execution plan and record it in the mutation log.
+
+        Args:
+            description: Description of the step
+            agent_name: Agent responsible for the step
+
+        Returns:
+            Step ID
+        """
+        step_id = self.runtime.add_step(description, agent_name)
+        if self._mutation_log is not None:
+            self._mutation_log.append(("add_step", self.runtime.execution_plan[-1].model_dump()))
+        return step_id
+
+    def set_step_status(self, step_id: str, status: Union[StepState, str], error_message: Optional[str] = None, result: Optional[Dict[str, Any]] = None):
+        """
+        Update the status of a step and record it in the mutation log.
+
+        Args:
+            step_id: Step ID
+            status: New status
+            error_message: Error message for failed steps
+            result: Step result
+        """
+        self.runtime.set_step_status(step_id, status, error_message, result)
+        if self._mutation_log is not None:
+            for step in self.runtime.execution_plan:
+                if step.step_id == step_id:
+                    self._mutation_log.append(("set_step", step.model_dump()))
+                    break
+
+    def advance_to_next_step(self) -> bool:
+        """
+        Move to the next step and record it in the mutation log.
+
+        Returns:
+            True if advanced, False if already at the last step
+        """
+        advanced = self.runtime.advance_to_next_step()
+        if advanced:
+            self._record("set_step_index", self.runtime.current_step_index)
+        return advanced
+
     # Blackboard Access Methods
     def set_shared_data(self, key: str, value: Any):
         """
@@ -309,7 +454,10 @@ class Context(BaseModel):
             key: Data key
             value: Data value
         """
+        # Intern keys so repeated lookups by the same literal hit the fast identity path
+        key = sys.intern(key)
         self.runtime.blackboard[key] = value
+        self._record("set_shared_data", key, value)
 
     def get_shared_data(self, key: str, default: Any = None) -> Any:
         """
@@ -334,11 +482,14 @@ class Context(BaseModel):
         Returns:
             True if key existed and was removed, False otherwise
         """
-        return self.runtime.blackboard.pop(key, None) is not None
+        removed = self.runtime.blackboard.pop(key, None) is not None
+        self._record("remove_shared_data", key)
+        return removed
 
     def clear_blackboard(self):
         """Clear all data from the shared blackboard."""
         self.runtime.blackboard.clear()
+        self._record("clear_blackboard")
 
     # Logging Methods
     def log_action(self, agent_name: str, action: str, result: Optional[Dict[str, Any]] = None, duration_ms: Optional[int] = None):
@@ -352,6 +503,8 @@ class Context(BaseModel):
             duration_ms: Action duration in milliseconds
         """
         self.history.add_action_log(agent_name, action, result, duration_ms)
+        if self._mutation_log is not None:
+            self._mutation_log.append(("log_action", self.history.action_log[-1].model_dump()))
 
     def add_memory(self, memory_entry: str):
         """
@@ -361,6 +514,7 @@ class Context(BaseModel):
             memory_entry: Memory entry text
         """
         self.history.add_memory(memory_entry)
+        self._record("add_memory", memory_entry)
 
     # Interrupt Flag Methods
     def set_interrupt_flag(self, flag: str, value: bool):
@@ -372,6 +526,7 @@ class Context(BaseModel):
             value: Flag value
         """
         self.runtime.interrupt_flags[flag] = value
+        self._record("set_interrupt_flag", flag, value)
 
     def get_interrupt_flag(self, flag: str) -> bool:
         """
@@ -393,6 +548,7 @@ class Context(BaseModel):
             flag: Flag name
         """
         self.runtime.interrupt_flags.pop(flag, None)
+        self._record("clear_interrupt_flag", flag)
 
     # Snapshot and Checkpoint Methods
     def create_snapshot(self, include_history: bool = True) -> Dict[str, Any]:
@@ -429,6 +585,7 @@ class Context(BaseModel):
             self.runtime = RuntimeContext.model_validate(snapshot["runtime"])
         if "history" in snapshot:
             self.history = HistoryContext.model_validate(snapshot["history"])
+        self._record("restore_from_snapshot", snapshot)
 
     def create_checkpoint(self) -> str:
         """
@@ -437,10 +594,26 @@ class Context(BaseModel):
         Returns:
             Checkpoint ID
         """
+        checkpoint_id, _ = self.create_checkpoint_and_snapshot()
+        return checkpoint_id
+
+    def create_checkpoint_and_snapshot(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Create a checkpoint and return its snapshot in a single pass.
+
+        The returned snapshot is the same object stored in the blackboard
+        checkpoint entry, so callers needing both avoid a second full dump.
+        Treat it as read-only.
+
+        Returns:
+            Tuple of (checkpoint ID, snapshot dictionary)
+        """
         checkpoint_id = str(uuid.uuid4())
         self.history.last_checkpoint_at = datetime.now()
-        self.set_shared_data(f"checkpoint_{checkpoint_id}", self.create_snapshot())
-        return checkpoint_id
+        self._record("set_last_checkpoint_at", self.history.last_checkpoint_at)
+        snapshot = self.create_snapshot()
+        self.set_shared_data(f"checkpoint_{checkpoint_id}", snapshot)
+        return checkpoint_id, snapshot
 
     # Utility Methods
     def get_execution_summary(self) -> Dict[str, Any]:
@@ -451,8 +624,8 @@ class Context(BaseModel):
             Execution summary dictionary
         """
         total_steps = len(self.runtime.execution_plan)
-        completed_steps = sum(1 for step in self.runtime.execution_plan if step.status == "success")
-        failed_steps = sum(1 for step in self.runtime.execution_plan if step.status == "failed")
+        completed_steps = sum(1 for step in self.runtime.execution_plan if step.status is StepState.SUCCESS)
+        failed_steps = sum(1 for step in self.runtime.execution_plan if step.status is StepState.FAILED)
 
         return {
             "trace_id": self.meta.trace_id,
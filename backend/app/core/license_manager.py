@@ -9,14 +9,18 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os  # Added import
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 import httpx
+from pydantic import BaseModel, ValidationError
 
 from app.core.logger import logger
 from app.utils.encryption import encrypt_dict, decrypt_dict
@@ -25,31 +29,126 @@ from app.utils.encryption import encrypt_dict, decrypt_dict
 LICENSE_CONFIG_FILENAME = "license_config.encrypted"
 LICENSE_VERIFY_URL = "http://175.24.40.127/api/licenses/verify"
 LICENSE_PRODUCT_ID = 1
+# 项目根目录（开发环境回退路径）与数据目录，导入时解析一次
+_PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent.parent
+_APP_DATA_DIR: Optional[str] = os.getenv("APP_DATA_DIR")
 
+# 复用的 HTTP 客户端（懒加载），避免每次验证都重新建立连接
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
 
-@dataclass
+
+async def _get_client() -> httpx.AsyncClient:
+    """获取全局复用的 AsyncClient（单例，保持长连接）"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """关闭全局 AsyncClient（应用关闭时调用）"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
+class LicenseResponse(BaseModel):
+    """注册机验证接口的响应结构（解析与校验一次完成）"""
+
+    success: bool = False
+    config: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def _parse_end_time(end_time_str: Optional[str]) -> Optional[datetime]:
+    """解析过期时间，无法解析或缺省时返回 None（视为永不过期）"""
+    if not end_time_str:
+        return None
+
+    try:
+        # 允许无时区信息，按本地/UTC 时间解析
+        if end_time_str.endswith("Z"):
+            dt = datetime.fromisoformat(end_time_str.replace("Z", "+00:00"))
+        else:
+            dt = datetime.fromisoformat(end_time_str)
+    except Exception:
+        logger.warning(f"无法解析注册码过期时间: {end_time_str}")
+        return None
+
+    # 统一使用有时区的时间进行比较，避免 naive/aware 混用报错
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeEntitlements:
+    """由注册机 config 派生的运行时权益（加载/激活时构建一次）"""
+
+    task_num: int = 0
+    end_time: Optional[datetime] = None
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "RuntimeEntitlements":
+        return cls(
+            task_num=int(config.get("task_num") or 0),
+            end_time=_parse_end_time(config.get("end_time")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class LicenseConfig:
+    """激活配置（不可变，修改时整体替换）"""
+
     product_id: int
     license_code: str
-    activated_at: str
+    activated_at: int  # 激活时间，UTC 纪元纳秒
     config: Dict[str, Any]
+    # 序列化结果在构造时生成一次，to_dict 直接复用
+    _as_dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_as_dict", {
+            "product_id": self.product_id,
+            "license_code": self.license_code,
+            "activated_at": self.activated_at,
+            "config": self.config,
+        })
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LicenseConfig":
         return cls(
             product_id=data.get("product_id", LICENSE_PRODUCT_ID),
             license_code=data.get("license_code", ""),
-            activated_at=data.get("activated_at", ""),
+            activated_at=cls._parse_activated_at(data.get("activated_at")),
             config=data.get("config") or {},
         )
 
+    @staticmethod
+    def _parse_activated_at(value: Any) -> int:
+        """兼容旧版配置中的 ISO 字符串激活时间"""
+        if isinstance(value, int):
+            return value
+        if not value:
+            return 0
+        try:
+            return int(datetime.fromisoformat(value).timestamp() * 1_000_000_000)
+        except (TypeError, ValueError):
+            return 0
+
+    @property
+    def activated_at_iso(self) -> str:
+        """激活时间的 ISO 字符串（仅用于展示）"""
+        if not self.activated_at:
+            return ""
+        return datetime.fromtimestamp(self.activated_at / 1_000_000_000, tz=timezone.utc).isoformat()
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "product_id": self.product_id,
-            "license_code": self.license_code,
-            "activated_at": self.activated_at,
-            "config": self.config,
-        }
+        return self._as_dict
 
 
 class LicenseManager:
@@ -59,22 +158,23 @@ class LicenseManager:
         # 配置文件路径
         if config_file_path:
             self._config_path = Path(config_file_path)
-            logger.debug(f"Using provided config path: {self._config_path}")
+            logger.debug("Using provided config path: {}", self._config_path)
         else:
             # 优先使用 APP_DATA_DIR 环境变量（由启动脚本设置）
-            app_data_dir = os.getenv("APP_DATA_DIR")
+            app_data_dir = _APP_DATA_DIR
             if app_data_dir:
                 self._config_path = Path(app_data_dir) / LICENSE_CONFIG_FILENAME
-                logger.debug(f"Using APP_DATA_DIR ({app_data_dir}) for license config: {self._config_path}")
+                logger.debug("Using APP_DATA_DIR ({}) for license config: {}", app_data_dir, self._config_path)
             else:
                 # 回退到项目根目录（开发环境）
-                project_root = Path(__file__).resolve().parent.parent.parent
-                self._config_path = project_root / LICENSE_CONFIG_FILENAME
+                self._config_path = _PROJECT_ROOT / LICENSE_CONFIG_FILENAME
                 logger.warning(f"APP_DATA_DIR not set. Using project root: {self._config_path}")
             
-        logger.info(f"License config path resolved to: {self._config_path.absolute()}")
+        logger.opt(lazy=True).info("License config path resolved to: {}", lambda: self._config_path.absolute())
 
         self._license: Optional[LicenseConfig] = None
+        # 由 config 派生的权益，仅在配置加载/激活时刷新
+        self._entitlements = RuntimeEntitlements()
         self._load_config_safely()
 
     # ---------------- 远程验证与激活 ----------------
@@ -83,40 +183,50 @@ class LicenseManager:
         """验证注册码并获取配置（调用注册机服务）"""
         payload = {"product_id": LICENSE_PRODUCT_ID, "license_code": license_code}
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.post(LICENSE_VERIFY_URL, json=payload)
+            client = await _get_client()
+            resp = await client.post(LICENSE_VERIFY_URL, json=payload)
             resp.raise_for_status()
-            data = resp.json()
+            data = LicenseResponse.model_validate_json(resp.content)
         except httpx.RequestError as e:
             logger.error(f"验证注册码网络错误: {e}")
             raise RuntimeError("无法连接到注册机服务，请检查网络连接") from e
         except httpx.HTTPStatusError as e:
             logger.error(f"验证注册码失败，HTTP状态码: {e.response.status_code}, body={e.response.text}")
             raise RuntimeError("注册码验证服务返回错误响应") from e
-        except json.JSONDecodeError as e:
+        except ValidationError as e:
             logger.error(f"注册机返回数据解析失败: {e}")
             raise RuntimeError("注册码验证服务返回了无效数据") from e
 
-        if not data.get("success"):
+        if not data.success:
             # 注册机返回业务失败
-            msg = data.get("error") or "注册码无效或已过期"
-            raise ValueError(msg)
+            raise ValueError(data.error or "注册码无效或已过期")
 
-        if "config" not in data or not isinstance(data["config"], dict):
+        if data.config is None:
             raise RuntimeError("注册码验证成功，但未返回有效的配置数据")
 
-        return data
+        return {"success": True, "config": data.config}
+
+    async def verify_many(self, license_codes: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        并发验证多个注册码
+
+        所有请求共享同一个连接池并发发出；结果与输入顺序一致，
+        单个注册码验证失败时对应位置返回异常对象而不是中断整体。
+        """
+        return await asyncio.gather(
+            *(self.verify_license(code) for code in license_codes),
+            return_exceptions=True,
+        )
 
     async def activate(self, license_code: str) -> Dict[str, Any]:
         """激活注册码并保存配置"""
         data = await self.verify_license(license_code)
         config = data["config"]
 
-        activated_at = datetime.now(timezone.utc).isoformat()
         license_obj = LicenseConfig(
             product_id=LICENSE_PRODUCT_ID,
             license_code=license_code,
-            activated_at=activated_at,
+            activated_at=time.time_ns(),
             config=config,
         )
 
@@ -124,6 +234,7 @@ class LicenseManager:
             raise RuntimeError("激活成功但保存配置失败，请检查服务器文件权限")
 
         self._license = license_obj
+        self._refresh_entitlements()
         logger.info("✅ 注册码激活成功并已保存配置")
         return {
             "success": True,
@@ -138,17 +249,23 @@ class LicenseManager:
         except Exception as e:
             logger.error(f"加载注册码配置失败，将视为未激活: {e}", exc_info=True)
             self._license = None
+        self._refresh_entitlements()
+
+    def _refresh_entitlements(self) -> None:
+        """根据当前配置构建运行时权益，避免每次查询重复解析"""
+        config = self._license.config if self._license else {}
+        self._entitlements = RuntimeEntitlements.from_config(config)
 
     def load_config(self) -> Optional[LicenseConfig]:
         """从加密文件加载配置"""
-        logger.debug(f"Attempting to load license config from: {self._config_path}")
+        logger.debug("Attempting to load license config from: {}", self._config_path)
         if not self._config_path.exists():
             logger.warning(f"License config file does not exist at: {self._config_path}")
             return None
 
         try:
             token = self._config_path.read_bytes()
-            logger.debug(f"Read {len(token)} bytes from license config file")
+            logger.debug("Read {} bytes from license config file", len(token))
             data = decrypt_dict(token)
             logger.debug("License config decrypted successfully")
             return LicenseConfig.from_dict(data)
@@ -157,21 +274,32 @@ class LicenseManager:
             return None
 
     def save_config(self, license_obj: LicenseConfig) -> bool:
-        """加密保存配置到文件"""
+        """加密保存配置到文件（写临时文件后原子替换）"""
         try:
-            logger.debug(f"Saving license config to: {self._config_path}")
+            logger.debug("Saving license config to: {}", self._config_path)
             # Ensure parent directory exists
             self._config_path.parent.mkdir(parents=True, exist_ok=True)
-            
+
             token = encrypt_dict(license_obj.to_dict())
-            self._config_path.write_bytes(token)
+            tmp_path = self._config_path.with_suffix(".encrypted.tmp")
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+            fd = os.open(tmp_path, flags, 0o600)
+            try:
+                view = memoryview(token)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
             try:
-                self._config_path.chmod(0o600)
+                tmp_path.chmod(0o600)
             except Exception:
                 # 某些系统不支持 chmod，忽略
                 pass
-            
-            logger.info(f"✅ License config saved. Exists: {self._config_path.exists()}, Size: {self._config_path.stat().st_size}")
+            os.replace(tmp_path, self._config_path)
+
+            # 仅在日志实际输出时才执行 stat 系统调用
+            logger.opt(lazy=True).info("✅ License config saved. Size: {}", lambda: self._config_path.stat().st_size)
             return True
         except Exception as e:
             logger.error(f"保存注册码配置失败: {e}", exc_info=True)
@@ -179,11 +307,11 @@ class LicenseManager:
 
     # ---------------- 状态与限制查询 ----------------
 
-    def get_config(self) -> Optional[Dict[str, Any]]:
-        """获取当前配置（仅返回注册机返回的 config 字段）"""
+    def get_config(self) -> Optional[Mapping[str, Any]]:
+        """获取当前配置（仅返回注册机返回的 config 字段，只读视图）"""
         if not self._license:
             return None
-        return self._license.config
+        return MappingProxyType(self._license.config)
 
     def is_activated(self) -> bool:
         """检查是否已激活"""
@@ -191,29 +319,8 @@ class LicenseManager:
 
     def is_expired(self) -> bool:
         """检查是否已过期（仅对已激活用户生效）"""
-        config = self.get_config()
-        if not config:
-            return False
-
-        end_time_str = config.get("end_time")
-        if not end_time_str:
-            return False
-
-        try:
-            # 允许无时区信息，按本地/UTC 时间解析
-            if end_time_str.endswith("Z"):
-                dt = datetime.fromisoformat(end_time_str.replace("Z", "+00:00"))
-            else:
-                dt = datetime.fromisoformat(end_time_str)
-        except Exception:
-            logger.warning(f"无法解析注册码过期时间: {end_time_str}")
-            return False
-
-        # 统一使用有时区的时间进行比较，避免 naive/aware 混用报错
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-        return now > dt
+        end_time = self._entitlements.end_time
+        return end_time is not None and datetime.now(timezone.utc) > end_time
 
     def get_max_tasks(self) -> int:
         """
@@ -226,8 +333,7 @@ class LicenseManager:
         if not self.is_activated() or self.is_expired():
             return 1
 
-        config = self.get_config() or {}
-        return int(config.get("task_num") or 0)
+        return self._entitlements.task_num
 
     def get_interval_limit(self) -> Optional[int]:
         """
@@ -257,13 +363,12 @@ class LicenseManager:
 
 # ---------------- 全局单例访问 ----------------
 
-_LICENSE_MANAGER: Optional[LicenseManager] = None
-
-
+@lru_cache(maxsize=1)
 def get_license_manager() -> LicenseManager:
-    """获取全局 LicenseManager 单例"""
-    global _LICENSE_MANAGER
-    if _LICENSE_MANAGER is None:
-        _LICENSE_MANAGER = LicenseManager()
-    return _LICENSE_MANAGER
+    """
+    获取全局 LicenseManager 单例
+
+    由 lru_cache 保证只创建一次；测试中可调用 get_license_manager.cache_clear() 重置。
+    """
+    return LicenseManager()
 
@@ -7,18 +7,280 @@ and ensures 100% of outputs are valid Pydantic objects.
 
 import os
 import json
-from typing import Type, TypeVar, Optional
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from functools import cache, lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Sequence, List, Literal, Tuple, Type, TypeVar, Optional, Union, get_args, get_origin
+import httpx
+from openai import APIConnectionError, APITimeoutError, RateLimitError
 from pydantic import BaseModel, ValidationError
-from tenacity import retry, stop_after_attempt, retry_if_exception_type, wait_exponential
+from tenacity import retry, stop_after_attempt, stop_after_delay, retry_if_exception_type, wait_exponential, wait_random
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable
+import orjson
 from app.core.config import llm_settings
 
 # Generic type for structured output
 T = TypeVar('T', bound=BaseModel)
 
 
+class StructuredOutputTypeError(TypeError):
+    """Raised when native structured output returns an object of the wrong type (not retried)."""
+
+
+def _message_text(content: Union[str, List[Union[str, Dict[str, Any]]]]) -> str:
+    """Get the text of a message's content (multimodal content is a list of blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part["text"] if isinstance(part, dict) else part
+        for part in content
+        if isinstance(part, str) or part.get("type") == "text"
+    )
+
+
+_JSON_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _find_json_span(content: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced JSON object/array in content with a single pass.
+
+    Brackets inside string values (including escaped quotes) are ignored, so
+    surrounding prose or markdown fences do not need to be stripped first.
+
+    Returns:
+        (start, end) slice bounds, or None if no complete value is present
+    """
+    starts = [i for i in (content.find("{"), content.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+
+    stack = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _JSON_CLOSERS:
+            stack.append(_JSON_CLOSERS[ch])
+        elif ch == "}" or ch == "]":
+            if not stack or stack.pop() != ch:
+                return None
+            if not stack:
+                return start, i + 1
+    return None
+
+# Shared HTTP client for all ChatOpenAI instances (created lazily, reused across services)
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide AsyncClient with a connection pool sized for concurrent calls."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("LLM_MAX_CONN", 512)),
+                max_keepalive_connections=int(os.getenv("LLM_KEEPALIVE", 256))
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient (call on application shutdown)."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+        # Cached chat models are bound to the closed client
+        _get_chat_model.cache_clear()
+
+
+_JSON_TYPE_NAMES = {str: "string", int: "integer", float: "number", bool: "boolean", dict: "object"}
+
+
+def _type_sketch(annotation: Any) -> str:
+    """Render a type annotation as a compact JSON-ish type hint (e.g. ``string[]``)."""
+    if annotation in _JSON_TYPE_NAMES:
+        return _JSON_TYPE_NAMES[annotation]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        fields = ", ".join(f"{name}: {_type_sketch(field.annotation)}" for name, field in annotation.model_fields.items())
+        return f"{{{fields}}}"
+
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin in (list, set, tuple):
+        return f"{_type_sketch(args[0]) if args else 'any'}[]"
+    if origin is dict:
+        return "object"
+    if origin is Literal:
+        return " | ".join(json.dumps(arg, ensure_ascii=False) for arg in args)
+    if args:
+        # Union / Optional: list the non-null members
+        members = [_type_sketch(arg) for arg in args if arg is not type(None)]
+        return " | ".join(members) if members else "null"
+    return "any"
+
+
+@lru_cache(maxsize=256)
+def _create_json_schema_prompt(response_model: Type[BaseModel]) -> str:
+    """
+    Create a prompt that instructs the LLM to output JSON matching the model.
+
+    Emits a compact field list (name, type, required/optional, description)
+    instead of the full JSON Schema to keep prompt tokens low. The result is
+    a pure function of the model class, so it is cached per class.
+    """
+    lines = []
+    for name, field in response_model.model_fields.items():
+        line = f"{name}: {_type_sketch(field.annotation)} ({'required' if field.is_required() else 'optional'})"
+        if field.description:
+            line += f" - {field.description}"
+        lines.append(line)
+    fields = "\n".join(lines)
+
+    return f"""
+Please respond with a valid JSON object with the following fields:
+
+{fields}
+
+Requirements:
+1. Your response must be ONLY the JSON object (no markdown, no code blocks, no explanations)
+2. All required fields must be included
+3. Values must match the specified types and constraints
+4. Do not add any additional fields beyond the listed ones
+
+Example format:
+{{"field1": "value1", "field2": ["item1", "item2"]}}
+"""
+
+
+class ProviderConfig(NamedTuple):
+    """Resolved LLM provider settings."""
+    api_key: str
+    base_url: str
+    model_name: str
+    supports_structured_output: bool
+
+
+def _resolve_provider_config() -> Optional[ProviderConfig]:
+    """Pick the LLM provider from config.py or environment variables (None if no key is set)."""
+    if llm_settings.OPENAI_API_KEY:
+        api_key = llm_settings.OPENAI_API_KEY
+        base_url = llm_settings.OPENAI_BASE_URL
+        model_name = llm_settings.OPENAI_MODEL_NAME
+        supports_structured_output = True
+    elif llm_settings.DEEPSEEK_API_KEY:
+        api_key = llm_settings.DEEPSEEK_API_KEY
+        base_url = llm_settings.DEEPSEEK_BASE_URL
+        model_name = llm_settings.DEEPSEEK_MODEL_NAME
+        supports_structured_output = False
+    elif llm_settings.ZHIPU_API_KEY:
+        api_key = llm_settings.ZHIPU_API_KEY
+        base_url = llm_settings.ZHIPU_MODEL_URL
+        model_name = llm_settings.ZHIPU_MODEL_NAME
+        supports_structured_output = False
+    elif os.getenv('OPENAI_API_KEY'):
+        api_key = os.getenv('OPENAI_API_KEY')
+        base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+        model_name = os.getenv('MODEL_NAME', 'gpt-4o')
+        supports_structured_output = True
+    elif os.getenv('DEEPSEEK_API_KEY'):
+        api_key = os.getenv('DEEPSEEK_API_KEY')
+        base_url = os.getenv('DEEPSEEK_MODEL_URL', 'https://api.deepseek.com')
+        model_name = os.getenv('DEEPSEEK_GUI_MODEL_NAME', 'deepseek-chat')
+        supports_structured_output = False
+    elif os.getenv('ZHIPU_API_KEY'):
+        api_key = os.getenv('ZHIPU_API_KEY')
+        base_url = os.getenv('ZHIPU_MODEL_URL', 'https://open.bigmodel.cn/api/paas/v4/')
+        model_name = os.getenv('ZHIPU_GUI_MODEL_NAME', 'glm-4.5v')
+        supports_structured_output = False
+    else:
+        return None
+
+    # Allow manual overrides
+    base_url = os.getenv('OPENAI_BASE_URL') or base_url
+    model_name = os.getenv('MODEL_NAME') or model_name
+
+    return ProviderConfig(api_key, base_url, model_name, supports_structured_output)
+
+
+# Provider settings are resolved once per process
+_PROVIDER_CONFIG = _resolve_provider_config()
+
+# Transient failures worth retrying; schema mismatches (ValidationError,
+# StructuredOutputTypeError) will not fix themselves. Malformed JSON is retried
+# because the next sample may be well-formed.
+_RETRYABLE_EXC: Tuple[Type[BaseException], ...] = (
+    APITimeoutError, RateLimitError, APIConnectionError, httpx.TransportError, json.JSONDecodeError
+)
+
+# Response cache: max entries and cosine similarity needed for a semantic hit
+_RESPONSE_CACHE_SIZE = 1024
+_SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# (system_prompt, prompt, model_name, response_model)
+CacheKey = Tuple[str, str, str, Type[BaseModel]]
+
+
+@cache
+def _get_chat_model(api_key: str, base_url: str, model_name: str) -> BaseChatModel:
+    """
+    Get the chat model for a provider, built once per (api_key, base_url, model).
+
+    ChatOpenAI construction validates settings and builds the OpenAI SDK clients,
+    so every LLMService for the same provider shares one instance.
+    """
+    return ChatOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        model=model_name,
+        temperature=0.0,
+        max_tokens=None,
+        timeout=60,
+        http_async_client=_get_http_client()
+    )
+
+
+class HealthCheckResponse(BaseModel):
+    """Response model for health_check (built once, not per probe)."""
+    status: str
+    model: str
+
+
+class _RateLimiter:
+    """Minimal requests-per-minute limiter that spaces acquisitions evenly."""
+
+    def __init__(self, rpm: int):
+        self._interval = 60.0 / rpm
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next request slot is available."""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
 class LLMService:
     """
     Structured Reasoning Engine for Pure Agentic Architecture
@@ -27,92 +289,118 @@ class LLMService:
     structured output using Pydantic models.
     """
 
-    def __init__(self):
-        """Initialize the LLM service with configuration from config.py or environment variables."""
-        # Determine which API key is being used
-        if llm_settings.OPENAI_API_KEY:
-            self.api_key = llm_settings.OPENAI_API_KEY
-            self.base_url = llm_settings.OPENAI_BASE_URL
-            self.model_name = llm_settings.OPENAI_MODEL_NAME
-            self.supports_structured_output = True
-        elif llm_settings.DEEPSEEK_API_KEY:
-            self.api_key = llm_settings.DEEPSEEK_API_KEY
-            self.base_url = llm_settings.DEEPSEEK_BASE_URL
-            self.model_name = llm_settings.DEEPSEEK_MODEL_NAME
-            self.supports_structured_output = False
-        elif llm_settings.ZHIPU_API_KEY:
-            self.api_key = llm_settings.ZHIPU_API_KEY
-            self.base_url = llm_settings.ZHIPU_MODEL_URL
-            self.model_name = llm_settings.ZHIPU_MODEL_NAME
-            self.supports_structured_output = False
-        elif os.getenv('OPENAI_API_KEY'):
-            self.api_key = os.getenv('OPENAI_API_KEY')
-            self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
-            self.model_name = os.getenv('MODEL_NAME', 'gpt-4o')
-            self.supports_structured_output = True
-        elif os.getenv('DEEPSEEK_API_KEY'):
-            self.api_key = os.getenv('DEEPSEEK_API_KEY')
-            self.base_url = os.getenv('DEEPSEEK_MODEL_URL', 'https://api.deepseek.com')
-            self.model_name = os.getenv('DEEPSEEK_GUI_MODEL_NAME', 'deepseek-chat')
-            self.supports_structured_output = False
-        elif os.getenv('ZHIPU_API_KEY'):
-            self.api_key = os.getenv('ZHIPU_API_KEY')
-            self.base_url = os.getenv('ZHIPU_MODEL_URL', 'https://open.bigmodel.cn/api/paas/v4/')
-            self.model_name = os.getenv('ZHIPU_GUI_MODEL_NAME', 'glm-4.5v')
-            self.supports_structured_output = False
-        else:
+    def __init__(self, embedder: Optional[Callable[[str], Sequence[float]]] = None):
+        """
+        Initialize the LLM service with the provider configuration resolved at import.
+
+        Args:
+            embedder: Optional text embedding function; enables semantic cache hits
+                for near-identical prompts in addition to exact matches. It is called in
+                a worker thread; the similarity scan itself is linear in the cache size
+        """
+        if _PROVIDER_CONFIG is None:
             raise ValueError("No API key found. Please set OPENAI_API_KEY, DEEPSEEK_API_KEY, or ZHIPU_API_KEY in config.py or environment.")
+        self.api_key, self.base_url, self.model_name, self.supports_structured_output = _PROVIDER_CONFIG
 
-        # Allow manual overrides
-        self.base_url = os.getenv('OPENAI_BASE_URL') or self.base_url
-        self.model_name = os.getenv('MODEL_NAME') or self.model_name
-
-        # Initialize the LangChain chat model
-        self._model: BaseChatModel = ChatOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-            model=self.model_name,
-            temperature=0.0,
-            max_tokens=None,
-            timeout=60
-        )
+        # Reuse the process-wide LangChain chat model on the shared connection pool
+        self._http_client = _get_http_client()
+        self._model: BaseChatModel = _get_chat_model(self.api_key, self.base_url, self.model_name)
+        # Per-temperature model copies (sharing the same clients) and
+        # structured-output runnables, built once per (response model, temperature)
+        self._temperature_models: Dict[float, BaseChatModel] = {}
+        self._structured_cache: Dict[Tuple[Type[BaseModel], float], Runnable] = {}
+
+        # LRU cache of deterministic (temperature 0) responses
+        self._embedder = embedder
+        self._response_cache: "OrderedDict[CacheKey, BaseModel]" = OrderedDict()
+        self._cache_embeddings: Dict[CacheKey, Tuple[float, ...]] = {}
 
     @property
     def model(self) -> BaseChatModel:
         """Get the underlying LangChain model instance."""
         return self._model
 
-    def _create_json_schema_prompt(self, response_model: Type[T]) -> str:
-        """Create a prompt that instructs the LLM to output JSON matching the schema."""
-        schema = response_model.model_json_schema()
+    def _model_for_temperature(self, temperature: float) -> BaseChatModel:
+        """
+        Get a chat model using the given temperature without mutating the shared model.
 
-        return f"""
-Please respond with a valid JSON object that strictly follows this schema:
+        Copies share the underlying OpenAI/httpx clients, so concurrent calls with
+        different temperatures never observe each other's settings.
+        """
+        if temperature == self._model.temperature:
+            return self._model
+        model = self._temperature_models.get(temperature)
+        if model is None:
+            model = self._model.model_copy(update={"temperature": temperature})
+            self._temperature_models[temperature] = model
+        return model
+
+    def _embed(self, text: str) -> Tuple[float, ...]:
+        """Embed text and L2-normalize it so a dot product is the cosine similarity."""
+        vector = self._embedder(text)
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return tuple(v / norm for v in vector)
+
+    def _cache_get(self, key: CacheKey, embedding: Optional[Tuple[float, ...]]) -> Optional[BaseModel]:
+        """Look up a cached response: exact match first, then semantic match."""
+        result = self._response_cache.get(key)
+        if result is not None:
+            self._response_cache.move_to_end(key)
+            return result
+        if embedding is None:
+            return None
+
+        system_prompt, _, model_name, response_model = key
+        for cached_key, cached_embedding in self._cache_embeddings.items():
+            if (cached_key[0], cached_key[2], cached_key[3]) != (system_prompt, model_name, response_model):
+                continue
+            if sum(a * b for a, b in zip(embedding, cached_embedding)) >= _SEMANTIC_CACHE_THRESHOLD:
+                self._response_cache.move_to_end(cached_key)
+                return self._response_cache[cached_key]
+        return None
+
+    def _cache_put(self, key: CacheKey, result: BaseModel, embedding: Optional[Tuple[float, ...]]) -> None:
+        """Store a private copy of a response, evicting the least recently used entry when full."""
+        # Callers own (and may mutate) the instance they receive, so never cache it directly
+        self._response_cache[key] = result.model_copy(deep=True)
+        self._response_cache.move_to_end(key)
+        if embedding is not None:
+            self._cache_embeddings[key] = embedding
+        if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+            evicted_key, _ = self._response_cache.popitem(last=False)
+            self._cache_embeddings.pop(evicted_key, None)
+
+    async def warm_up(self) -> bool:
+        """
+        Open a pooled connection to the provider ahead of the first request.
 
-{json.dumps(schema, indent=2, ensure_ascii=False)}
+        A cheap GET on the models endpoint pays the TCP/TLS handshake once, so the
+        first real generate call reuses a warm keep-alive socket.
 
-Requirements:
-1. Your response must be ONLY the JSON object (no markdown, no code blocks, no explanations)
-2. All required fields must be included
-3. Values must match the specified types and constraints
-4. Do not add any additional fields beyond the schema
+        Returns:
+            True if the provider answered (any status code), False on connection errors
+        """
+        try:
+            await self._http_client.get(
+                f"{self.base_url.rstrip('/')}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=10,
+            )
+            return True
+        except httpx.HTTPError:
+            return False
 
-Example format:
-{{"field1": "value1", "field2": ["item1", "item2"]}}
-"""
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool."""
+        await close_http_client()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type((ValidationError, ValueError, Exception)),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        reraise=True
-    )
     async def generate(
         self,
         prompt: str,
         response_model: Type[T],
         system_prompt: Optional[str] = None,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        use_cache: bool = False
     ) -> T:
         """
         Generate structured output from the LLM.
@@ -122,41 +410,118 @@ Example format:
             response_model: Pydantic model class for structured output
             system_prompt: Optional system prompt to guide the LLM behavior
             temperature: Sampling temperature (0.0 = deterministic, higher = more creative)
+            use_cache: Reuse a cached response for a repeated prompt (temperature 0.0 only).
+                Off by default; callers opt in when a repeated prompt may return the same answer
 
         Returns:
             An instance of the response_model with validated data
 
         Raises:
             ValidationError: If the LLM output cannot be parsed into the response model
+            StructuredOutputTypeError: If native structured output returns the wrong type
             ValueError: If there are issues with the input parameters
             Exception: For other API or processing errors
         """
-        # Validate input parameters
+        # Validate input parameters (bad input is never retried)
         if not prompt or not prompt.strip():
             raise ValueError("Prompt cannot be empty")
 
         if not issubclass(response_model, BaseModel):
             raise ValueError("response_model must be a Pydantic BaseModel subclass")
 
-        # Update model temperature if different from default
-        if temperature != self._model.temperature:
-            self._model.temperature = temperature
+        # Only deterministic calls are cached; sampled outputs are expected to vary
+        if not use_cache or temperature != 0.0:
+            return await self._generate_retry(prompt, response_model, system_prompt, temperature)
 
-        try:
-            if self.supports_structured_output:
-                # Use native structured output (OpenAI)
-                return await self._generate_with_structured_output(prompt, response_model, system_prompt, temperature)
-            else:
-                # Use manual JSON parsing (DeepSeek, Zhipu, etc.)
-                return await self._generate_with_json_parsing(prompt, response_model, system_prompt, temperature)
+        key = (system_prompt or "", prompt, self.model_name, response_model)
+        # Embedding may be a blocking model/HTTP call, so keep it off the event loop
+        embedding = await asyncio.to_thread(self._embed, prompt) if self._embedder else None
+        cached = self._cache_get(key, embedding)
+        if cached is not None:
+            return cached.model_copy(deep=True)
 
-        except Exception as e:
-            # Handle API errors, timeouts, etc.
-            if "API" in str(e).upper() or "timeout" in str(e).lower():
-                raise Exception(f"LLM API error: {str(e)}") from e
-            else:
-                # For other exceptions, let them be handled by the retry decorator
-                raise
+        result = await self._generate_retry(prompt, response_model, system_prompt, temperature)
+        self._cache_put(key, result, embedding)
+        return result
+
+    def generate_trusted(self, response_model: Type[T], raw_dict: Dict[str, Any]) -> T:
+        """
+        Rebuild a response model from an already-validated dict without an LLM call.
+
+        Uses model_construct, which skips all validators and type coercion. Only
+        pass dicts that came from a previously validated instance of the same
+        model (e.g. replaying a persisted agent trace); untrusted data must go
+        through generate or response_model.model_validate instead.
+
+        Args:
+            response_model: Pydantic model class to construct
+            raw_dict: Trusted field values, typically from model_dump()
+
+        Returns:
+            An instance of the response_model (unvalidated)
+        """
+        return response_model.model_construct(**raw_dict)
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        response_model: Type[T],
+        *,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_concurrency: int = 32,
+        rpm: Optional[int] = None,
+        use_cache: bool = False
+    ) -> List[Union[T, Exception]]:
+        """
+        Generate structured outputs for many prompts concurrently.
+
+        Args:
+            prompts: Prompts to send, one request each
+            response_model: Pydantic model class for structured output
+            system_prompt: Optional system prompt shared by all requests
+            temperature: Sampling temperature
+            max_concurrency: Maximum number of in-flight requests
+            rpm: Optional requests-per-minute cap
+            use_cache: Reuse cached responses for repeated prompts (see generate)
+
+        Returns:
+            Results in prompt order; failed prompts yield the raised exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        limiter = _RateLimiter(rpm) if rpm else None
+
+        async def run_one(prompt: str) -> Union[T, Exception]:
+            async with semaphore:
+                try:
+                    if limiter:
+                        await limiter.acquire()
+                    return await self.generate(prompt, response_model, system_prompt, temperature, use_cache)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(run_one(p) for p in prompts))
+
+    @retry(
+        stop=stop_after_attempt(3) | stop_after_delay(60),
+        retry=retry_if_exception_type(_RETRYABLE_EXC),
+        # Random jitter keeps fanned-out calls (generate_many) from retrying in lockstep
+        wait=wait_exponential(multiplier=1, min=2, max=30) + wait_random(0, 2),
+        reraise=True
+    )
+    async def _generate_retry(
+        self,
+        prompt: str,
+        response_model: Type[T],
+        system_prompt: Optional[str],
+        temperature: float
+    ) -> T:
+        """Dispatch to the provider-specific generation path (retried on transient errors)."""
+        if self.supports_structured_output:
+            # Use native structured output (OpenAI)
+            return await self._generate_with_structured_output(prompt, response_model, system_prompt, temperature)
+        # Use manual JSON parsing (DeepSeek, Zhipu, etc.)
+        return await self._generate_with_json_parsing(prompt, response_model, system_prompt, temperature)
 
     async def _generate_with_structured_output(
         self,
@@ -172,15 +537,19 @@ Example format:
             messages.append(SystemMessage(content=system_prompt))
         messages.append(HumanMessage(content=prompt))
 
-        # Create structured output model
-        structured_model = self._model.with_structured_output(response_model)
+        # Reuse the structured output runnable for this response model
+        cache_key = (response_model, temperature)
+        structured_model = self._structured_cache.get(cache_key)
+        if structured_model is None:
+            structured_model = self._model_for_temperature(temperature).with_structured_output(response_model)
+            self._structured_cache[cache_key] = structured_model
 
         # Invoke the model with structured output
         result = await structured_model.ainvoke(messages)
 
         # Validate that we got the expected type
         if not isinstance(result, response_model):
-            raise ValidationError(f"Expected {response_model.__name__}, got {type(result).__name__}")
+            raise StructuredOutputTypeError(f"Expected {response_model.__name__}, got {type(result).__name__}")
 
         return result
 
@@ -193,8 +562,7 @@ Example format:
     ) -> T:
         """Generate using manual JSON parsing for APIs without structured output support."""
         # Create enhanced prompt with JSON schema instructions
-        json_schema_prompt = self._create_json_schema_prompt(response_model)
-        enhanced_prompt = f"{prompt}\n\n{json_schema_prompt}"
+        enhanced_prompt = f"{prompt}\n\n{_create_json_schema_prompt(response_model)}"
 
         # Construct the message payload
         messages = []
@@ -202,49 +570,31 @@ Example format:
             messages.append(SystemMessage(content=system_prompt))
         messages.append(HumanMessage(content=enhanced_prompt))
 
-        # Invoke the model for text response
-        response = await self._model.ainvoke(messages)
-
-        # Extract content from response
-        content = response.content.strip() if hasattr(response, 'content') else str(response).strip()
-
-        # Try to extract JSON from the response
+        # Stream the text response so token transfer and assembly overlap
+        parts: List[str] = []
+        async for chunk in self._model_for_temperature(temperature).astream(messages):
+            if not isinstance(chunk, AIMessage):
+                raise StructuredOutputTypeError(f"Expected AIMessage chunk, got {type(chunk).__name__}")
+            parts.append(_message_text(chunk.content))
+        content = "".join(parts).strip()
+
+        # Slice out the first balanced JSON value (skips prose and markdown fences)
+        span = _find_json_span(content)
+        if span is None:
+            # Truncated or missing JSON; retried since the next sample may be complete
+            raise json.JSONDecodeError("No complete JSON value in LLM response", content, 0)
+        json_str = content[span[0]:span[1]]
+
+        # Parse JSON (a JSONDecodeError propagates and is retried: the next sample may be well-formed)
         try:
-            # First, try to find JSON in markdown code blocks
-            if '```json' in content:
-                json_start = content.find('```json') + 7
-                json_end = content.find('```', json_start)
-                if json_end > json_start:
-                    json_str = content[json_start:json_end].strip()
-                else:
-                    json_str = content[json_start:].strip()
-            elif '```' in content:
-                json_start = content.find('```') + 3
-                json_end = content.find('```', json_start)
-                if json_end > json_start:
-                    json_str = content[json_start:json_end].strip()
-                else:
-                    json_str = content[json_start:].strip()
-            else:
-                # Assume the entire response is JSON
-                json_str = content
-
-            # Parse JSON
-            try:
-                json_data = json.loads(json_str)
-            except json.JSONDecodeError:
-                # Try to fix common JSON issues
-                cleaned_json = json_str.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                json_data = json.loads(cleaned_json)
-
-            # Validate and create Pydantic model
-            result = response_model.model_validate(json_data)
-            return result
+            json_data = orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            # orjson is strict; stdlib json with strict=False accepts raw control characters
+            # (e.g. newlines) inside strings, which LLMs often emit
+            json_data = json.loads(json_str, strict=False)
 
-        except json.JSONDecodeError as e:
-            raise ValidationError(f"Failed to parse JSON from LLM response: {str(e)}\nResponse content: {content[:200]}...") from e
-        except Exception as e:
-            raise ValidationError(f"Failed to validate LLM output as {response_model.__name__}: {str(e)}\nJSON data: {json_data if 'json_data' in locals() else 'N/A'}") from e
+        # Validate and create Pydantic model (ValidationError is not retried)
+        return response_model.model_validate(json_data)
 
     async def health_check(self) -> dict:
         """
@@ -254,14 +604,10 @@ Example format:
             Dictionary containing health status information
         """
         try:
-            class TestResponse(BaseModel):
-                status: str
-                model: str
-
             # Simple start call with a very specific prompt
             result = await self.generate(
                 prompt="Respond with a JSON object containing: status='ok' and model name",
-                response_model=TestResponse,
+                response_model=HealthCheckResponse,
                 system_prompt="You are a health check system. Always respond with valid JSON.",
                 temperature=0.0
             )
@@ -284,39 +630,13 @@ Example format:
             }
 
 
-# Example usage and testing
-if __name__ == "__main__":
-    import asyncio
-
-    # Example Pydantic model for testing
-    class TestPoem(BaseModel):
-        title: str
-        verses: list[str]
-        sentiment: str
+# Process-wide LLMService instance
+_LLM_SERVICE: Optional[LLMService] = None
 
-    async def test_llm_service():
-        """Test the LLM service with a simple example."""
-        try:
-            llm_service = LLMService()
-
-            # Health check
-            health = await llm_service.health_check()
-            print("Health check:", health)
-
-            # Test structured generation
-            poem = await llm_service.generate(
-                prompt="Write a short haiku about artificial intelligence",
-                response_model=TestPoem,
-                system_prompt="You are a creative poet who writes concise, meaningful poems."
-            )
-
-            print("Generated poem:")
-            print(f"Title: {poem.title}")
-            print(f"Verses: {poem.verses}")
-            print(f"Sentiment: {poem.sentiment}")
-
-        except Exception as e:
-            print(f"Error testing LLM service: {e}")
 
-    # Run start if executed directly
-    asyncio.run(test_llm_service())
\ No newline at end of file
+def get_llm_service() -> LLMService:
+    """Get the shared LLMService instance (created on first use)."""
+    global _LLM_SERVICE
+    if _LLM_SERVICE is None:
+        _LLM_SERVICE = LLMService()
+    return _LLM_SERVICE
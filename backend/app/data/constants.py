@@ -4,32 +4,30 @@
 注意：配置相关常量已移动到app.data.config中
 """
 
-from enum import Enum
+from enum import StrEnum
 import os
+from pathlib import Path
 from app.core.config import DEFAULT_CONFIG_PATH, APP_DATA_DIR, RESOURCE_DIR
 
 
-class SYS_TYPE(Enum):
+class SYS_TYPE(StrEnum):
     """系统类型枚举"""
     WIN_64 = "win64"
     MAC_INTEL = "mac_intel"
     MAC_SILICON = "mac_silicon"
-    def __str__(self):
-        return self.value
 
 POSTER_WORD_COUNT = 150
 
-class DEFAULT_TASK_TYPE(Enum):
+class DEFAULT_TASK_TYPE(StrEnum):
     """任务类型枚举"""
     XHS_TYPE = "xhs_type"
-    def __str__(self):
-        return self.value
 
 # ==============================================
 # 新的任务数据目录结构（按用户隔离）
+# 路径常量均为 Path 对象，需要字符串的调用方自行 str()
 # ==============================================
 # 任务数据基础路径 - 迁移到用户数据目录
-TASK_DATA_BASE_PATH = str(APP_DATA_DIR / "task_data")
+TASK_DATA_BASE_PATH: Path = APP_DATA_DIR / "task_data"
 # 任务默认执行间隔时间
 TASK_INTERVAL_TIME = 60*60
 
@@ -43,20 +41,20 @@ USER_SOURCES_DIR = 'sources'
 # 向后兼容的旧路径（已废弃，将在未来版本移除）
 # ==============================================
 # 保持兼容性，但也指向 APP_DATA_DIR
-DEFAULT_KNOWLEDGE_PATH = str(APP_DATA_DIR / "task_data" / "sources")
-DEFAULT_IMAGE_PATH = str(APP_DATA_DIR / "task_data" / "images")
-DEFAULT_NOTES_PATH = str(APP_DATA_DIR / "task_data" / "notes")
+DEFAULT_KNOWLEDGE_PATH: Path = TASK_DATA_BASE_PATH / USER_SOURCES_DIR
+DEFAULT_IMAGE_PATH: Path = TASK_DATA_BASE_PATH / USER_IMAGES_DIR
+DEFAULT_NOTES_PATH: Path = TASK_DATA_BASE_PATH / USER_NOTES_DIR
 
 # cookie地址配置
 # 源路径（可能包含默认配置）指向资源目录
-COOKIE_SOURCE_PATH = str(RESOURCE_DIR / "app" / "xhs_mcp")
+COOKIE_SOURCE_PATH: Path = RESOURCE_DIR / "app" / "xhs_mcp"
 # 目标路径指向数据目录
-COOKIE_TARGET_PATH = str(APP_DATA_DIR / "task_data" / "cookies")
+COOKIE_TARGET_PATH: Path = TASK_DATA_BASE_PATH / USER_COOKIES_DIR
 
 # ==============================================
 # 日志类型枚举 (LogBindType)
 # ==============================================
-class LogBindType(str, Enum):
+class LogBindType(StrEnum):
     """日志绑定类型枚举
     
     用于区分不同类型的日志，不同类型的日志会保存到不同的日志文件中。
@@ -66,16 +64,10 @@ class LogBindType(str, Enum):
     SYSTEM_LOG = "system_log"   # 系统日志
     ACCESS_LOG = "access_log"   # 访问日志
     ERROR_LOG = "error_log"     # 错误日志
-    
-    def __str__(self):
-        return self.value
 
 
-class TaskMode(str, Enum):
+class TaskMode(StrEnum):
     """任务执行模式枚举"""
     STANDARD = "standard"        # 标准模式：互动 + 发布
     INTERACTION = "interaction"  # 互动模式：仅互动
     PUBLISH = "publish"          # 发布模式：仅发布
-    
-    def __str__(self):
-        return self.value
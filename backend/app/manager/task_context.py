@@ -151,7 +151,7 @@ class Task_Manager_Context:
 
     # ==================== 数据存储接口 ====================
 
-    def save(self, data: Any, step_id: Optional[int] = None):
+    def save(self, data: Any, step_id: Optional[int] = None, persist: bool = True):
         """
         保存数据到 meta
 
@@ -159,6 +159,7 @@ class Task_Manager_Context:
             data: 要保存的数据
             step_id: 步骤ID，如果指定则存储在 meta.step 中对应 step_id 的字段中
                     如果没有指定 step_id，则 step_id 默认为 self.step_id
+            persist: 是否立即写入本地文件；为 False 时只更新内存，由后续的保存一并落盘
         """
         if step_id is None:
             step_id = self.step_id
@@ -197,7 +198,8 @@ class Task_Manager_Context:
             self.meta["step"].append(step_data)
 
         # 自动保存到本地
-        self._local_save()
+        if persist:
+            self._local_save()
 
     def update_meta(self, **kwargs):
         """
@@ -271,6 +273,22 @@ class Task_Manager_Context:
             # 从 meta 根目录获取
             return self._get_nested_value(self.meta, key)
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        一次性从 meta 根目录获取多个字段（不支持 step.* 路径）
+
+        Args:
+            keys: 键名列表，支持点分隔的嵌套路径
+
+        Returns:
+            键名 -> 值 的字典，不存在的字段值为 None
+        """
+        meta = self.meta
+        return {
+            key: self._get_nested_value(meta, key) if '.' in key else meta.get(key)
+            for key in keys
+        }
+
     def _get_nested_value(self, data: Dict[str, Any], key: str) -> Any:
         """获取嵌套字典中的值"""
         keys = key.split('.')
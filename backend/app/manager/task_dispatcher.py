@@ -6,45 +6,217 @@
 """
 
 import asyncio
-import json
+import heapq
 import os
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 from datetime import datetime as dt, date, timedelta
+from enum import Enum
 from pathlib import Path
 
+import orjson
+
 from app.core.logger import logger
 from app.manager.task_manager import TaskManager
 from app.manager.task_info import TaskInfo, TaskStatus
-from app.data.constants import SYS_TYPE, DEFAULT_TASK_TYPE
+from app.data.constants import SYS_TYPE, DEFAULT_TASK_TYPE, TaskMode
 from app.core.config import APP_DATA_DIR
 
+# 状态保存的合并窗口（秒）：窗口内的多次变更只写一次文件
+STATE_SAVE_DEBOUNCE_SEC = 0.5
+
+# 操作日志超过该行数时，下一次保存写入完整快照并清空日志
+OPLOG_COMPACT_LINES = 500
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON 编码兜底：date/datetime 转 ISO 字符串，枚举取值，其他类型转字符串"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+# 字符串 -> 枚举查找表（恢复状态、校验参数时一次哈希查找代替逐个比较 / 异常分派）
+# 模式字符串 -> TaskMode（TaskMode 是 StrEnum，枚举成员本身也能直接查表）
+_TASK_MODE_BY_VALUE: Dict[str, TaskMode] = {m.value: m for m in TaskMode}
+# 状态值 -> TaskStatus
+_TASK_STATUS_BY_VALUE: Dict[str, TaskStatus] = {s.value: s for s in TaskStatus}
+# 没有下次执行时间的任务在排序键中的时间戳（排在最后）
+_NO_SCHEDULE_TS = float('inf')
+# 状态枚举成员是单例，热路径上用 is 比较并省去类属性查找
+_PENDING, _RUNNING, _PAUSED, _COMPLETED, _ERROR = (
+    TaskStatus.PENDING, TaskStatus.RUNNING, TaskStatus.PAUSED, TaskStatus.COMPLETED, TaskStatus.ERROR
+)
+# 任务类型：值、名称及历史数据中出现过的 "DEFAULT_TASK_TYPE.XHS_TYPE" 形式 -> DEFAULT_TASK_TYPE
+_TASK_TYPE_LOOKUP: Dict[str, DEFAULT_TASK_TYPE] = {
+    key: t
+    for t in DEFAULT_TASK_TYPE
+    for key in (t.value, t.name, t.name.lower(), f"DEFAULT_TASK_TYPE.{t.name}")
+}
+
+
+# ==============================================
+# 有效时间段计算（epoch 秒，本地时区）
+# ==============================================
+def _in_valid_hours(ts: float, hours: Optional[Tuple[int, int]]) -> bool:
+    """检查时间戳的本地小时是否在 [start_hour, end_hour] 内，None 表示无限制"""
+    return hours is None or hours[0] <= time.localtime(ts).tm_hour <= hours[1]
+
+
+def _next_valid_start_ts(ts: float, hours: Optional[Tuple[int, int]]) -> float:
+    """
+    获取下一个有效时间段开始的时间戳
+    
+    未到当天开始时间时返回当天开始时间，否则返回次日开始时间；
+    mktime 负责处理跨月和夏令时。None 表示无限制，直接返回 ts。
+    """
+    if hours is None:
+        return ts
+    lt = time.localtime(ts)
+    day = lt.tm_mday if lt.tm_hour < hours[0] else lt.tm_mday + 1
+    return time.mktime((lt.tm_year, lt.tm_mon, day, hours[0], 0, 0, 0, 0, -1))
+
+
+# ==============================================
+# update_task 字段表
+# ==============================================
+def _passthrough(value: Any) -> Any:
+    """不做转换"""
+    return value
+
+
+def _validate_interval(interval: int) -> int:
+    """校验执行间隔（秒）"""
+    if interval < 60:
+        raise ValueError(f"执行间隔不能小于60秒，当前值: {interval}")
+    return interval
+
+
+def _validate_valid_time_range(valid_time_range: Optional[List[int]]) -> Optional[List[int]]:
+    """校验有效时间范围，None 表示无限制"""
+    if valid_time_range is None:
+        return None
+    if not (isinstance(valid_time_range, list) and len(valid_time_range) == 2):
+        raise ValueError(f"有效时间范围必须是 [start_hour, end_hour] 格式或 None（无限制），当前值: {valid_time_range}")
+    if not (0 <= valid_time_range[0] < 24 and 0 <= valid_time_range[1] < 24):
+        raise ValueError(f"时间范围必须在 0-23 之间，当前值: {valid_time_range}")
+    if valid_time_range[0] >= valid_time_range[1]:
+        raise ValueError(f"开始时间必须小于结束时间，当前值: {valid_time_range}")
+    return valid_time_range
+
+
+def _validate_task_end_time(task_end_time: Any) -> date:
+    """校验任务结束时间，接受 date 对象或 ISO 日期字符串"""
+    if isinstance(task_end_time, str):
+        try:
+            return date.fromisoformat(task_end_time)
+        except ValueError:
+            raise ValueError(f"任务结束时间格式错误，应为 ISO 日期格式 (YYYY-MM-DD)，当前值: {task_end_time}")
+    if not isinstance(task_end_time, date):
+        raise ValueError(f"任务结束时间必须是 date 对象或 ISO 日期字符串，当前类型: {type(task_end_time)}")
+    return task_end_time
+
+
+def _validate_mode(mode: Any) -> TaskMode:
+    """校验任务模式，接受字符串或 TaskMode 枚举"""
+    if not isinstance(mode, str):
+        raise ValueError(f"模式必须是字符串或 TaskMode 枚举，当前类型: {type(mode)}")
+    task_mode = _TASK_MODE_BY_VALUE.get(mode)
+    if task_mode is None:
+        raise ValueError(f"无效的模式值: {mode}，有效值: {list(_TASK_MODE_BY_VALUE)}")
+    return task_mode
+
+
+def _validate_interaction_note_count(interaction_note_count: Any) -> int:
+    """校验互动笔记数量（1-5）"""
+    if not isinstance(interaction_note_count, int) or interaction_note_count < 1 or interaction_note_count > 5:
+        raise ValueError(f"互动笔记数量必须在 1-5 之间，当前值: {interaction_note_count}")
+    return interaction_note_count
+
+
+class _UpdateField(NamedTuple):
+    """update_task 可更新字段的描述"""
+    validator: Callable[[Any], Any]  # 校验并转换输入值
+    targets: Tuple[str, ...]  # 需要同步属性的对象：'task_info' / 'task_manager'
+    to_json: Callable[[Any], Any] = _passthrough  # 写入 context.meta 和 kwargs 的可序列化值
+    reschedule: bool = False  # 是否需要重新计算下次执行时间
+    allow_none: bool = False  # None 是否为有效值（否则跳过）
+
+
+_UPDATE_FIELDS: Dict[str, _UpdateField] = {
+    # 内容相关属性
+    'user_query': _UpdateField(_passthrough, ('task_manager',)),
+    'user_topic': _UpdateField(_passthrough, ('task_manager',)),
+    'user_style': _UpdateField(_passthrough, ('task_manager',)),
+    'user_target_audience': _UpdateField(_passthrough, ('task_manager',)),
+    # 调度相关属性
+    'interval': _UpdateField(_validate_interval, ('task_info', 'task_manager'), reschedule=True),
+    'valid_time_range': _UpdateField(
+        _validate_valid_time_range, ('task_info', 'task_manager'), reschedule=True, allow_none=True
+    ),
+    'task_end_time': _UpdateField(
+        _validate_task_end_time, ('task_info', 'task_manager'), to_json=date.isoformat, reschedule=True
+    ),
+    # 执行相关属性
+    'mode': _UpdateField(_validate_mode, ('task_info',), to_json=lambda mode: mode.value),
+    'interaction_note_count': _UpdateField(_validate_interaction_note_count, ('task_info',)),
+}
+
 
 class TaskDispatcher:
     """任务调度器"""
     
-    def __init__(self, dispatcher_dir: Optional[str] = None):
+    def __init__(self, dispatcher_dir: Optional[str] = None, load_state: bool = True):
         """
         初始化调度器
         
         初始化：
-        - execution_lock: 全局执行锁
         - all_tasks: 任务注册表
         - account_tasks: 账户任务映射
-        - running_task: 当前运行的任务
+        - _account_index: (任务类型, 账户ID) -> task_id 索引，用于 O(1) 唯一性校验
+        - _wheel: 按分钟分桶的调度时间轮，既决定到期任务也决定下次唤醒时间，调度循环只查看最早的桶
+        - _schedule_keys: 每个任务的排序键，用于 list_tasks 排序
+        - running_task / _slot_free: 单一执行槽位（当前运行的任务）及槽位空闲事件
         - scheduler_task: 调度器主循环任务
         - _stop_event: 停止事件
+        - _wakeup_event: 调度变更事件，唤醒等待中的调度循环
         - _dispatcher_dir: 持久化目录
         - _config_file: 配置文件路径
+        - _dirty_event / _persist_task: 状态变更标记与后台合并写入任务
+        - _oplog_file: 操作日志文件（两次快照之间的任务变更）
         
         Args:
             dispatcher_dir: 持久化目录路径，默认为 APP_DATA_DIR/dispatcher/
+            load_state: 是否在构造时同步加载持久化状态；为 False 时由调用方 await load_state_async()
         """
-        self.execution_lock = asyncio.Lock()
         self.all_tasks: Dict[str, TaskInfo] = {}
-        self.account_tasks: Dict[str, List[str]] = {}  # account_id -> [task_id, ...]
+        self.account_tasks: Dict[str, Set[str]] = {}  # account_id -> {task_id, ...}
+        # 按状态分组的任务索引，状态变更统一经由 _set_status 维护
+        self._tasks_by_status: Dict[TaskStatus, Dict[str, TaskInfo]] = {status: {} for status in TaskStatus}
+        self._pending_tasks: Dict[str, TaskInfo] = self._tasks_by_status[TaskStatus.PENDING]
+        self._account_index: Dict[Tuple[str, str], str] = {}  # (task_type, account_id) -> task_id
+        # 调度版本号：任务每次重新调度都会递增，时间轮中的旧条目按版本号惰性跳过
+        self._schedule_version: Dict[str, int] = {}
+        # 每个任务当前的排序键 (下次执行时间戳 或 inf, 创建时间戳)，随重新调度更新
+        # 排序与时间轮都只比较 float，不做 datetime 比较
+        self._schedule_keys: Dict[str, Tuple[float, float]] = {}
+        self._ordered_tasks: Optional[List[TaskInfo]] = None  # list_tasks 排序结果缓存
+        # 调度时间轮：桶号 floor(timestamp / 60) -> [(timestamp, 创建时间戳, task_id, version)] 小顶堆
+        # 按调度版本号做惰性失效；只收录有下次执行时间的任务
+        self._wheel_slice_sec = 60
+        self._wheel: Dict[int, List[Tuple[float, float, str, int]]] = {}
+        self._min_bucket: Optional[int] = None
+        self._wheel_size = 0  # 时间轮条目总数（含失效条目），用于触发压缩
+        # 单一执行槽位：同一时间只有一个任务执行。事件循环单线程，检查与占用之间没有 await 即为原子操作
         self.running_task: Optional[TaskInfo] = None
+        self._slot_free = asyncio.Event()
+        self._slot_free.set()
         self.scheduler_task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        self._wakeup_event = asyncio.Event()
         
         # 初始化持久化目录
         if dispatcher_dir is None:
@@ -53,13 +225,29 @@ class TaskDispatcher:
             self._dispatcher_dir = Path(dispatcher_dir)
         
         # 确保目录存在
-        os.makedirs(self._dispatcher_dir, exist_ok=True)
+        self._dispatcher_dir.mkdir(parents=True, exist_ok=True)
         
         # 配置文件路径
-        self._config_file = os.path.join(self._dispatcher_dir, "dispatch_config.json")
+        self._config_file = self._dispatcher_dir / "dispatch_config.json"
+        # 操作日志：两次快照之间的任务变更，每行一条 JSON 记录
+        self._oplog_file = self._dispatcher_dir / "dispatch_oplog.jsonl"
+        self._oplog_seq = 0  # 最后一条操作日志的序号
+        self._oplog_lines = 0  # 当前操作日志的行数，超过 OPLOG_COMPACT_LINES 时压缩
+        
+        # 状态持久化：_save_state 只标记变更，由后台任务合并写入
+        self._dirty_event = asyncio.Event()
+        self._persist_task: Optional[asyncio.Task] = None
+        # 每个任务序列化结果的缓存：task_id -> (变更标识, JSON 字节)
+        self._serialized_cache: Dict[str, Tuple[tuple, bytes]] = {}
+        self._persist_blobs: List[bytes] = []  # 每次保存复用的任务字节片段列表
+        # 状态快照序号：后台线程写入与立即写入并发时，只保留最新快照
+        self._state_seq = 0
+        self._written_seq = 0
+        self._state_write_lock = threading.Lock()
         
         # 加载历史任务
-        self._load_state()
+        if load_state:
+            self._load_state()
     
     async def add_task(self, sys_type: str, **kwargs) -> str:
         """
@@ -76,7 +264,7 @@ class TaskDispatcher:
             task_id: 新创建的任务ID
             
         Raises:
-            ValueError: 如果账户ID已存在（同一任务类型下账户ID必须唯一）
+            ValueError: 如果账户ID已存在（同一任务类型下账户ID必须唯一），或有效时间范围格式错误
         """
         # 1. 提取任务类型和账户ID
         # 注意：task_type 应该在接口层已经转换为枚举类型，这里只做验证
@@ -95,8 +283,10 @@ class TaskDispatcher:
         else:
             raise ValueError(f"不支持的任务类型: {task_type}")
         
-        # 2. 校验账户ID唯一性
+        # 2. 校验账户ID唯一性和有效时间范围（在创建 TaskManager 之前，避免校验失败时遗留上下文文件等资源）
         self._validate_account_uniqueness(task_type, account_id)
+        # 有效时间范围只在赋值时校验一次，调度计算中直接使用
+        valid_time_range = _validate_valid_time_range(kwargs.get('valid_time_range', [8, 22]))
         
         # 3. 创建 TaskManager 实例
         task_manager = TaskManager(sys_type=sys_type, **kwargs)
@@ -104,17 +294,11 @@ class TaskDispatcher:
         
         # 4. 创建 TaskInfo 对象
         # 获取模式，如果没有则使用默认值
-        from app.data.constants import TaskMode
         mode_str = kwargs.get('mode', TaskMode.STANDARD.value)
-        if isinstance(mode_str, TaskMode):
-            mode = mode_str
-        elif isinstance(mode_str, str):
-            try:
-                mode = TaskMode(mode_str)
-            except ValueError:
+        mode = _TASK_MODE_BY_VALUE.get(mode_str) if isinstance(mode_str, str) else None
+        if mode is None:
+            if isinstance(mode_str, str):
                 logger.warning(f"无效的模式值: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
-                mode = TaskMode.STANDARD
-        else:
             mode = TaskMode.STANDARD
         
         # 获取互动笔记数量，默认3，限制在1-5之间
@@ -129,7 +313,7 @@ class TaskDispatcher:
             task_manager=task_manager,
             status=TaskStatus.PENDING,
             interval=task_manager.interval,
-            valid_time_range=task_manager.valid_time_range,
+            valid_time_range=valid_time_range,
             task_end_time=task_manager.task_end_time,
             mode=mode,
             interaction_note_count=interaction_note_count,
@@ -141,10 +325,11 @@ class TaskDispatcher:
         
         # 6. 更新任务注册表
         self.all_tasks[task_id] = task_info
+        self._tasks_by_status[task_info.status][task_id] = task_info
+        self._push_schedule(task_info)
         
-        if account_id not in self.account_tasks:
-            self.account_tasks[account_id] = []
-        self.account_tasks[account_id].append(task_id)
+        self.account_tasks.setdefault(account_id, set()).add(task_id)
+        self._account_index[(task_type.value, account_id)] = task_id
         
         logger.info(
             f"任务添加成功: task_id={task_id}, account_id={account_id}, "
@@ -180,14 +365,14 @@ class TaskDispatcher:
         
         task_type_value = task_type.value  # 枚举的字符串值
         
-        # 检查该任务类型下是否已存在相同账户ID的任务
-        for task_id, task_info in self.all_tasks.items():
-            # task_info.task_type 在 TaskInfo 中保存的是字符串值，直接比较
-            if task_info.task_type == task_type_value and task_info.account_id == account_id:
-                raise ValueError(
-                    f"账户ID '{account_id}' 已存在任务 '{task_id}'（状态: {task_info.status.value}），"
-                    f"同一账户不能创建多个任务。请先删除或完成现有任务。"
-                )
+        # 检查该任务类型下是否已存在相同账户ID的任务（索引查找）
+        task_id = self._account_index.get((task_type_value, account_id))
+        if task_id is not None:
+            task_info = self.all_tasks[task_id]
+            raise ValueError(
+                f"账户ID '{account_id}' 已存在任务 '{task_id}'（状态: {task_info.status.value}），"
+                f"同一账户不能创建多个任务。请先删除或完成现有任务。"
+            )
     
     def _calculate_next_execution_time(self, task_info: TaskInfo) -> Optional[dt]:
         """
@@ -199,111 +384,52 @@ class TaskDispatcher:
         3. 如果基础时间不在 valid_time_range 内，调整到下一个有效时间段
         4. 如果超过 task_end_time，返回 None
         
+        全程使用 epoch 秒计算（只取一次当前时间），仅在返回时构造 datetime。
+        
         Args:
             task_info: 任务信息
             
         Returns:
             下次执行时间，如果任务已结束则返回 None
         """
-        now = dt.now()
+        now_ts = time.time()
+        hours = task_info.valid_time_range
         
         if task_info.last_execution_time is None:
             # 首次执行，基于当前时间
-            if self._is_in_valid_time_range(now, task_info.valid_time_range):
-                return now
-            else:
-                return self._get_next_valid_time_start(now, task_info.valid_time_range)
+            if _in_valid_hours(now_ts, hours):
+                return dt.fromtimestamp(now_ts)
+            return dt.fromtimestamp(_next_valid_start_ts(now_ts, hours))
         
         # 计算基础时间
-        base_time = task_info.last_execution_time + timedelta(seconds=task_info.interval)
+        base_ts = task_info.last_execution_time.timestamp() + task_info.interval
         
         # 如果基础时间是过去的时间，基于当前时间重新计算
-        if base_time <= now:
-            logger.debug(f"任务 {task_info.task_id} 计算的基础时间 {base_time} 是过去的时间，基于当前时间 {now} 重新计算")
+        if base_ts <= now_ts:
+            logger.debug(
+                f"任务 {task_info.task_id} 计算的基础时间 {dt.fromtimestamp(base_ts)} 是过去的时间，"
+                f"基于当前时间 {dt.fromtimestamp(now_ts)} 重新计算"
+            )
             # 基于当前时间计算，确保在有效时间范围内
-            if self._is_in_valid_time_range(now, task_info.valid_time_range):
-                base_time = now
+            if _in_valid_hours(now_ts, hours):
+                base_ts = now_ts
             else:
-                base_time = self._get_next_valid_time_start(now, task_info.valid_time_range)
+                base_ts = _next_valid_start_ts(now_ts, hours)
                 # 如果计算出的时间还是过去，再次基于当前时间计算
-                if base_time and base_time <= now:
+                if base_ts <= now_ts:
                     # 基于当前时间 + interval 计算
-                    base_time = now + timedelta(seconds=task_info.interval)
-                    if not self._is_in_valid_time_range(base_time, task_info.valid_time_range):
-                        base_time = self._get_next_valid_time_start(base_time, task_info.valid_time_range)
+                    base_ts = now_ts + task_info.interval
+                    if not _in_valid_hours(base_ts, hours):
+                        base_ts = _next_valid_start_ts(base_ts, hours)
         
         # 检查是否超过结束时间（如果 task_end_time 为 None，则不检查）
-        if task_info.task_end_time is not None and base_time and base_time.date() >= task_info.task_end_time:
+        if not task_info.is_active_at(base_ts):
             return None
         
-        # 检查是否在有效时间范围内
-        if base_time and self._is_in_valid_time_range(base_time, task_info.valid_time_range):
-            return base_time
-        else:
-            # 调整到下一个有效时间段的开始
-            if base_time:
-                return self._get_next_valid_time_start(base_time, task_info.valid_time_range)
-            else:
-                return None
-    
-    def _is_in_valid_time_range(self, check_time: dt, valid_time_range: Optional[List[int]]) -> bool:
-        """
-        检查时间是否在有效时间范围内
-        
-        Args:
-            check_time: 待检查的时间
-            valid_time_range: 有效时间范围 [start_hour, end_hour]，或 None 表示无限制
-            
-        Returns:
-            bool: 是否在有效时间范围内（None 时返回 True）
-        """
-        # None 表示无限制，直接返回 True
-        if valid_time_range is None:
-            return True
-        
-        # 确保 valid_time_range 有效
-        if not isinstance(valid_time_range, list) or len(valid_time_range) < 2:
-            logger.warning(f"valid_time_range 无效: {valid_time_range}，使用默认值 [8, 22]")
-            valid_time_range = [8, 22]
-        
-        start_hour, end_hour = valid_time_range[0], valid_time_range[1]
-        current_hour = check_time.hour
-        return start_hour <= current_hour <= end_hour
-    
-    def _get_next_valid_time_start(self, base_time: dt, valid_time_range: Optional[List[int]]) -> Optional[dt]:
-        """
-        获取下一个有效时间段的开始时间
-        
-        Args:
-            base_time: 基础时间
-            valid_time_range: 有效时间范围 [start_hour, end_hour]，或 None 表示无限制
-            
-        Returns:
-            下一个有效时间段的开始时间（None 时直接返回 base_time）
-        """
-        # None 表示无限制，直接返回 base_time
-        if valid_time_range is None:
-            return base_time
-        
-        # 确保 valid_time_range 有效
-        if not isinstance(valid_time_range, list) or len(valid_time_range) < 2:
-            logger.warning(f"valid_time_range 无效: {valid_time_range}，使用默认值 [8, 22]")
-            valid_time_range = [8, 22]
-        
-        start_hour, end_hour = valid_time_range[0], valid_time_range[1]
-        current_hour = base_time.hour
-        
-        if current_hour < start_hour:
-            # 当天还未到开始时间，返回当天的开始时间
-            return base_time.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        elif current_hour > end_hour:
-            # 当天已超过结束时间，返回次日的开始时间
-            next_day = base_time + timedelta(days=1)
-            return next_day.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        else:
-            # 在有效时间范围内，返回次日的开始时间
-            next_day = base_time + timedelta(days=1)
-            return next_day.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+        # 检查是否在有效时间范围内，否则调整到下一个有效时间段的开始
+        if not _in_valid_hours(base_ts, hours):
+            base_ts = _next_valid_start_ts(base_ts, hours)
+        return dt.fromtimestamp(base_ts)
     
     async def update_task(self, task_id: str, **update_data) -> bool:
         """
@@ -315,7 +441,9 @@ class TaskDispatcher:
                 - user_query, user_topic, user_style, user_target_audience
                 - task_end_time (date 或 ISO 格式字符串)
                 - interval (int, 秒)
-                - valid_time_range (List[int], [start_hour, end_hour])
+                - valid_time_range (List[int], [start_hour, end_hour]，None 表示无限制)
+                - mode (str 或 TaskMode)
+                - interaction_note_count (int, 1-5)
         
         Returns:
             bool: 是否更新成功
@@ -328,154 +456,54 @@ class TaskDispatcher:
         task_manager = task_info.task_manager
         
         # 检查任务状态：运行中的任务允许更新，但属性在下一次执行时生效
-        if task_info.status == TaskStatus.RUNNING:
+        if task_info.status is _RUNNING:
             logger.info(f"任务 {task_id} 正在运行，属性将在下一次执行时生效")
         
         try:
-            # 1. 更新 Task_Manager_Context.meta
-            context = task_manager.context
+            # 1. 按字段表逐项校验并写入 TaskManager / TaskInfo，同时收集 context.meta 更新
+            #    并同步到 TaskInfo.kwargs（用于恢复任务时使用）
             meta_updates = {}
-            
-            # 处理内容相关属性
-            if 'user_query' in update_data and update_data['user_query'] is not None:
-                meta_updates['user_query'] = update_data['user_query']
-                task_manager.user_query = update_data['user_query']
-            
-            if 'user_topic' in update_data and update_data['user_topic'] is not None:
-                meta_updates['user_topic'] = update_data['user_topic']
-                task_manager.user_topic = update_data['user_topic']
-            
-            if 'user_style' in update_data and update_data['user_style'] is not None:
-                meta_updates['user_style'] = update_data['user_style']
-                task_manager.user_style = update_data['user_style']
-            
-            if 'user_target_audience' in update_data and update_data['user_target_audience'] is not None:
-                meta_updates['user_target_audience'] = update_data['user_target_audience']
-                task_manager.user_target_audience = update_data['user_target_audience']
-            
-            # 处理调度相关属性
             need_recalculate_time = False
             
-            if 'interval' in update_data and update_data['interval'] is not None:
-                interval = update_data['interval']
-                if interval < 60:
-                    raise ValueError(f"执行间隔不能小于60秒，当前值: {interval}")
-                meta_updates['interval'] = interval
-                task_info.interval = interval
-                task_manager.interval = interval
-                need_recalculate_time = True
-            
-            if 'valid_time_range' in update_data:
-                valid_time_range = update_data['valid_time_range']
-                # None 表示无限制
-                if valid_time_range is None:
-                    meta_updates['valid_time_range'] = None
-                    task_info.valid_time_range = None
-                    task_manager.valid_time_range = None
-                    need_recalculate_time = True
-                elif isinstance(valid_time_range, list) and len(valid_time_range) == 2:
-                    if not (0 <= valid_time_range[0] < 24 and 0 <= valid_time_range[1] < 24):
-                        raise ValueError(f"时间范围必须在 0-23 之间，当前值: {valid_time_range}")
-                    if valid_time_range[0] >= valid_time_range[1]:
-                        raise ValueError(f"开始时间必须小于结束时间，当前值: {valid_time_range}")
-                    meta_updates['valid_time_range'] = valid_time_range
-                    task_info.valid_time_range = valid_time_range
-                    task_manager.valid_time_range = valid_time_range
-                    need_recalculate_time = True
-                else:
-                    raise ValueError(f"有效时间范围必须是 [start_hour, end_hour] 格式或 None（无限制），当前值: {valid_time_range}")
-            
-            if 'task_end_time' in update_data and update_data['task_end_time'] is not None:
-                task_end_time = update_data['task_end_time']
-                # 处理日期格式
-                if isinstance(task_end_time, str):
-                    try:
-                        task_end_time = date.fromisoformat(task_end_time)
-                    except ValueError:
-                        raise ValueError(f"任务结束时间格式错误，应为 ISO 日期格式 (YYYY-MM-DD)，当前值: {task_end_time}")
-                elif not isinstance(task_end_time, date):
-                    raise ValueError(f"任务结束时间必须是 date 对象或 ISO 日期字符串，当前类型: {type(task_end_time)}")
-                
-                meta_updates['task_end_time'] = task_end_time.isoformat()
-                task_info.task_end_time = task_end_time
-                task_manager.task_end_time = task_end_time
-                need_recalculate_time = True
-            
-            # 处理模式更新
-            if 'mode' in update_data and update_data['mode'] is not None:
-                from app.data.constants import TaskMode
-                mode_str = update_data['mode']
-                if isinstance(mode_str, str):
-                    try:
-                        mode = TaskMode(mode_str)
-                    except ValueError:
-                        raise ValueError(f"无效的模式值: {mode_str}，有效值: {[m.value for m in TaskMode]}")
-                elif isinstance(mode_str, TaskMode):
-                    mode = mode_str
-                else:
-                    raise ValueError(f"模式必须是字符串或 TaskMode 枚举，当前类型: {type(mode_str)}")
-                
-                meta_updates['mode'] = mode.value
-                task_info.mode = mode
-                task_info.kwargs['mode'] = mode.value
-            
-            # 处理互动笔记数量更新
-            if 'interaction_note_count' in update_data and update_data['interaction_note_count'] is not None:
-                interaction_note_count = update_data['interaction_note_count']
-                if not isinstance(interaction_note_count, int) or interaction_note_count < 1 or interaction_note_count > 5:
-                    raise ValueError(f"互动笔记数量必须在 1-5 之间，当前值: {interaction_note_count}")
+            for key, value in update_data.items():
+                spec = _UPDATE_FIELDS.get(key)
+                if spec is None or (value is None and not spec.allow_none):
+                    continue
                 
-                meta_updates['interaction_note_count'] = interaction_note_count
-                task_info.interaction_note_count = interaction_note_count
-                task_info.kwargs['interaction_note_count'] = interaction_note_count
+                value = spec.validator(value)
+                stored_value = spec.to_json(value)
+                for target in spec.targets:
+                    setattr(task_info if target == 'task_info' else task_manager, key, value)
+                meta_updates[key] = stored_value
+                task_info.kwargs[key] = stored_value
+                need_recalculate_time |= spec.reschedule
+            if meta_updates:
+                task_info.mark_kwargs_changed()
             
             # 更新 context.meta
             if meta_updates:
-                context.update_meta(**meta_updates)
-            
-            # 2. 更新 TaskInfo.kwargs（用于恢复任务时使用）
-            if 'user_query' in update_data:
-                task_info.kwargs['user_query'] = update_data['user_query']
-            if 'user_topic' in update_data:
-                task_info.kwargs['user_topic'] = update_data['user_topic']
-            if 'user_style' in update_data:
-                task_info.kwargs['user_style'] = update_data['user_style']
-            if 'user_target_audience' in update_data:
-                task_info.kwargs['user_target_audience'] = update_data['user_target_audience']
-            if 'interval' in update_data and update_data['interval'] is not None:
-                task_info.kwargs['interval'] = update_data['interval']
-            if 'valid_time_range' in update_data and update_data['valid_time_range'] is not None:
-                task_info.kwargs['valid_time_range'] = update_data['valid_time_range']
-            if 'task_end_time' in update_data and update_data['task_end_time'] is not None:
-                if isinstance(task_info.task_end_time, date):
-                    task_info.kwargs['task_end_time'] = task_info.task_end_time.isoformat()
-                else:
-                    task_info.kwargs['task_end_time'] = task_info.task_end_time
-            if 'mode' in update_data and update_data['mode'] is not None:
-                # mode 已经在上面处理并更新到 task_info.mode，这里同步到 kwargs
-                task_info.kwargs['mode'] = task_info.mode.value if hasattr(task_info.mode, 'value') else str(task_info.mode)
-            if 'interaction_note_count' in update_data and update_data['interaction_note_count'] is not None:
-                # interaction_note_count 已经在上面处理并更新到 task_info.interaction_note_count，这里同步到 kwargs
-                task_info.kwargs['interaction_note_count'] = task_info.interaction_note_count
+                task_manager.context.update_meta(**meta_updates)
             
-            # 3. 如果修改了调度相关属性，重新计算 next_execution_time
+            # 2. 所有字段写入完成后，统一重新计算一次 next_execution_time
+            now = dt.now()
             if need_recalculate_time:
                 # 检查任务是否已到期
-                if task_info.task_end_time is not None and dt.now().date() >= task_info.task_end_time:
-                    task_info.update_next_execution_time(None)
-                    if task_info.status == TaskStatus.PENDING:
-                        task_info.update_status(TaskStatus.COMPLETED)
+                if task_info.task_end_time is not None and now.date() >= task_info.task_end_time:
+                    self._reschedule(task_info, None)
+                    if task_info.status is _PENDING:
+                        self._set_status(task_info, TaskStatus.COMPLETED)
                     logger.info(f"任务 {task_id} 已到期，更新状态为 COMPLETED")
                 else:
-                    # 重新计算下次执行时间
+                    # 重新计算下次执行时间；结果不变时不必重新入堆
                     next_time = self._calculate_next_execution_time(task_info)
-                    task_info.update_next_execution_time(next_time)
+                    if next_time != task_info.next_execution_time:
+                        self._reschedule(task_info, next_time)
                     logger.info(f"任务 {task_id} 的下次执行时间已重新计算: {next_time}")
             
-            # 4. 更新 updated_at
-            task_info.updated_at = dt.now()
+            # 3. 更新 updated_at
+            task_info.updated_at = now
             
-            # 5. 保存状态
+            # 4. 保存状态
             self._save_state()
             
             logger.info(f"任务 {task_id} 属性更新成功: {list(meta_updates.keys())}")
@@ -502,7 +530,7 @@ class TaskDispatcher:
         task_info = self.all_tasks[task_id]
         
         # 如果任务正在运行，先暂停
-        if task_info.status == TaskStatus.RUNNING:
+        if task_info.status is _RUNNING:
             logger.info(f"任务 {task_id} 正在运行，先暂停再删除")
             self.pause_task(task_id)
             # 等待任务完成（这里简化处理，实际可能需要更复杂的等待逻辑）
@@ -510,16 +538,25 @@ class TaskDispatcher:
         
         # 从注册表中删除
         account_id = task_info.account_id
-        if account_id in self.account_tasks:
-            if task_id in self.account_tasks[account_id]:
-                self.account_tasks[account_id].remove(task_id)
-            if not self.account_tasks[account_id]:
+        account_task_ids = self.account_tasks.get(account_id)
+        if account_task_ids is not None:
+            account_task_ids.discard(task_id)
+            if not account_task_ids:
                 del self.account_tasks[account_id]
         
+        if self._account_index.get((task_info.task_type, account_id)) == task_id:
+            del self._account_index[(task_info.task_type, account_id)]
         del self.all_tasks[task_id]
+        self._tasks_by_status[task_info.status].pop(task_id, None)
+        # 使时间轮中该任务的条目全部失效
+        self._schedule_version.pop(task_id, None)
+        self._schedule_keys.pop(task_id, None)
+        self._ordered_tasks = None
+        # 释放 TaskManager 登记的暂停开关
+        task_info.task_manager.task_remove()
         
-        # 保存状态
-        self._save_state()
+        # 保存状态（删除操作立即落盘）
+        await self.flush_state()
         
         logger.info(f"任务删除成功: {task_id}")
         return True
@@ -544,8 +581,8 @@ class TaskDispatcher:
         task_info.task_manager.task_pause()
         
         # 设置 next_execution_time 为 None（暂停调度）
-        task_info.update_next_execution_time(None)
-        task_info.update_status(TaskStatus.PAUSED)
+        self._reschedule(task_info, None)
+        self._set_status(task_info, TaskStatus.PAUSED)
         
         # 保存状态
         self._save_state()
@@ -569,7 +606,7 @@ class TaskDispatcher:
         
         task_info = self.all_tasks[task_id]
         
-        if task_info.status != TaskStatus.PAUSED:
+        if task_info.status is not _PAUSED:
             logger.warning(f"任务不是暂停状态，无法恢复: {task_id}, status={task_info.status}")
             return False
         
@@ -578,8 +615,8 @@ class TaskDispatcher:
         
         # 重新计算 next_execution_time
         next_time = self._calculate_next_execution_time(task_info)
-        task_info.update_next_execution_time(next_time)
-        task_info.update_status(TaskStatus.PENDING)
+        self._reschedule(task_info, next_time)
+        self._set_status(task_info, TaskStatus.PENDING)
         
         # 保存状态
         self._save_state()
@@ -599,6 +636,166 @@ class TaskDispatcher:
         """
         return self.all_tasks.get(task_id)
     
+    def _push_schedule(self, task_info: TaskInfo):
+        """
+        将任务当前的 next_execution_time 写入时间轮
+        
+        递增任务版本号，使该任务此前的时间轮条目失效；失效条目过多时压缩时间轮。
+        """
+        task_id = task_info.task_id
+        version = self._schedule_version.get(task_id, 0) + 1
+        self._schedule_version[task_id] = version
+        next_time = task_info.next_execution_time
+        ts = next_time.timestamp() if next_time is not None else _NO_SCHEDULE_TS
+        created_ts = task_info.created_epoch
+        self._schedule_keys[task_id] = (ts, created_ts)
+        self._ordered_tasks = None
+        
+        if next_time is not None:
+            bucket = int(ts // self._wheel_slice_sec)
+            heapq.heappush(
+                self._wheel.setdefault(bucket, []),
+                (ts, created_ts, task_id, version)
+            )
+            self._wheel_size += 1
+            if self._min_bucket is None or bucket < self._min_bucket:
+                self._min_bucket = bucket
+        
+        # 调度发生变化，唤醒调度循环重新计算等待时间
+        self._wakeup_event.set()
+        
+        # 失效条目超过有效条目时压缩时间轮
+        if self._wheel_size > 2 * len(self._schedule_version) + 16:
+            self._compact_wheel()
+    
+    def _compact_wheel(self):
+        """
+        丢弃时间轮中已失效的条目
+        
+        失效条目平时留在桶中，等到桶到期时才被跳过；对远期任务反复调整时间会让它们堆积，
+        这里按版本号一次性过滤并重建各桶。
+        """
+        wheel = {}
+        size = 0
+        for bucket, entries in self._wheel.items():
+            live = [entry for entry in entries if self._schedule_version.get(entry[2]) == entry[3]]
+            if live:
+                heapq.heapify(live)
+                wheel[bucket] = live
+                size += len(live)
+        self._wheel = wheel
+        self._wheel_size = size
+        self._min_bucket = min(wheel) if wheel else None
+    
+    def _rebuild_schedule(self):
+        """
+        根据 all_tasks 一次性重建时间轮（用于启动时批量恢复）
+        
+        逐个 heappush 为 O(N log N)，这里收集条目后逐桶 heapify，整体 O(N)。
+        """
+        self._schedule_version = {task_id: 1 for task_id in self.all_tasks}
+        self._schedule_keys = {}
+        self._wheel = {}
+        for task_id, task_info in self.all_tasks.items():
+            next_time = task_info.next_execution_time
+            ts = next_time.timestamp() if next_time is not None else _NO_SCHEDULE_TS
+            created_ts = task_info.created_epoch
+            self._schedule_keys[task_id] = (ts, created_ts)
+            if next_time is not None:
+                self._wheel.setdefault(int(ts // self._wheel_slice_sec), []).append(
+                    (ts, created_ts, task_id, 1)
+                )
+        for bucket in self._wheel.values():
+            heapq.heapify(bucket)
+        self._wheel_size = sum(len(bucket) for bucket in self._wheel.values())
+        self._min_bucket = min(self._wheel) if self._wheel else None
+        self._ordered_tasks = None
+    
+    def _reschedule(self, task_info: TaskInfo, next_time: Optional[dt]):
+        """
+        更新任务的下次执行时间并同步时间轮
+        
+        Args:
+            task_info: 任务信息
+            next_time: 下次执行时间，None 表示暂停调度
+        """
+        task_info.update_next_execution_time(next_time)
+        self._push_schedule(task_info)
+    
+    def _set_status(self, task_info: TaskInfo, new_status: TaskStatus):
+        """更新任务状态并同步状态索引"""
+        old_status = task_info.status
+        task_info.update_status(new_status)
+        if old_status is not new_status and task_info.task_id in self.all_tasks:
+            self._tasks_by_status[old_status].pop(task_info.task_id, None)
+            self._tasks_by_status[new_status][task_info.task_id] = task_info
+            if new_status is _PENDING:
+                # 可能有空闲挂起的调度循环在等待
+                self._wakeup_event.set()
+    
+    def count_tasks_by_status(self) -> Dict[TaskStatus, int]:
+        """各状态任务数量（读取状态索引，无需遍历全部任务）"""
+        return {status: len(tasks) for status, tasks in self._tasks_by_status.items()}
+    
+    def _is_live_entry(self, task_id: str, version: int) -> bool:
+        """时间轮条目是否仍有效：版本号匹配且任务处于 PENDING 状态"""
+        if self._schedule_version.get(task_id) != version:
+            return False
+        return task_id in self._pending_tasks
+    
+    def _drop_bucket(self, bucket: int):
+        """删除已清空的桶并更新最小桶号"""
+        del self._wheel[bucket]
+        self._min_bucket = min(self._wheel) if self._wheel else None
+    
+    def _pop_due(self, now: dt) -> List[TaskInfo]:
+        """
+        从时间轮中取出所有已到期（next_execution_time <= now）且状态为 PENDING 的任务
+        
+        非 PENDING 任务的条目会被直接丢弃：任务回到 PENDING 时总会重新调度入轮。
+        
+        Args:
+            now: 当前时间
+            
+        Returns:
+            List[TaskInfo]: 到期任务，按 (next_execution_time, created_at) 排序
+        """
+        now_ts = now.timestamp()
+        now_bucket = int(now_ts // self._wheel_slice_sec)
+        due = []
+        while self._min_bucket is not None and self._min_bucket <= now_bucket:
+            bucket = self._min_bucket
+            entries = self._wheel[bucket]
+            while entries and entries[0][0] <= now_ts:
+                _, _, task_id, version = heapq.heappop(entries)
+                self._wheel_size -= 1
+                if self._is_live_entry(task_id, version):
+                    due.append(self.all_tasks[task_id])
+            if entries:
+                # 当前分钟内仍有未到期条目
+                break
+            self._drop_bucket(bucket)
+        return due
+    
+    def _next_due_ts(self) -> Optional[float]:
+        """
+        获取时间轮中最早的有效执行时间
+        
+        Returns:
+            最早的 PENDING 任务的下次执行时间戳，没有则返回 None
+        """
+        while self._min_bucket is not None:
+            bucket = self._min_bucket
+            entries = self._wheel[bucket]
+            while entries:
+                ts, _, task_id, version = entries[0]
+                if self._is_live_entry(task_id, version):
+                    return ts
+                heapq.heappop(entries)
+                self._wheel_size -= 1
+            self._drop_bucket(bucket)
+        return None
+    
     def list_tasks(self, account_id: Optional[str] = None) -> List[TaskInfo]:
         """
         列出所有任务
@@ -610,18 +807,20 @@ class TaskDispatcher:
             List[TaskInfo]: 任务列表（按 next_execution_time 排序）
         """
         if account_id:
-            task_ids = self.account_tasks.get(account_id, [])
+            task_ids = self.account_tasks.get(account_id, ())
             tasks = [self.all_tasks[tid] for tid in task_ids if tid in self.all_tasks]
-        else:
-            tasks = list(self.all_tasks.values())
+            
+            # 按 next_execution_time 排序（None 排在最后），直接使用调度时缓存的排序键
+            schedule_keys = self._schedule_keys
+            tasks.sort(key=lambda x: schedule_keys[x.task_id])
+            return tasks
         
-        # 按 next_execution_time 排序（None 排在最后）
-        tasks.sort(key=lambda x: (
-            x.next_execution_time if x.next_execution_time else dt.max,
-            x.created_at
-        ))
+        # 全量列表：按缓存的排序键排序，结果缓存到下一次重新调度
+        if self._ordered_tasks is None:
+            schedule_keys = self._schedule_keys
+            self._ordered_tasks = sorted(self.all_tasks.values(), key=lambda x: schedule_keys[x.task_id])
         
-        return tasks
+        return list(self._ordered_tasks)
     
     def reorder_task(self, task_id: str, priority_offset: int) -> bool:
         """
@@ -644,30 +843,32 @@ class TaskDispatcher:
         
         task_info = self.all_tasks[task_id]
         
-        if task_info.status == TaskStatus.RUNNING:
+        if task_info.status is _RUNNING:
             raise ValueError(f"任务正在运行，无法调整优先级: {task_id}")
         
-        if task_info.status == TaskStatus.PAUSED:
+        if task_info.status is _PAUSED:
             raise ValueError(f"任务已暂停，请先恢复任务: {task_id}")
         
-        if task_info.status == TaskStatus.COMPLETED:
+        if task_info.status is _COMPLETED:
             raise ValueError(f"任务已完成，无法调整优先级: {task_id}")
         
         if task_info.next_execution_time is None:
             raise ValueError(f"任务没有下次执行时间，无法调整: {task_id}")
         
-        # 调整 next_execution_time
-        new_time = task_info.next_execution_time + timedelta(seconds=priority_offset)
+        # 调整 next_execution_time（全程使用时间戳计算）
+        new_ts = task_info.next_execution_time.timestamp() + priority_offset
         
         # 确保调整后的时间在有效时间范围内
-        if not self._is_in_valid_time_range(new_time, task_info.valid_time_range):
-            new_time = self._get_next_valid_time_start(new_time, task_info.valid_time_range)
+        hours = task_info.valid_time_range
+        if not _in_valid_hours(new_ts, hours):
+            new_ts = _next_valid_start_ts(new_ts, hours)
         
         # 检查是否超过结束时间（如果设置了结束时间）
-        if task_info.task_end_time is not None and new_time.date() >= task_info.task_end_time:
+        if not task_info.is_active_at(new_ts):
             raise ValueError(f"调整后的时间超过任务结束时间: {task_id}")
         
-        task_info.update_next_execution_time(new_time)
+        new_time = dt.fromtimestamp(new_ts)
+        self._reschedule(task_info, new_time)
         
         # 保存状态
         self._save_state()
@@ -676,6 +877,16 @@ class TaskDispatcher:
         
         return True
     
+    def _claim_running_slot(self, task_info: TaskInfo):
+        """占用执行槽位（调用方需保证槽位空闲）"""
+        self.running_task = task_info
+        self._slot_free.clear()
+    
+    def _release_running_slot(self):
+        """释放执行槽位并唤醒等待的调度循环"""
+        self.running_task = None
+        self._slot_free.set()
+    
     async def execute_task_immediately(self, task_id: str, update_next_execution_time: bool = True) -> dict:
         """
         立即执行指定任务（不等待调度器调度）
@@ -699,129 +910,121 @@ class TaskDispatcher:
             raise ValueError(f"任务不存在: {task_id}")
         
         # 2. 检查任务状态
-        if task_info.status == TaskStatus.COMPLETED:
+        if task_info.status is _COMPLETED:
             raise ValueError(f"任务已完成，无法再次执行: {task_id}")
         
         # 3. 如果任务已暂停，给出警告但不阻止执行
-        if task_info.status == TaskStatus.PAUSED:
+        if task_info.status is _PAUSED:
             logger.warning(f"任务 {task_id} 当前状态为 PAUSED，但仍将立即执行")
         
-        # 4. 检查是否有其他任务正在运行（需要使用全局锁检查）
-        # 注意：这里只是初步检查，真正的检查在获取锁之后进行
+        # 4. 检查是否有其他任务正在运行
         if self.running_task and self.running_task.task_id != task_id:
             raise ValueError(
                 f"当前有其他任务正在执行中（task_id: {self.running_task.task_id}），"
                 f"无法立即执行任务 {task_id}。请等待当前任务完成后再试。"
             )
         
-        # 5. 如果任务正在运行，检查是否是同一个任务
-        if task_info.status == TaskStatus.RUNNING:
-            if self.running_task and self.running_task.task_id == task_id:
-                raise ValueError(f"任务正在执行中，无法重复执行: {task_id}")
-            else:
-                # 状态不一致，更新状态
-                logger.warning(f"任务 {task_id} 状态为 RUNNING 但不在运行列表中，将重置状态")
-                task_info.update_status(TaskStatus.PENDING)
-        
-        # 6. 使用全局锁执行任务（确保同一时间只有一个任务执行）
-        async with self.execution_lock:
-            # 再次检查是否有其他任务正在运行（可能在获取锁的过程中有其他任务开始执行）
-            if self.running_task and self.running_task.task_id != task_id:
-                raise ValueError(
-                    f"当前有其他任务正在执行中（task_id: {self.running_task.task_id}），"
-                    f"无法立即执行任务 {task_id}。请等待当前任务完成后再试。"
-                )
-            # 再次检查任务状态（可能在获取锁的过程中被修改）
-            if task_info.status == TaskStatus.COMPLETED:
-                raise ValueError(f"任务已完成，无法再次执行: {task_id}")
+        # 5. 如果任务正在运行（包括执行中被暂停的情况），不允许重复执行
+        if self.running_task is task_info:
+            raise ValueError(f"任务正在执行中，无法重复执行: {task_id}")
+        if task_info.status is _RUNNING:
+            # 状态不一致，更新状态
+            logger.warning(f"任务 {task_id} 状态为 RUNNING 但不在运行列表中，将重置状态")
+            self._set_status(task_info, TaskStatus.PENDING)
+            self._push_schedule(task_info)
+        
+        # 6. 占用执行槽位（上面的检查与此处之间没有 await，无需加锁）
+        self._claim_running_slot(task_info)
+        
+        try:
+            # 标记为运行中
+            self._set_status(task_info, TaskStatus.RUNNING)
             
-            try:
-                # 标记为运行中
-                task_info.update_status(TaskStatus.RUNNING)
-                self.running_task = task_info
-                
-                # 绑定 task_id 和 bindtype 到 logger，使得调度器级别的日志也被收集
-                from app.data.constants import LogBindType
-                task_logger = logger.bind(task_id=task_id, bindtype=LogBindType.TASK_LOG)
-                
-                execution_start_time = dt.now()
-                task_logger.info(
-                    f"立即执行任务: task_id={task_info.task_id}, "
-                    f"account_id={task_info.account_id}"
-                )
-                
-                # 执行任务（同步执行，等待完成）
-                # TaskManager.run_once() 内部已经绑定了 task_id，所以任务执行日志会被收集
-                # 立即执行时跳过时间范围检查（skip_time_check=True）
-                should_continue = await task_info.task_manager.run_once(skip_time_check=True)
-                
-                # 更新执行时间
-                execution_end_time = dt.now()
-                task_info.update_execution_time(execution_end_time)
-                
-                execution_result = {
-                    "task_id": task_id,
-                    "execution_start_time": execution_start_time.isoformat(),
-                    "execution_end_time": execution_end_time.isoformat(),
-                    "duration_seconds": (execution_end_time - execution_start_time).total_seconds(),
-                    "should_continue": should_continue,
-                    "success": True
-                }
-                
-                if should_continue:
-                    # 任务未到期，可以继续
-                    # 检查任务是否在执行过程中被暂停
-                    if task_info.status == TaskStatus.PAUSED:
-                        task_logger.info(
-                            f"任务立即执行完成，但任务已被暂停: task_id={task_info.task_id}"
-                        )
-                        execution_result["next_execution_time"] = None
-                    else:
-                        if update_next_execution_time:
-                            # 基于当前时间重新计算下次执行时间
-                            next_time = self._calculate_next_execution_time(task_info)
-                            task_info.update_next_execution_time(next_time)
-                            execution_result["next_execution_time"] = next_time.isoformat() if next_time else None
-                        
-                        task_info.update_status(TaskStatus.PENDING)
-                        task_logger.info(
-                            f"任务立即执行完成: task_id={task_info.task_id}, "
-                            f"next_execution_time={execution_result.get('next_execution_time', '未更新')}"
-                        )
-                else:
-                    # 任务已到期
-                    task_info.update_next_execution_time(None)
-                    task_info.update_status(TaskStatus.COMPLETED)
-                    execution_result["next_execution_time"] = None
-                    task_logger.info(f"任务立即执行完成，但任务已到期: task_id={task_info.task_id}")
-                
-                # 保存状态
-                self._save_state()
-                
-                return execution_result
+            # 使用绑定了 task_id 的 logger，使得调度器级别的日志也被收集
+            task_logger = task_info.task_logger
             
-            except Exception as e:
-                task_logger.error(f"任务立即执行异常: task_id={task_info.task_id}, error={e}", exc_info=True)
-                task_info.update_status(TaskStatus.ERROR)
-                
-                # 即使出错，如果任务未到期，仍然可以继续调度
-                # 但需要检查任务是否在执行过程中被暂停
-                if task_info.status != TaskStatus.PAUSED and (task_info.task_end_time is None or dt.now().date() < task_info.task_end_time):
+            execution_start_time = dt.now()
+            task_logger.info(
+                f"立即执行任务: task_id={task_info.task_id}, "
+                f"account_id={task_info.account_id}"
+            )
+            
+            # 执行任务（同步执行，等待完成）
+            # TaskManager.run_once() 内部已经绑定了 task_id，所以任务执行日志会被收集
+            # 立即执行时跳过时间范围检查（skip_time_check=True）
+            should_continue = await task_info.task_manager.run_once(skip_time_check=True)
+            
+            # 更新执行时间
+            execution_end_time = dt.now()
+            task_info.update_execution_time(execution_end_time)
+            
+            execution_result = {
+                "task_id": task_id,
+                "execution_start_time": execution_start_time.isoformat(),
+                "execution_end_time": execution_end_time.isoformat(),
+                "duration_seconds": (execution_end_time - execution_start_time).total_seconds(),
+                "should_continue": should_continue,
+                "success": True
+            }
+            
+            if should_continue:
+                # 任务未到期，可以继续
+                # 检查任务是否在执行过程中被暂停
+                if task_info.status is _PAUSED:
+                    task_logger.info(
+                        f"任务立即执行完成，但任务已被暂停: task_id={task_info.task_id}"
+                    )
+                    execution_result["next_execution_time"] = None
+                else:
                     if update_next_execution_time:
+                        # 基于当前时间重新计算下次执行时间
                         next_time = self._calculate_next_execution_time(task_info)
-                        task_info.update_next_execution_time(next_time)
-                    task_info.update_status(TaskStatus.PENDING)
-                
-                # 保存状态
-                self._save_state()
-                
-                # 返回错误信息
-                raise RuntimeError(f"任务执行失败: {str(e)}")
+                        self._reschedule(task_info, next_time)
+                        execution_result["next_execution_time"] = next_time.isoformat() if next_time else None
+                    
+                    self._set_status(task_info, TaskStatus.PENDING)
+                    if not update_next_execution_time:
+                        # 保持原执行时间，重新放回时间轮
+                        self._push_schedule(task_info)
+                    task_logger.info(
+                        f"任务立即执行完成: task_id={task_info.task_id}, "
+                        f"next_execution_time={execution_result.get('next_execution_time', '未更新')}"
+                    )
+            else:
+                # 任务已到期
+                self._reschedule(task_info, None)
+                self._set_status(task_info, TaskStatus.COMPLETED)
+                execution_result["next_execution_time"] = None
+                task_logger.info(f"任务立即执行完成，但任务已到期: task_id={task_info.task_id}")
+            
+            # 保存状态
+            self._save_state()
+            
+            return execution_result
+        
+        except Exception as e:
+            task_logger.error(f"任务立即执行异常: task_id={task_info.task_id}, error={e}", exc_info=True)
+            self._set_status(task_info, TaskStatus.ERROR)
             
-            finally:
-                # 清除运行中标记
-                if self.running_task and self.running_task.task_id == task_id:
-                    self.running_task = None
+            # 即使出错，如果任务未到期，仍然可以继续调度
+            # 但需要检查任务是否在执行过程中被暂停
+            if task_info.status is not _PAUSED and task_info.is_active_at(time.time()):
+                self._set_status(task_info, TaskStatus.PENDING)
+                if update_next_execution_time:
+                    next_time = self._calculate_next_execution_time(task_info)
+                    self._reschedule(task_info, next_time)
+                else:
+                    self._push_schedule(task_info)
+            
+            # 保存状态
+            self._save_state()
+            
+            # 返回错误信息
+            raise RuntimeError(f"任务执行失败: {str(e)}")
+        
+        finally:
+            # 释放执行槽位
+            self._release_running_slot()
     
     async def _scheduler_loop(self):
         """调度器主循环"""
@@ -829,135 +1032,119 @@ class TaskDispatcher:
         
         while not self._stop_event.is_set():
             try:
+                if not self._pending_tasks:
+                    # 没有 PENDING 任务：直接挂起在唤醒事件上，直到有任务进入 PENDING 或调度器停止
+                    self._wakeup_event.clear()
+                    await self._wait_for_wakeup(None)
+                    continue
+                
                 now = dt.now()
                 
-                # 1. 找到所有需要执行的任务（next_execution_time <= now 且状态为 PENDING）
-                ready_tasks = [
-                    task_info for task_info in self.all_tasks.values()
-                    if (task_info.next_execution_time is not None and 
-                        task_info.next_execution_time <= now and
-                        task_info.status == TaskStatus.PENDING)
-                ]
+                # 1. 从时间轮取出所有到期任务（next_execution_time <= now 且状态为 PENDING），
+                #    只访问到期的桶，结果已按 (next_execution_time, created_at) 排序
+                ready_tasks = self._pop_due(now)
                 
                 # 如果找到了待执行的任务，记录日志
                 if ready_tasks:
                     logger.info(f"找到 {len(ready_tasks)} 个待执行任务: {[t.task_id for t in ready_tasks]}")
-                else:
-                    # 记录所有任务的状态，用于调试
-                    for task_info in self.all_tasks.values():
-                        logger.debug(
-                            f"任务 {task_info.task_id}: status={task_info.status.value}, "
-                            f"next_execution_time={task_info.next_execution_time}, "
-                            f"now={now}, ready={task_info.next_execution_time <= now if task_info.next_execution_time else False}"
-                        )
-                
-                # 2. 按 next_execution_time 排序（时间冲突时按创建时间排序）
-                ready_tasks.sort(key=lambda x: (x.next_execution_time, x.created_at))
                 
-                # 3. 执行任务
-                for task_info in ready_tasks:
+                # 2. 执行任务
+                for index, task_info in enumerate(ready_tasks):
                     if self._stop_event.is_set():
+                        # 已出轮但未执行的任务放回时间轮
+                        for remaining in ready_tasks[index:]:
+                            if remaining.status is _PENDING:
+                                self._push_schedule(remaining)
                         break
                     
                     # 再次检查任务状态（可能在其他地方被修改）
-                    if task_info.status != TaskStatus.PENDING:
+                    if task_info.status is not _PENDING:
                         continue
                     
-                    # 使用全局锁串行执行
-                    async with self.execution_lock:
-                        if task_info.status != TaskStatus.PENDING:
-                            continue
+                    # 等待执行槽位空闲（可能有立即执行的任务占用），串行执行
+                    while self.running_task is not None:
+                        await self._slot_free.wait()
+                    if task_info.status is not _PENDING:
+                        continue
+                    self._claim_running_slot(task_info)
+                    
+                    try:
+                        # 标记为运行中
+                        self._set_status(task_info, TaskStatus.RUNNING)
                         
-                        try:
-                            # 标记为运行中
-                            task_info.update_status(TaskStatus.RUNNING)
-                            self.running_task = task_info
-                            
-                            # 绑定 task_id 和 bindtype 到 logger，使得调度器级别的日志也被收集
-                            from app.data.constants import LogBindType
-                            task_logger = logger.bind(task_id=task_info.task_id, bindtype=LogBindType.TASK_LOG)
-                            task_logger.info(
-                                f"开始执行任务: task_id={task_info.task_id}, "
-                                f"account_id={task_info.account_id}"
-                            )
-                            
-                            # 执行任务（TaskManager.run_once() 内部已经绑定了 task_id）
-                            should_continue = await task_info.task_manager.run_once()
-                            
-                            # 更新执行时间
-                            task_info.update_execution_time(dt.now())
-                            
-                            if should_continue:
-                                # 检查任务是否在执行过程中被暂停
-                                # 如果状态已经是 PAUSED（在执行过程中被暂停），保持 PAUSED 状态
-                                if task_info.status == TaskStatus.PAUSED:
-                                    task_logger.info(
-                                        f"任务执行完成，但任务已被暂停: task_id={task_info.task_id}"
-                                    )
-                                else:
-                                    # 计算下次执行时间
-                                    next_time = self._calculate_next_execution_time(task_info)
-                                    task_info.update_next_execution_time(next_time)
-                                    task_info.update_status(TaskStatus.PENDING)
-                                    task_logger.info(
-                                        f"任务执行完成: task_id={task_info.task_id}, "
-                                        f"next_execution_time={next_time}"
-                                    )
-                            else:
-                                # 任务已到期
-                                task_info.update_next_execution_time(None)
-                                task_info.update_status(TaskStatus.COMPLETED)
-                                task_logger.info(f"任务已到期: task_id={task_info.task_id}")
-                            
-                            # 保存状态
-                            self._save_state()
+                        # 使用绑定了 task_id 的 logger，使得调度器级别的日志也被收集
+                        task_logger = task_info.task_logger
+                        task_logger.info(
+                            f"开始执行任务: task_id={task_info.task_id}, "
+                            f"account_id={task_info.account_id}"
+                        )
                         
-                        except Exception as e:
-                            task_logger.error(f"任务执行异常: task_id={task_info.task_id}, error={e}", exc_info=True)
-                            task_info.update_status(TaskStatus.ERROR)
-                            # 即使出错，如果任务未到期，仍然可以继续调度
-                            # 检查任务是否未到期（如果 task_end_time 为 None，则认为任务未到期）
-                            # 但需要检查任务是否在执行过程中被暂停
-                            if task_info.status != TaskStatus.PAUSED and (task_info.task_end_time is None or dt.now().date() < task_info.task_end_time):
-                                next_time = self._calculate_next_execution_time(task_info)
-                                task_info.update_next_execution_time(next_time)
-                                task_info.update_status(TaskStatus.PENDING)
-                            
-                            # 保存状态
-                            self._save_state()
+                        # 执行任务（TaskManager.run_once() 内部已经绑定了 task_id）
+                        should_continue = await task_info.task_manager.run_once()
+                        
+                        # 更新执行时间
+                        task_info.update_execution_time(dt.now())
                         
-                        finally:
-                            self.running_task = None
+                        if should_continue:
+                            # 检查任务是否在执行过程中被暂停
+                            # 如果状态已经是 PAUSED（在执行过程中被暂停），保持 PAUSED 状态
+                            if task_info.status is _PAUSED:
+                                task_logger.info(
+                                    f"任务执行完成，但任务已被暂停: task_id={task_info.task_id}"
+                                )
+                            else:
+                                # 计算下次执行时间
+                                next_time = self._calculate_next_execution_time(task_info)
+                                self._reschedule(task_info, next_time)
+                                self._set_status(task_info, TaskStatus.PENDING)
+                                task_logger.info(
+                                    f"任务执行完成: task_id={task_info.task_id}, "
+                                    f"next_execution_time={next_time}"
+                                )
+                        else:
+                            # 任务已到期
+                            self._reschedule(task_info, None)
+                            self._set_status(task_info, TaskStatus.COMPLETED)
+                            task_logger.info(f"任务已到期: task_id={task_info.task_id}")
+                    
+                    except Exception as e:
+                        task_logger.error(f"任务执行异常: task_id={task_info.task_id}, error={e}", exc_info=True)
+                        self._set_status(task_info, TaskStatus.ERROR)
+                        # 即使出错，如果任务未到期，仍然可以继续调度
+                        # 检查任务是否未到期（如果 task_end_time 为 None，则认为任务未到期）
+                        # 但需要检查任务是否在执行过程中被暂停
+                        if task_info.status is not _PAUSED and task_info.is_active_at(time.time()):
+                            next_time = self._calculate_next_execution_time(task_info)
+                            self._reschedule(task_info, next_time)
+                            self._set_status(task_info, TaskStatus.PENDING)
+                    
+                    finally:
+                        # 无论成功与否只标记一次脏状态，由后台落盘任务合并写入
+                        self._save_state()
+                        self._release_running_slot()
                 
-                # 4. 计算下次检查时间
-                pending_tasks = [
-                    t for t in self.all_tasks.values()
-                    if t.next_execution_time is not None and t.status == TaskStatus.PENDING
-                ]
+                # 3. 计算下次检查时间（时间轮中最早的有效条目）
+                #    先清除唤醒标记：此后的任何调度变更都会让等待立即返回
+                self._wakeup_event.clear()
+                next_check_ts = self._next_due_ts()
+                wait_seconds = None if next_check_ts is None else next_check_ts - time.time()
                 
-                if pending_tasks:
-                    next_check_time = min(t.next_execution_time for t in pending_tasks)
-                    wait_seconds = (next_check_time - dt.now()).total_seconds()
-                    
+                if not ready_tasks:
+                    # 空转时只输出一行汇总；参数延迟格式化，DEBUG 关闭时不构造字符串
+                    logger.debug(
+                        "暂无到期任务: 任务总数={}, 待执行={}, 距下次检查={}秒",
+                        len(self.all_tasks), len(self._pending_tasks), wait_seconds
+                    )
+                
+                if wait_seconds is None:
+                    # 没有待执行任务，等待停止或调度变更
+                    await self._wait_for_wakeup(None)
+                else:
                     if wait_seconds > 0:
-                        # 等待到下次检查时间，但最多等待60秒
-                        wait_seconds = min(wait_seconds, 60)
-                        try:
-                            await asyncio.wait_for(
-                                self._stop_event.wait(),
-                                timeout=wait_seconds
-                            )
-                        except asyncio.TimeoutError:
-                            pass  # 正常超时，继续循环
+                        await self._wait_for_wakeup(wait_seconds)
                     else:
-                        # 立即检查
-                        await asyncio.sleep(0.1)
-                else:
-                    # 没有待执行任务，等待一段时间
-                    try:
-                        await asyncio.wait_for(self._stop_event.wait(), timeout=60)
-                    except asyncio.TimeoutError:
-                        pass  # 正常超时，继续循环
+                        # 已到期，让出事件循环后立即检查
+                        await asyncio.sleep(0)
             
             except Exception as e:
                 logger.error(f"调度器循环异常: {e}", exc_info=True)
@@ -965,6 +1152,20 @@ class TaskDispatcher:
         
         logger.info("调度器主循环停止")
     
+    async def _wait_for_wakeup(self, timeout: Optional[float]):
+        """
+        等待调度变更事件，最多等待 timeout 秒（None 表示不限时）
+        
+        stop() 会同时设置唤醒事件，因此这里只需等待一个事件，不必为停止事件另建等待任务。
+        """
+        if self._stop_event.is_set():
+            return
+        try:
+            async with asyncio.timeout(timeout):
+                await self._wakeup_event.wait()
+        except TimeoutError:
+            pass
+    
     async def start(self):
         """启动调度器（开始执行任务队列）"""
         if self.scheduler_task is not None and not self.scheduler_task.done():
@@ -979,6 +1180,8 @@ class TaskDispatcher:
         """停止调度器（等待当前任务完成，不再执行新任务）"""
         logger.info("正在停止调度器...")
         self._stop_event.set()
+        # 唤醒正在等待的调度循环
+        self._wakeup_event.set()
         
         if self.scheduler_task is not None:
             # 等待调度器循环结束
@@ -999,265 +1202,564 @@ class TaskDispatcher:
             await asyncio.sleep(5)
         
         # 保存最终状态
-        self._save_state()
+        await self.flush_state()
         
         logger.info("调度器已停止")
     
     def _save_state(self):
         """
-        保存调度器状态到本地文件
+        标记调度器状态已变更
+        
+        实际写入由后台任务 _persist_loop 在 STATE_SAVE_DEBOUNCE_SEC 窗口后合并完成
+        （追加操作日志，必要时压缩为完整快照）；不在事件循环中调用时直接同步写入快照。
+        """
+        self._dirty_event.set()
+        if self._persist_task is None or self._persist_task.done():
+            try:
+                self._persist_task = asyncio.get_running_loop().create_task(self._persist_loop())
+            except RuntimeError:
+                self._dirty_event.clear()
+                self._compact_state_sync()
+    
+    async def _persist_loop(self):
+        """后台合并写入：等待变更标记，延迟一个合并窗口后写入一次"""
+        while True:
+            await self._dirty_event.wait()
+            await asyncio.sleep(STATE_SAVE_DEBOUNCE_SEC)
+            self._dirty_event.clear()
+            # 通常只追加变更任务的操作日志；日志过长时写入完整快照并清空日志。
+            # 序列化在事件循环线程完成（读取任务数据无需加锁），快照和日志的文件写入放到线程池
+            if self._oplog_lines >= OPLOG_COMPACT_LINES:
+                await self._compact_state()
+            else:
+                await self._append_oplog()
+    
+    def flush_state_sync(self):
+        """立即写入完整快照并 fsync（同步版本，可在事件循环之外调用）"""
+        self._dirty_event.clear()
+        self._compact_state_sync(fsync=True)
+    
+    async def flush_state(self):
+        """立即写入完整快照并 fsync（用于删除任务、停止调度器和应用关闭）"""
+        self._dirty_event.clear()
+        await self._compact_state(fsync=True)
+    
+    def _dump_state_to_path(self, path: Path, fsync: bool = False):
+        """
+        同步序列化并保存调度器状态到指定文件
+        
+        Args:
+            path: 目标文件路径
+            fsync: 是否在替换前 fsync 临时文件
+        """
+        snapshot = self._snapshot_state()
+        if snapshot is not None:
+            self._write_state_bytes(path, *snapshot, fsync)
+    
+    def _snapshot_state(self) -> Optional[Tuple[int, bytes]]:
+        """序列化当前状态并分配递增的快照序号，序列化失败时返回 None"""
+        config_bytes = self._build_state_bytes()
+        if config_bytes is None:
+            return None
+        self._state_seq += 1
+        return self._state_seq, config_bytes
+    
+    def _write_state_bytes(self, path: Path, seq: int, config_bytes: bytes, fsync: bool = False):
+        """
+        将状态快照写入文件（可在工作线程中调用）
+        
+        先写入同目录下的临时文件再 os.replace 原子替换，写入中途崩溃不会损坏原文件。
+        增量保存不做 fsync，仅 flush_state_sync / flush_state 时 fsync。
+        后台写入与立即写入可能并发，写入锁串行化文件操作，序号不大于已写入快照的写入直接丢弃，
+        避免旧快照覆盖新快照。
+        
+        Args:
+            path: 目标文件路径
+            seq: 快照序号
+            config_bytes: 序列化后的状态
+            fsync: 是否在替换前 fsync 临时文件
+        """
+        with self._state_write_lock:
+            if seq <= self._written_seq:
+                return
+            try:
+                tmp_file = path.with_suffix(".json.tmp")
+                if fsync:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(config_bytes)
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    tmp_file.write_bytes(config_bytes)
+                os.replace(tmp_file, path)
+                self._written_seq = seq
+                
+                logger.debug(f"调度器状态已保存: {path}")
+            
+            except Exception as e:
+                logger.error(f"保存调度器状态失败: {e}", exc_info=True)
+    
+    def _refresh_serialized_cache(self) -> Tuple[List[str], List[str]]:
+        """
+        按变更标识刷新每个任务的序列化缓存
+        
+        Returns:
+            (变更过的任务ID列表, 已删除的任务ID列表)
+        """
+        # 构建可序列化的任务数据：未变更的任务直接复用上次的序列化结果
+        changed = []
+        serialized_cache = {}
+        for task_id, task_info in self.all_tasks.items():
+            round_num = getattr(task_info.task_manager, 'round_num', 0)
+            # updated_at 覆盖绝大多数变更；interval 可能被接口层直接修改，round_num 存于 task_manager
+            cache_key = (task_info.updated_at, task_info.interval, round_num)
+            cached = self._serialized_cache.get(task_id)
+            if cached is not None and cached[0] == cache_key:
+                serialized_cache[task_id] = cached
+                continue
+            
+            # kwargs 中的 date 等对象由编码器的 default 钩子处理；kwargs 创建后很少变化，编码结果缓存在 TaskInfo 上
+            kwargs = task_info.kwargs
+            memo = task_info._kwargs_serialized
+            if memo is not None and memo[0] is kwargs and memo[1] == task_info._kwargs_version:
+                kwargs_blob = memo[2]
+            else:
+                kwargs_blob = self._dumps(kwargs or {})
+                task_info._kwargs_serialized = (kwargs, task_info._kwargs_version, kwargs_blob)
+            
+            # 原地更新任务自带的序列化字典，避免每次保存都新建；
+            # date/datetime/枚举直接交给编码器（orjson 原生支持，其他类型走 _json_default）
+            task_data = task_info._persist_scratch
+            task_data["task_id"] = task_info.task_id
+            task_data["account_id"] = task_info.account_id
+            task_data["account_name"] = task_info.account_name
+            task_data["task_type"] = task_info.task_type
+            task_data["status"] = task_info.status
+            task_data["mode"] = task_info.mode
+            task_data["interaction_note_count"] = task_info.interaction_note_count
+            task_data["interval"] = task_info.interval
+            task_data["valid_time_range"] = task_info.valid_time_range
+            task_data["task_end_time"] = task_info.task_end_time
+            task_data["last_execution_time"] = task_info.last_execution_time
+            task_data["next_execution_time"] = task_info.next_execution_time
+            task_data["created_at"] = task_info.created_at
+            task_data["updated_at"] = task_info.updated_at
+            task_data["round_num"] = round_num  # 保存任务执行轮次
+            task_data["sys_type"] = kwargs.get('sys_type', SYS_TYPE.MAC_INTEL.value) if kwargs else SYS_TYPE.MAC_INTEL.value  # 保存 sys_type
+            # 拼接已编码的 kwargs（任务创建参数，用于恢复 TaskManager）
+            blob = b"".join((self._dumps(task_data)[:-1], b', "kwargs": ', kwargs_blob, b"}"))
+            serialized_cache[task_id] = (cache_key, blob)
+            changed.append(task_id)
+        
+        # 清理已删除任务的缓存
+        removed = [task_id for task_id in self._serialized_cache if task_id not in serialized_cache]
+        self._serialized_cache = serialized_cache
+        return changed, removed
+    
+    def _build_state_bytes(self) -> Optional[bytes]:
+        """
+        序列化调度器状态，失败时返回 None
         
         保存的信息包括：
         - 所有任务的信息（不包括 task_manager 对象，保存创建参数）
         - 账户任务映射
         - 任务执行时间信息
+        - oplog_seq：快照已包含的最后一条操作日志序号
         """
         try:
-            # 递归函数：将字典中的 date 对象转换为字符串
-            def serialize_dates(obj):
-                """递归处理对象，将 date 和 datetime 对象转换为字符串"""
-                if isinstance(obj, date):
-                    return obj.isoformat()
-                elif isinstance(obj, dt):
-                    return obj.isoformat()
-                elif isinstance(obj, dict):
-                    return {key: serialize_dates(value) for key, value in obj.items()}
-                elif isinstance(obj, list):
-                    return [serialize_dates(item) for item in obj]
-                elif isinstance(obj, (int, float, str, bool, type(None))):
-                    return obj
-                else:
-                    # 其他类型尝试转换为字符串
-                    return str(obj)
+            self._refresh_serialized_cache()
+            task_blobs = self._persist_blobs
+            task_blobs.clear()
+            task_blobs.extend(entry[1] for entry in self._serialized_cache.values())
             
-            # 构建可序列化的任务数据
-            tasks_data = []
-            for task_id, task_info in self.all_tasks.items():
-                # 处理 kwargs，确保其中的 date 对象被序列化
-                serialized_kwargs = serialize_dates(task_info.kwargs) if task_info.kwargs else {}
-                
-                task_data = {
-                    "task_id": task_info.task_id,
-                    "account_id": task_info.account_id,
-                    "account_name": task_info.account_name,
-                    "task_type": task_info.task_type,
-                    "status": task_info.status.value,
-                    "mode": task_info.mode.value if hasattr(task_info.mode, 'value') else str(task_info.mode),
-                    "interaction_note_count": task_info.interaction_note_count,
-                    "interval": task_info.interval,
-                    "valid_time_range": task_info.valid_time_range,
-                    "task_end_time": task_info.task_end_time.isoformat() if isinstance(task_info.task_end_time, date) else (None if task_info.task_end_time is None else str(task_info.task_end_time)),
-                    "last_execution_time": task_info.last_execution_time.isoformat() if task_info.last_execution_time else None,
-                    "next_execution_time": task_info.next_execution_time.isoformat() if task_info.next_execution_time else None,
-                    "created_at": task_info.created_at.isoformat() if task_info.created_at else None,
-                    "updated_at": task_info.updated_at.isoformat() if task_info.updated_at else None,
-                    "round_num": getattr(task_info.task_manager, 'round_num', 0),  # 保存任务执行轮次
-                    "kwargs": serialized_kwargs,  # 保存任务创建参数（已处理 date 对象），用于恢复 TaskManager
-                    "sys_type": serialized_kwargs.get('sys_type', SYS_TYPE.MAC_INTEL.value) if serialized_kwargs else SYS_TYPE.MAC_INTEL.value  # 保存 sys_type
-                }
-                tasks_data.append(task_data)
-            
-            # 构建配置数据
-            config_data = {
-                "version": "1.0",
-                "saved_at": dt.now().isoformat(),
-                "tasks": tasks_data,
-                "account_tasks": self.account_tasks
-            }
-            
-            # 保存到文件
-            with open(self._config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
-            
-            logger.debug(f"调度器状态已保存: {self._config_file}")
+            # 在字节层面拼接配置数据，不重建整体对象树
+            return b"".join((
+                b'{"version": "1.0", "saved_at": ', self._dumps(dt.now().isoformat()),
+                b', "oplog_seq": ', str(self._oplog_seq).encode(),
+                b', "tasks": [', b", ".join(task_blobs),
+                b'], "account_tasks": ', self._dumps({aid: list(tids) for aid, tids in self.account_tasks.items()}), b"}"
+            ))
         
         except Exception as e:
-            logger.error(f"保存调度器状态失败: {e}", exc_info=True)
+            logger.error(f"序列化调度器状态失败: {e}", exc_info=True)
+            return None
     
-    def _load_state(self):
+    async def _append_oplog(self):
         """
-        从本地文件加载调度器状态
+        将自上次保存以来变更/删除的任务追加到操作日志（文件写入在线程池中进行）
         
-        恢复所有任务信息，并重新创建 TaskManager 实例
+        每条记录是一行 JSON：{"seq": N, "op": "upsert", "task": {...}} 或 {"seq": N, "op": "remove", "task_id": ...}。
+        upsert 携带任务的完整记录（复用序列化缓存），回放时直接覆盖，无需按字段合并。
+        写入成功后才推进 _oplog_seq；写入失败时把这些任务重新标记为已变更，留待下一次保存。
         """
-        if not os.path.exists(self._config_file):
-            logger.info(f"调度器配置文件不存在，使用空状态: {self._config_file}")
+        previous_cache = self._serialized_cache
+        try:
+            changed, removed = self._refresh_serialized_cache()
+        except Exception as e:
+            logger.error(f"序列化调度器操作日志失败: {e}", exc_info=True)
+            return
+        if not changed and not removed:
             return
         
+        seq = self._oplog_seq
+        lines = []
+        for task_id in changed:
+            seq += 1
+            lines.append(b'{"seq": %d, "op": "upsert", "task": %s}\n' % (seq, self._serialized_cache[task_id][1]))
+        for task_id in removed:
+            seq += 1
+            lines.append(b'{"seq": %d, "op": "remove", "task_id": %s}\n' % (seq, self._dumps(task_id)))
+        
         try:
-            with open(self._config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            await asyncio.to_thread(self._write_oplog_bytes, b"".join(lines))
+        except Exception as e:
+            logger.error(f"追加调度器操作日志失败: {e}", exc_info=True)
+            # 丢弃变更任务的缓存、放回已删除任务的旧缓存，下一次刷新时会再次识别为变更/删除
+            for task_id in changed:
+                self._serialized_cache.pop(task_id, None)
+            for task_id in removed:
+                if task_id not in self.all_tasks and task_id in previous_cache:
+                    self._serialized_cache.setdefault(task_id, previous_cache[task_id])
+            self._dirty_event.set()
+            return
+        
+        self._oplog_seq = max(self._oplog_seq, seq)
+        self._oplog_lines += len(lines)
+    
+    def _write_oplog_bytes(self, data: bytes):
+        """追加写入操作日志（在工作线程中调用）"""
+        with open(self._oplog_file, 'ab') as f:
+            f.write(data)
+    
+    def _truncate_oplog(self, snapshot_oplog_seq: int):
+        """
+        快照写入成功后清空操作日志
+        
+        快照序列化之后若又追加了新记录，保留日志文件（回放时按序号跳过已包含在快照中的记录），
+        留待下一次压缩。
+        """
+        if self._oplog_seq != snapshot_oplog_seq:
+            return
+        try:
+            self._oplog_file.unlink(missing_ok=True)
+            self._oplog_lines = 0
+        except OSError as e:
+            logger.warning(f"清空调度器操作日志失败: {e}")
+    
+    async def _compact_state(self, fsync: bool = False):
+        """写入完整快照（文件写入在线程池中进行），成功后清空操作日志"""
+        oplog_seq = self._oplog_seq
+        snapshot = self._snapshot_state()
+        if snapshot is None:
+            return
+        await asyncio.to_thread(self._write_state_bytes, self._config_file, *snapshot, fsync)
+        if self._written_seq >= snapshot[0]:
+            self._truncate_oplog(oplog_seq)
+    
+    def _compact_state_sync(self, fsync: bool = False):
+        """同步写入完整快照，成功后清空操作日志"""
+        oplog_seq = self._oplog_seq
+        snapshot = self._snapshot_state()
+        if snapshot is None:
+            return
+        self._write_state_bytes(self._config_file, *snapshot, fsync)
+        if self._written_seq >= snapshot[0]:
+            self._truncate_oplog(oplog_seq)
+    
+    @staticmethod
+    def _dumps(obj: Any) -> bytes:
+        """使用 orjson 序列化为 UTF-8 JSON 字节，无法直接编码的对象交给 _json_default"""
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    @staticmethod
+    def _loads(data: bytes) -> Any:
+        """使用 orjson 解析 JSON 字节"""
+        return orjson.loads(data)
+    
+    def _replay_oplog(self, config_data: dict):
+        """
+        在快照数据上回放操作日志，并恢复操作日志序号
+        
+        序号不大于快照 oplog_seq 的记录已包含在快照中，直接跳过；
+        崩溃时可能留下写了一半的最后一行，解析失败的行记录警告后跳过。
+        """
+        snapshot_seq = config_data.get("oplog_seq", 0)
+        self._oplog_seq = snapshot_seq
+        if not self._oplog_file.exists():
+            return
+        
+        lines = self._oplog_file.read_bytes().splitlines()
+        self._oplog_lines = len(lines)
+        tasks_by_id = {task_data.get("task_id"): task_data for task_data in config_data.get("tasks", [])}
+        applied = 0
+        for line in lines:
+            try:
+                record = self._loads(line)
+            except ValueError:
+                logger.warning(f"跳过损坏的调度器操作日志记录: {line[:100]!r}")
+                continue
+            seq = record.get("seq", 0)
+            self._oplog_seq = max(self._oplog_seq, seq)
+            if seq <= snapshot_seq:
+                continue
+            if record.get("op") == "upsert":
+                task_data = record["task"]
+                tasks_by_id[task_data["task_id"]] = task_data
+            elif record.get("op") == "remove":
+                tasks_by_id.pop(record.get("task_id"), None)
+            applied += 1
+        
+        if applied:
+            # 账户任务映射由任务记录重新生成
+            config_data["tasks"] = list(tasks_by_id.values())
+            account_tasks = {}
+            for task_data in config_data["tasks"]:
+                account_tasks.setdefault(task_data.get("account_id"), []).append(task_data.get("task_id"))
+            config_data["account_tasks"] = account_tasks
+            logger.info(f"已回放 {applied} 条调度器操作日志")
+    
+    def _read_state_data(self) -> Optional[dict]:
+        """
+        读取快照并回放操作日志，两个文件都不存在时返回 None
+        """
+        if not self._config_file.exists() and not self._oplog_file.exists():
+            logger.info(f"调度器配置文件不存在，使用空状态: {self._config_file}")
+            return None
+        
+        # 一次读取整个文件并解析
+        config_data = self._loads(self._config_file.read_bytes()) if self._config_file.exists() else {}
+        self._replay_oplog(config_data)
+        return config_data
+    
+    def _restore_task(self, task_data: dict, now: dt) -> Optional[TaskInfo]:
+        """
+        根据一条任务记录重新创建 TaskManager 和 TaskInfo
+        
+        不修改调度器自身的状态，可在工作线程中调用；构造 TaskManager 会检查/启动 MCP 服务，
+        多个任务需逐个恢复，不能并行。
+        
+        Args:
+            task_data: 持久化的任务记录
+            now: 加载开始时间，用于判断 next_execution_time 是否已过期
+            
+        Returns:
+            恢复的 TaskInfo，记录无效或恢复失败时返回 None
+        """
+        try:
+            # 提取任务参数
+            # 检查必需字段是否存在
+            if "task_id" not in task_data:
+                logger.error(f"任务数据缺少 task_id 字段，跳过该任务。数据: {task_data}")
+                return None
             
-            # 恢复账户任务映射
-            self.account_tasks = config_data.get("account_tasks", {})
+            task_id = task_data["task_id"]
+            sys_type = task_data.get("sys_type", SYS_TYPE.MAC_INTEL.value)
+            kwargs = task_data.get("kwargs", {})
             
-            # 恢复任务信息
-            tasks_data = config_data.get("tasks", [])
-            loaded_count = 0
+            # 确保 task_id 在 kwargs 中（用于恢复 TaskManager）
+            kwargs['task_id'] = task_id
             
-            for task_data in tasks_data:
+            # 从配置文件恢复时，task_type 可能是字符串（值、名称或枚举的字符串表示）或 None，查表转换为枚举
+            task_type_str = kwargs.get('task_type', DEFAULT_TASK_TYPE.XHS_TYPE.value)
+            if task_type_str is None:
+                kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE
+            elif isinstance(task_type_str, str):
+                task_type = _TASK_TYPE_LOOKUP.get(task_type_str)
+                if task_type is None:
+                    logger.warning(f"恢复任务时遇到不支持的任务类型: {task_type_str}，使用默认值")
+                    task_type = DEFAULT_TASK_TYPE.XHS_TYPE
+                kwargs['task_type'] = task_type
+            else:
+                logger.warning(f"恢复任务时 task_type 类型不正确: {type(task_type_str)}，使用默认值")
+                kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE  # 默认值
+            
+            # 重新创建 TaskManager 实例（此时 task_type 已经是枚举类型）
+            task_manager = TaskManager(sys_type=sys_type, **kwargs)
+            
+            # 恢复 task_end_time，处理 None 值和字符串 "None"
+            task_end_time_value = task_data.get("task_end_time")
+            if task_end_time_value is None or task_end_time_value == "None":
+                # 如果为 None，使用默认值（30天后）
+                restored_task_end_time = date.today() + timedelta(days=30)
+                logger.warning(f"任务 {task_id} 的 task_end_time 为 None，使用默认值: {restored_task_end_time}")
+            elif isinstance(task_end_time_value, str):
                 try:
-                    # 提取任务参数
-                    # 检查必需字段是否存在
-                    if "task_id" not in task_data:
-                        logger.error(f"任务数据缺少 task_id 字段，跳过该任务。数据: {task_data}")
-                        continue
-                    
-                    task_id = task_data["task_id"]
-                    sys_type = task_data.get("sys_type", SYS_TYPE.MAC_INTEL.value)
-                    kwargs = task_data.get("kwargs", {})
-                    
-                    # 确保 task_id 在 kwargs 中（用于恢复 TaskManager）
-                    kwargs['task_id'] = task_id
-                    
-                    # 从配置文件恢复时，task_type 可能是字符串、枚举对象或 None，需要转换为枚举
-                    task_type_str = kwargs.get('task_type', 'xhs_type')
-                    if task_type_str is None:
-                        kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE
-                    elif isinstance(task_type_str, str):
-                        # 处理字符串值或枚举对象的字符串表示
-                        if task_type_str == 'xhs_type' or task_type_str == DEFAULT_TASK_TYPE.XHS_TYPE.value or 'XHS_TYPE' in str(task_type_str):
-                            kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE
-                        else:
-                            logger.warning(f"恢复任务时遇到不支持的任务类型: {task_type_str}，使用默认值")
-                            kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE
-                    # 如果已经是枚举类型，保持不变
-                    elif isinstance(task_type_str, DEFAULT_TASK_TYPE):
-                        kwargs['task_type'] = task_type_str
-                    else:
-                        logger.warning(f"恢复任务时 task_type 类型不正确: {type(task_type_str)}，使用默认值")
-                        kwargs['task_type'] = DEFAULT_TASK_TYPE.XHS_TYPE  # 默认值
-                    
-                    # 重新创建 TaskManager 实例（此时 task_type 已经是枚举类型）
-                    task_manager = TaskManager(sys_type=sys_type, **kwargs)
-                    
-                    # 恢复 task_end_time，处理 None 值和字符串 "None"
-                    task_end_time_value = task_data.get("task_end_time")
-                    if task_end_time_value is None or task_end_time_value == "None":
-                        # 如果为 None，使用默认值（30天后）
-                        restored_task_end_time = date.today() + timedelta(days=30)
-                        logger.warning(f"任务 {task_id} 的 task_end_time 为 None，使用默认值: {restored_task_end_time}")
-                    elif isinstance(task_end_time_value, str):
-                        try:
-                            restored_task_end_time = date.fromisoformat(task_end_time_value)
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"无法解析任务 {task_id} 的 task_end_time: {task_end_time_value}，使用默认值，错误: {e}")
-                            restored_task_end_time = date.today() + timedelta(days=30)
-                    elif isinstance(task_end_time_value, date):
-                        restored_task_end_time = task_end_time_value
-                    else:
-                        logger.warning(f"任务 {task_id} 的 task_end_time 类型不正确: {type(task_end_time_value)}，使用默认值")
-                        restored_task_end_time = date.today() + timedelta(days=30)
-                    
-                    # 恢复 TaskInfo
-                    # 从 context.meta 中恢复登录状态
-                    login_status = None
-                    login_status_checked_at = None
-                    if task_manager and hasattr(task_manager, 'context') and task_manager.context is not None:
-                        try:
-                            # context.meta 是字典，直接访问
-                            if hasattr(task_manager.context, 'meta'):
-                                meta = task_manager.context.meta
-                                if meta and isinstance(meta, dict):
-                                    login_status = meta.get('login_status')
-                                    if login_status is not None:
-                                        login_status = bool(login_status)
-                                    login_status_checked_at_str = meta.get('login_status_checked_at')
-                                    if login_status_checked_at_str:
-                                        try:
-                                            login_status_checked_at = dt.fromisoformat(login_status_checked_at_str)
-                                        except (ValueError, TypeError):
-                                            pass
-                        except Exception as e:
-                            logger.warning(f"恢复任务 {task_id} 的登录状态失败: {e}，使用默认值")
-                            # 继续执行，使用默认值 None
-                    
-                    # 恢复模式，如果不存在则使用默认值
-                    from app.data.constants import TaskMode
-                    mode_str = task_data.get("mode", TaskMode.STANDARD.value)
-                    try:
-                        restored_mode = TaskMode(mode_str) if isinstance(mode_str, str) else (mode_str if isinstance(mode_str, TaskMode) else TaskMode.STANDARD)
-                    except (ValueError, TypeError):
-                        logger.warning(f"任务 {task_id} 的模式值无效: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
-                        restored_mode = TaskMode.STANDARD
-                    
-                    # 恢复互动笔记数量，默认3，限制在1-5之间
-                    interaction_note_count = task_data.get("interaction_note_count", 3)
-                    interaction_note_count = max(1, min(5, int(interaction_note_count))) if interaction_note_count else 3
-                    
-                    task_info = TaskInfo(
-                        task_id=task_id,
-                        account_id=task_data["account_id"],
-                        account_name=task_data.get("account_name", ""),
-                        task_type=task_data["task_type"],
-                        task_manager=task_manager,
-                        interval=task_data["interval"],
-                        valid_time_range=task_data["valid_time_range"],
-                        task_end_time=restored_task_end_time,
-                        mode=restored_mode,
-                        interaction_note_count=interaction_note_count,
-                        kwargs=kwargs,
-                        login_status=login_status,
-                        login_status_checked_at=login_status_checked_at
-                    )
-                    
-                    # 恢复状态和时间信息
-                    restored_status = TaskStatus(task_data["status"])
-                    
-                    # 重要：如果任务状态是 RUNNING，说明服务重启前任务正在执行
-                    # 但服务重启后，之前的执行进程已不存在，应该重置为 PENDING 状态
-                    if restored_status == TaskStatus.RUNNING:
-                        logger.warning(f"任务 {task_id} 恢复时状态为 RUNNING（可能是服务重启），重置为 PENDING")
-                        task_info.status = TaskStatus.PENDING
-                    else:
-                        task_info.status = restored_status
-                    
-                    if task_data.get("last_execution_time"):
-                        task_info.last_execution_time = dt.fromisoformat(task_data["last_execution_time"])
-                    if task_data.get("next_execution_time"):
-                        task_info.next_execution_time = dt.fromisoformat(task_data["next_execution_time"])
-                    if task_data.get("created_at"):
-                        task_info.created_at = dt.fromisoformat(task_data["created_at"])
-                    if task_data.get("updated_at"):
-                        task_info.updated_at = dt.fromisoformat(task_data["updated_at"])
-                    
-                    # 恢复 round_num（任务执行轮次）
-                    if task_data.get("round_num") is not None:
-                        task_manager.round_num = task_data["round_num"]
-                    
-                    # 如果 next_execution_time 是过去的时间且任务状态是 PENDING，重新计算下次执行时间
-                    if task_info.status == TaskStatus.PENDING:
-                        if task_info.next_execution_time is None:
-                            # 如果没有下次执行时间，计算一个
-                            next_time = self._calculate_next_execution_time(task_info)
-                            if next_time:
-                                task_info.update_next_execution_time(next_time)
-                                logger.info(f"任务 {task_id} 恢复时没有下次执行时间，已计算: {next_time}")
-                        elif task_info.next_execution_time < dt.now():
-                            # 如果下次执行时间是过去的时间，重新计算
-                            logger.info(f"任务 {task_id} 恢复时 next_execution_time ({task_info.next_execution_time}) 是过去的时间，重新计算")
-                            next_time = self._calculate_next_execution_time(task_info)
-                            if next_time:
-                                task_info.update_next_execution_time(next_time)
-                                logger.info(f"任务 {task_id} 下次执行时间已更新为: {next_time}")
-                    
-                    # 添加到任务注册表
-                    self.all_tasks[task_id] = task_info
-                    loaded_count += 1
-                    
-                    logger.info(f"任务恢复成功: task_id={task_id}, status={task_info.status.value}, next_execution_time={task_info.next_execution_time}")
-                
-                except KeyError as e:
-                    # 处理缺少必需字段的情况
-                    missing_key = str(e).strip("'\"")
-                    logger.error(f"恢复任务失败: 缺少必需字段 '{missing_key}'，任务数据: {task_data}", exc_info=True)
-                    continue
+                    restored_task_end_time = date.fromisoformat(task_end_time_value)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"无法解析任务 {task_id} 的 task_end_time: {task_end_time_value}，使用默认值，错误: {e}")
+                    restored_task_end_time = date.today() + timedelta(days=30)
+            elif isinstance(task_end_time_value, date):
+                restored_task_end_time = task_end_time_value
+            else:
+                logger.warning(f"任务 {task_id} 的 task_end_time 类型不正确: {type(task_end_time_value)}，使用默认值")
+                restored_task_end_time = date.today() + timedelta(days=30)
+            
+            # 恢复 TaskInfo
+            # 从 context.meta 中恢复登录状态
+            login_status = None
+            login_status_checked_at = None
+            if task_manager and hasattr(task_manager, 'context') and task_manager.context is not None:
+                try:
+                    # context.meta 是字典，直接访问
+                    if hasattr(task_manager.context, 'meta'):
+                        meta = task_manager.context.meta
+                        if meta and isinstance(meta, dict):
+                            login_status = meta.get('login_status')
+                            if login_status is not None:
+                                login_status = bool(login_status)
+                            login_status_checked_at_str = meta.get('login_status_checked_at')
+                            if login_status_checked_at_str:
+                                try:
+                                    login_status_checked_at = dt.fromisoformat(login_status_checked_at_str)
+                                except (ValueError, TypeError):
+                                    pass
                 except Exception as e:
-                    task_id = task_data.get('task_id', 'unknown')
-                    logger.error(f"恢复任务失败: task_id={task_id}, error={e}", exc_info=True)
-                    continue
+                    logger.warning(f"恢复任务 {task_id} 的登录状态失败: {e}，使用默认值")
+                    # 继续执行，使用默认值 None
+            
+            # 恢复模式，如果不存在则使用默认值
+            mode_str = task_data.get("mode", TaskMode.STANDARD.value)
+            restored_mode = _TASK_MODE_BY_VALUE.get(mode_str) if isinstance(mode_str, str) else None
+            if restored_mode is None:
+                logger.warning(f"任务 {task_id} 的模式值无效: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
+                restored_mode = TaskMode.STANDARD
+            
+            # 恢复互动笔记数量，默认3，限制在1-5之间
+            interaction_note_count = task_data.get("interaction_note_count", 3)
+            interaction_note_count = max(1, min(5, int(interaction_note_count))) if interaction_note_count else 3
+            
+            # 校验有效时间范围（历史数据格式错误时使用默认值）
+            try:
+                valid_time_range = _validate_valid_time_range(task_data["valid_time_range"])
+            except ValueError as e:
+                logger.warning(f"任务 {task_id} 的 valid_time_range 无效: {e}，使用默认值 [8, 22]")
+                valid_time_range = [8, 22]
+            
+            task_info = TaskInfo(
+                task_id=task_id,
+                account_id=task_data["account_id"],
+                account_name=task_data.get("account_name", ""),
+                task_type=task_data["task_type"],
+                task_manager=task_manager,
+                interval=task_data["interval"],
+                valid_time_range=valid_time_range,
+                task_end_time=restored_task_end_time,
+                mode=restored_mode,
+                interaction_note_count=interaction_note_count,
+                kwargs=kwargs,
+                login_status=login_status,
+                login_status_checked_at=login_status_checked_at
+            )
+            
+            # 恢复状态和时间信息
+            restored_status = _TASK_STATUS_BY_VALUE.get(task_data["status"])
+            if restored_status is None:
+                raise ValueError(f"无效的任务状态: {task_data['status']}")
+            
+            # 重要：如果任务状态是 RUNNING，说明服务重启前任务正在执行
+            # 但服务重启后，之前的执行进程已不存在，应该重置为 PENDING 状态
+            if restored_status is _RUNNING:
+                logger.warning(f"任务 {task_id} 恢复时状态为 RUNNING（可能是服务重启），重置为 PENDING")
+                task_info.status = TaskStatus.PENDING
+            else:
+                task_info.status = restored_status
+            
+            if task_data.get("last_execution_time"):
+                task_info.last_execution_time = dt.fromisoformat(task_data["last_execution_time"])
+            if task_data.get("next_execution_time"):
+                task_info.next_execution_time = dt.fromisoformat(task_data["next_execution_time"])
+            if task_data.get("created_at"):
+                task_info.created_at = dt.fromisoformat(task_data["created_at"])
+            if task_data.get("updated_at"):
+                task_info.updated_at = dt.fromisoformat(task_data["updated_at"])
+            
+            # 恢复 round_num（任务执行轮次）
+            if task_data.get("round_num") is not None:
+                task_manager.round_num = task_data["round_num"]
+            
+            # 如果 next_execution_time 是过去的时间且任务状态是 PENDING，重新计算下次执行时间
+            if task_info.status is _PENDING:
+                if task_info.next_execution_time is None:
+                    # 如果没有下次执行时间，计算一个
+                    next_time = self._calculate_next_execution_time(task_info)
+                    if next_time:
+                        task_info.update_next_execution_time(next_time)
+                        logger.info(f"任务 {task_id} 恢复时没有下次执行时间，已计算: {next_time}")
+                elif task_info.next_execution_time < now:
+                    # 如果下次执行时间是过去的时间，重新计算
+                    logger.info(f"任务 {task_id} 恢复时 next_execution_time ({task_info.next_execution_time}) 是过去的时间，重新计算")
+                    next_time = self._calculate_next_execution_time(task_info)
+                    if next_time:
+                        task_info.update_next_execution_time(next_time)
+                        logger.info(f"任务 {task_id} 下次执行时间已更新为: {next_time}")
             
-            logger.info(f"调度器状态加载完成: 共恢复 {loaded_count}/{len(tasks_data)} 个任务")
+            logger.info(f"任务恢复成功: task_id={task_id}, status={task_info.status.value}, next_execution_time={task_info.next_execution_time}")
+            return task_info
+        
+        except KeyError as e:
+            # 处理缺少必需字段的情况
+            missing_key = str(e).strip("'\"")
+            logger.error(f"恢复任务失败: 缺少必需字段 '{missing_key}'，任务数据: {task_data}", exc_info=True)
+            return None
+        except Exception as e:
+            task_id = task_data.get('task_id', 'unknown')
+            logger.error(f"恢复任务失败: task_id={task_id}, error={e}", exc_info=True)
+            return None
+    
+    def _register_restored_tasks(self, config_data: dict, task_infos: List[Optional[TaskInfo]]):
+        """将恢复的任务写入注册表和账户映射，并一次性重建时间轮"""
+        # 恢复账户任务映射
+        self.account_tasks = {aid: set(tids) for aid, tids in config_data.get("account_tasks", {}).items()}
+        
+        loaded_count = 0
+        for task_info in task_infos:
+            if task_info is None:
+                continue
+            # 添加到任务注册表
+            self.all_tasks[task_info.task_id] = task_info
+            self._tasks_by_status[task_info.status][task_info.task_id] = task_info
+            self._account_index.setdefault((task_info.task_type, task_info.account_id), task_info.task_id)
+            loaded_count += 1
+        
+        # 全部任务恢复后一次性建堆
+        self._rebuild_schedule()
+        
+        logger.info(f"调度器状态加载完成: 共恢复 {loaded_count}/{len(task_infos)} 个任务")
+    
+    def _load_state(self):
+        """
+        从本地文件加载调度器状态（同步版本）
+        
+        先读取快照，再回放操作日志，然后恢复所有任务信息并重新创建 TaskManager 实例
+        """
+        try:
+            config_data = self._read_state_data()
+            if config_data is None:
+                return
+            now = dt.now()
+            task_infos = [self._restore_task(task_data, now) for task_data in config_data.get("tasks", [])]
+            self._register_restored_tasks(config_data, task_infos)
+        
+        except Exception as e:
+            logger.error(f"加载调度器状态失败: {e}", exc_info=True)
+    
+    async def load_state_async(self):
+        """
+        从本地文件加载调度器状态（异步版本，用于应用启动）
+        
+        快照读取和操作日志回放在线程池中进行；各任务的 TaskManager 也逐个放到线程池中构建
+        （构造时会检查并按需启动 MCP 服务、初始化智能体，阻塞且不能并发执行，因此一次只恢复一个），
+        最后回到事件循环线程统一注册。
+        """
+        try:
+            config_data = await asyncio.to_thread(self._read_state_data)
+            if config_data is None:
+                return
+            now = dt.now()
+            task_infos = []
+            for task_data in config_data.get("tasks", []):
+                task_infos.append(await asyncio.to_thread(self._restore_task, task_data, now))
+            self._register_restored_tasks(config_data, task_infos)
         
         except Exception as e:
             logger.error(f"加载调度器状态失败: {e}", exc_info=True)
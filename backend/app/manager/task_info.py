@@ -4,15 +4,17 @@
 定义任务调度器中使用的任务信息数据结构
 """
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import Enum
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Optional, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.manager.task_manager import TaskManager
 
-from app.data.constants import TaskMode
+from app.core.logger import logger
+from app.data.constants import LogBindType, TaskMode
 
 
 class TaskStatus(Enum):
@@ -24,7 +26,7 @@ class TaskStatus(Enum):
     ERROR = "error"           # 执行错误
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskInfo:
     """任务信息数据结构"""
     task_id: str
@@ -47,6 +49,48 @@ class TaskInfo:
     kwargs: dict = field(default_factory=dict)  # 任务创建参数
     login_status: Optional[bool] = None  # 登录状态：True=已登录，False=未登录，None=未知
     login_status_checked_at: Optional[datetime] = None  # 登录状态检查时间
+    _task_logger: Any = field(default=None, init=False, repr=False, compare=False)  # 缓存的任务日志记录器
+    _persist_scratch: dict = field(default_factory=dict, init=False, repr=False, compare=False)  # 持久化时复用的序列化字典
+    _task_end_epoch: Any = field(default=None, init=False, repr=False, compare=False)  # (task_end_time, 当天零点时间戳) 缓存
+    _created_epoch: Any = field(default=None, init=False, repr=False, compare=False)  # (created_at, 时间戳) 缓存
+    _kwargs_version: int = field(default=0, init=False, repr=False, compare=False)  # kwargs 原地修改的版本号
+    _kwargs_serialized: Any = field(default=None, init=False, repr=False, compare=False)  # (kwargs, 版本号, 序列化结果) 缓存
+    
+    @property
+    def task_logger(self):
+        """绑定了 task_id 的任务日志记录器（首次访问时创建并缓存）"""
+        if self._task_logger is None:
+            self._task_logger = logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG)
+        return self._task_logger
+    
+    @property
+    def task_end_epoch(self) -> Optional[float]:
+        """task_end_time 当天零点（本地时间）的时间戳；task_end_time 变更后重新计算"""
+        end_time = self.task_end_time
+        if end_time is None:
+            return None
+        cached = self._task_end_epoch
+        if cached is None or cached[0] is not end_time:
+            cached = self._task_end_epoch = (end_time, time.mktime(end_time.timetuple()))
+        return cached[1]
+    
+    def is_active_at(self, ts: float) -> bool:
+        """时间戳 ts 是否早于 task_end_time 当天零点（即任务尚未到期）；task_end_time 为 None 表示不限期"""
+        end_epoch = self.task_end_epoch
+        return end_epoch is None or ts < end_epoch
+    
+    @property
+    def created_epoch(self) -> float:
+        """created_at 的时间戳，作为调度排序的次要键；created_at 变更后重新计算"""
+        created_at = self.created_at
+        cached = self._created_epoch
+        if cached is None or cached[0] is not created_at:
+            cached = self._created_epoch = (created_at, created_at.timestamp())
+        return cached[1]
+    
+    def mark_kwargs_changed(self):
+        """标记 kwargs 已被原地修改，使其序列化缓存失效"""
+        self._kwargs_version += 1
     
     def update_status(self, new_status: TaskStatus):
         """更新任务状态"""
@@ -3,18 +3,57 @@ import time
 import uuid
 import shutil
 import os
+import stat
+import threading
 from pathlib import Path
 from datetime import date
-from diskcache import Cache
-from app.data.constants import SYS_TYPE, DEFAULT_TASK_TYPE, COOKIE_TARGET_PATH, DEFAULT_KNOWLEDGE_PATH, TASK_INTERVAL_TIME
+from app.data.constants import (
+    SYS_TYPE, DEFAULT_TASK_TYPE, COOKIE_SOURCE_PATH, COOKIE_TARGET_PATH, DEFAULT_KNOWLEDGE_PATH,
+    TASK_INTERVAL_TIME, TaskMode, LogBindType
+)
 from app.agents.xiaohongshu.agent import XiaohongshuAgent
-from app.core.llm import LLMService
+from app.core.llm import get_llm_service
 from app.core.context import Context
 from app.core.logger import logger
 from app.utils.path_utils import *
 from app.manager.task_context import Task_Manager_Context
-from typing import List
-from app.core.config import APP_DATA_DIR
+from app.utils.mcp_service_manager import MCPServiceManager
+from typing import Any, Dict, List, Optional
+
+# MCP 服务实际使用的 cookies 路径（xhs_mcp/cookies.json）
+_MCP_COOKIES_FILE = os.path.join(COOKIE_SOURCE_PATH, "cookies.json")
+
+# 恢复任务时从 context meta 中读取的小红书相关参数
+_RESTORED_XHS_PARAMS = (
+    'xhs_account_id', 'xhs_account_name', 'user_query', 'user_topic', 'user_style', 'user_target_audience'
+)
+
+# MCP 服务健康检查的有效期（秒）：有效期内已确认运行则跳过重复检查
+_MCP_CHECK_TTL_SEC = 30.0
+
+# 模式值 -> TaskMode；TaskMode 是 StrEnum，枚举成员与其值哈希相同，也能直接命中
+_MODE_LOOKUP: Dict[str, TaskMode] = {m.value: m for m in TaskMode}
+# 任务类型值 -> DEFAULT_TASK_TYPE（同上，枚举成员也能直接命中）
+_TASK_TYPE_LOOKUP: Dict[str, DEFAULT_TASK_TYPE] = {t.value: t for t in DEFAULT_TASK_TYPE}
+
+
+def _lookup_mode(value: Any) -> Optional[TaskMode]:
+    """将模式值（字符串或 TaskMode）转换为 TaskMode，无法识别时返回 None"""
+    return _MODE_LOOKUP.get(value) if isinstance(value, str) else None
+
+
+def _clamp_interaction_note_count(value: Any) -> int:
+    """互动笔记数量限制在 1-5 之间，空值使用默认值 3"""
+    return max(1, min(5, int(value))) if value else 3
+
+
+def _stat_or_none(path) -> Optional[os.stat_result]:
+    """一次 stat 取得文件信息，路径不存在（或无法访问）时返回 None"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
 
 """
 初始化任务管理器的入参
@@ -32,6 +71,11 @@ TaskManager(
 """
 
 class TaskManager:
+    # 暂停开关：task_id -> 'PAUSE' / 'RUNNING'。开关只在当前进程内有效（构造时总会重置为 RUNNING），
+    # 所有任务共用一个内存字典，无需为每个任务单独打开磁盘缓存
+    _switch_registry: Dict[str, str] = {}
+    _switch_lock = threading.Lock()
+
     def __init__(self, sys_type, **kwargs):
         """
         如果穿task_id, 则会在context缓存文件中寻找历史任务；否则，创建全新任务
@@ -71,21 +115,15 @@ class TaskManager:
             self.interval = kwargs.get('interval', TASK_INTERVAL_TIME)
             self.valid_time_range = kwargs.get('valid_time_range', [8, 22])  # 修复拼写错误：valid_time_rage -> valid_time_range
             # 获取模式，如果没有则使用默认值
-            from app.data.constants import TaskMode
             mode_str = kwargs.get('mode', TaskMode.STANDARD.value)
-            if isinstance(mode_str, TaskMode):
-                self.mode = mode_str
-            elif isinstance(mode_str, str):
-                try:
-                    self.mode = TaskMode(mode_str)
-                except ValueError:
+            self.mode = _lookup_mode(mode_str)
+            if self.mode is None:
+                if isinstance(mode_str, str):
                     logger.warning(f"无效的模式值: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
-                    self.mode = TaskMode.STANDARD
-            else:
                 self.mode = TaskMode.STANDARD
+            self._last_mode_raw = mode_str
             # 获取互动笔记数量，默认3，限制在1-5之间
-            self.interaction_note_count = kwargs.get('interaction_note_count', 3)
-            self.interaction_note_count = max(1, min(5, int(self.interaction_note_count))) if self.interaction_note_count else 3
+            self.interaction_note_count = _clamp_interaction_note_count(kwargs.get('interaction_note_count', 3))
             self.round_num = 0
             # 初始化context
             self.context = Task_Manager_Context(self.task_id)
@@ -107,24 +145,18 @@ class TaskManager:
                 logger.warning(f"任务 {self.task_id} 的 task_type 为 None，使用默认值")
                 self.task_type = DEFAULT_TASK_TYPE.XHS_TYPE
             elif isinstance(task_type_value, str):
-                if task_type_value == 'xhs_type' or task_type_value == DEFAULT_TASK_TYPE.XHS_TYPE.value:
-                    self.task_type = DEFAULT_TASK_TYPE.XHS_TYPE
-                else:
+                self.task_type = _TASK_TYPE_LOOKUP.get(task_type_value)
+                if self.task_type is None:
                     logger.warning(f"任务 {self.task_id} 的 task_type 值不正确: {task_type_value}，使用默认值")
                     self.task_type = DEFAULT_TASK_TYPE.XHS_TYPE
-            elif isinstance(task_type_value, DEFAULT_TASK_TYPE):
-                self.task_type = task_type_value
             else:
                 logger.warning(f"任务 {self.task_id} 的 task_type 类型不正确: {type(task_type_value)}，使用默认值")
                 self.task_type = DEFAULT_TASK_TYPE.XHS_TYPE
             
-            # 从 context 的 meta 中恢复小红书相关参数
-            self.xhs_account_id = self.context.get('xhs_account_id') or kwargs.get('xhs_account_id')
-            self.xhs_account_name = self.context.get('xhs_account_name') or kwargs.get('xhs_account_name')
-            self.user_query = self.context.get('user_query') or kwargs.get('user_query')
-            self.user_topic = self.context.get('user_topic') or kwargs.get('user_topic')
-            self.user_style = self.context.get('user_style') or kwargs.get('user_style')
-            self.user_target_audience = self.context.get('user_target_audience') or kwargs.get('user_target_audience')
+            # 从 context 的 meta 中恢复小红书相关参数（一次取出），meta 中没有的字段使用传入参数
+            xhs_params = self.context.get_many(_RESTORED_XHS_PARAMS)
+            for key, value in xhs_params.items():
+                setattr(self, key, value if value is not None else kwargs.get(key))
             # task_end_time 从 context 获取，如果是 None 或字符串 "None"，则使用默认值（30天后）
             task_end_time_value = self.context.get('task_end_time')
             if task_end_time_value is None or task_end_time_value == "None":
@@ -161,26 +193,37 @@ class TaskManager:
             self.round_num = self.context.get('round_num') or 0
             
             # mode 从 context 获取，如果为 None 则使用默认值
-            from app.data.constants import TaskMode
             mode_str = self.context.get('mode', TaskMode.STANDARD.value)
-            try:
-                self.mode = TaskMode(mode_str) if isinstance(mode_str, str) else (mode_str if isinstance(mode_str, TaskMode) else TaskMode.STANDARD)
-            except (ValueError, TypeError):
-                logger.warning(f"任务 {self.task_id} 的模式值无效: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
+            self.mode = _lookup_mode(mode_str)
+            if self.mode is None:
+                if isinstance(mode_str, str):
+                    logger.warning(f"任务 {self.task_id} 的模式值无效: {mode_str}，使用默认值 {TaskMode.STANDARD.value}")
                 self.mode = TaskMode.STANDARD
+            self._last_mode_raw = mode_str
             
             # interaction_note_count 从 context 获取，默认3，限制在1-5之间
-            self.interaction_note_count = self.context.get('interaction_note_count', 3)
-            self.interaction_note_count = max(1, min(5, int(self.interaction_note_count))) if self.interaction_note_count else 3
-        # 初始化暂停开关变量
-        tasks_dir = APP_DATA_DIR / "tasks"
-        tasks_dir.mkdir(parents=True, exist_ok=True)
-        switch_path = tasks_dir / f"{self.task_id}_task_switch"
+            self.interaction_note_count = _clamp_interaction_note_count(self.context.get('interaction_note_count', 3))
+        # MCP 服务使用的系统类型字符串（sys_type 创建后不再变化）
+        self.sys_type_str = self.sys_type.value if isinstance(self.sys_type, SYS_TYPE) else str(self.sys_type)
         
-        self.task_switch = Cache(str(switch_path))
+        # 用户专属 cookies 路径只依赖账户 ID，创建时计算一次
+        self._user_cookies_dir = get_user_cookies_path(self.xhs_account_id) if self.xhs_account_id else None
+        self._user_cookies_file = (
+            os.path.join(self._user_cookies_dir, "cookies.json") if self._user_cookies_dir else None
+        )
+        
+        # 绑定了 task_id 和 bindtype 的任务日志记录器，创建一次后复用
+        self.task_logger = logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG)
+        
+        # 本轮 run_once 中待写入 context 的步骤数据与 meta 字段
+        self._pending_step: Dict[str, Any] = {}
+        self._pending_meta: Dict[str, Any] = {}
+        
+        # 初始化暂停开关
         self.task_resume()
         
         # 检查并确保 MCP 服务正在运行（在初始化 agent 之前）
+        self._mcp_last_check: Optional[float] = None  # 上次确认 MCP 服务运行的时间（time.monotonic），None 表示需要重新检查
         self._mcp_service_check()
         
         # 初始化小红书 agent
@@ -195,7 +238,7 @@ class TaskManager:
             if not self.xhs_account_name:
                 raise ValueError("小红书任务必须提供xhs_account_name参数")
 
-            llm = LLMService()
+            llm = get_llm_service()
             context = Context.create_new(goal="智能化小红书运营智能体")
 
             # 初始化XiaohongshuAgent
@@ -209,38 +252,43 @@ class TaskManager:
                 user_topic=self.user_topic,
                 user_style=self.user_style,
                 user_target_audience=self.user_target_audience,
-                knowledge_base_path=DEFAULT_KNOWLEDGE_PATH,
+                knowledge_base_path=str(DEFAULT_KNOWLEDGE_PATH),
                 mcp_server_url="http://localhost:18060/mcp",  # 默认值
                 mode=self.mode.value if hasattr(self.mode, 'value') else str(self.mode),  # 传递模式
                 interaction_note_count=self.interaction_note_count  # 传递互动笔记数量
             )
 
             # 使用绑定了 task_id 和 bindtype 的 logger 记录日志
-            from app.data.constants import LogBindType
-            task_logger = logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG)
-            task_logger.info(f"小红书智能体初始化成功: user_id={self.xhs_account_id}, task_id={self.task_id}")
+            self.task_logger.info(f"小红书智能体初始化成功: user_id={self.xhs_account_id}, task_id={self.task_id}")
             return agent
         else:
             logger.warning(f"未知的任务类型: {self.task_type}")
             return None
     def task_pause(self):
-        self.task_switch.set('state', 'PAUSE')
+        with TaskManager._switch_lock:
+            TaskManager._switch_registry[self.task_id] = 'PAUSE'
     def task_resume(self):
-        self.task_switch.set('state', 'RUNNING')
+        with TaskManager._switch_lock:
+            TaskManager._switch_registry[self.task_id] = 'RUNNING'
+    def task_remove(self):
+        """任务被删除时释放暂停开关；之后该实例视为暂停，不再执行"""
+        with TaskManager._switch_lock:
+            TaskManager._switch_registry.pop(self.task_id, None)
     def _mcp_service_check(self):
         """
         检查并确保 MCP 服务正在运行
         
-        如果服务未运行，会自动启动服务
+        如果服务未运行，会自动启动服务。最近 _MCP_CHECK_TTL_SEC 秒内已确认运行时直接跳过。
         """
-        from app.utils.mcp_service_manager import MCPServiceManager
+        last_check = self._mcp_last_check
+        if last_check is not None and time.monotonic() - last_check < _MCP_CHECK_TTL_SEC:
+            return
         
         try:
             mcp_manager = MCPServiceManager()
-            sys_type_str = self.sys_type.value if isinstance(self.sys_type, SYS_TYPE) else str(self.sys_type)
-            
-            if mcp_manager.ensure_service_running(sys_type=sys_type_str, headless=True):
+            if mcp_manager.ensure_service_running(sys_type=self.sys_type_str, headless=True):
                 logger.info("MCP 服务检查通过，服务正在运行")
+                self._mcp_last_check = time.monotonic()
             else:
                 logger.warning("MCP 服务启动失败，任务可能无法正常执行")
                 raise RuntimeError("MCP 服务未运行且启动失败，无法继续执行任务")
@@ -262,15 +310,17 @@ class TaskManager:
             RuntimeError: 文件检查或复制失败时抛出
         """
         # 1. 验证源文件
-        if not os.path.exists(source_path):
+        source_st = _stat_or_none(source_path)
+        if source_st is None:
             raise RuntimeError(f"源cookies文件不存在: {source_path}")
-        if not os.path.isfile(source_path):
+        if not stat.S_ISREG(source_st.st_mode):
             raise RuntimeError(f"源路径不是文件: {source_path}")
 
         # 2. 验证目标目录
-        if not os.path.exists(destination_path):
+        destination_st = _stat_or_none(destination_path)
+        if destination_st is None:
             raise RuntimeError(f"目标目录不存在: {destination_path}")
-        if not os.path.isdir(destination_path):
+        if not stat.S_ISDIR(destination_st.st_mode):
             raise RuntimeError(f"目标路径不是目录: {destination_path}")
 
         # 3. 构建目标文件路径
@@ -283,10 +333,11 @@ class TaskManager:
             raise RuntimeError(f"复制cookies文件失败: {e}")
 
         # 5. 验证复制结果
-        if not os.path.exists(target_file):
+        target_st = _stat_or_none(target_file)
+        if target_st is None:
             raise RuntimeError(f"复制后目标文件不存在: {target_file}")
 
-        file_size = os.path.getsize(target_file)
+        file_size = target_st.st_size
         if file_size <= 0:
             raise RuntimeError(f"目标文件大小为0: {target_file}")
 
@@ -305,11 +356,12 @@ class TaskManager:
         source_file = os.path.join(cookie_path, "cookies.json")
 
         # 检查文件是否存在
-        if not os.path.exists(source_file):
+        source_st = _stat_or_none(source_file)
+        if source_st is None:
             logger.warning(f"cookie文件不存在: {source_file}，跳过删除")
             return False
 
-        if not os.path.isfile(source_file):
+        if not stat.S_ISREG(source_st.st_mode):
             logger.warning(f"cookie路径不是文件: {source_file}，跳过删除")
             return False
 
@@ -326,53 +378,62 @@ class TaskManager:
         任务执行完成后的收尾工作
 
         主要功能：
-        1. 将MCP服务目录中的cookies.json复制回用户专属目录
+        1. 将MCP服务目录中的cookies.json移回（跨文件系统时复制回）用户专属目录
         2. 确保用户的cookies文件被更新（如果MCP服务更新了cookies）
         3. 删除xhs_mcp/cookies.json，确保下次执行时需要重新登录
         """
-        from app.data.constants import COOKIE_SOURCE_PATH
-        
-        # 1. 构建路径
-        # MCP 服务实际使用的 cookies 路径（xhs_mcp/cookies.json）
-        mcp_cookies_file = os.path.join(COOKIE_SOURCE_PATH, "cookies.json")
-        user_cookies_dir = get_user_cookies_path(self.xhs_account_id)
-        user_cookies_file = os.path.join(user_cookies_dir, "cookies.json")
+        # 1. 路径（创建 TaskManager 时已计算好）
+        mcp_cookies_file = _MCP_COOKIES_FILE
+        user_cookies_dir = self._user_cookies_dir
+        user_cookies_file = self._user_cookies_file
 
-        # 2. 将 MCP 服务目录中的 cookies 复制回用户专属目录（如果存在）
+        # MCP cookies 文件只 stat 一次，复制回写与删除两步共用结果
+        mcp_cookies_st = _stat_or_none(mcp_cookies_file)
+        mcp_cookies_exists = mcp_cookies_st is not None and stat.S_ISREG(mcp_cookies_st.st_mode)
+
+        if not mcp_cookies_exists:
+            return
+
+        # 2. 将 MCP 服务目录中的 cookies 移回用户专属目录
         # 这样如果 MCP 服务在执行过程中更新了 cookies（如刷新了 token），
-        # 更新的 cookies 会被保存到用户专属目录
-        if os.path.exists(mcp_cookies_file) and os.path.isfile(mcp_cookies_file):
-            try:
-                # 确保目标目录存在
-                os.makedirs(user_cookies_dir, exist_ok=True)
-                # 复制文件
-                shutil.copy2(mcp_cookies_file, user_cookies_file)
-                logger.info(f"cookies反向复制完成: {mcp_cookies_file} -> {user_cookies_file}")
-            except Exception as e:
-                logger.error(f"cookies反向复制失败: {e}")
-                # 因为是收尾工作，只记录错误不抛出异常
+        # 更新的 cookies 会被保存到用户专属目录。
+        # 复制回写后 MCP 目录的文件本来就要删除，同一文件系统上直接 os.replace（一次 rename，
+        # 同时完成回写与删除）；跨文件系统或 rename 失败时退回复制 + 删除。
+        try:
+            # 确保目标目录存在
+            os.makedirs(user_cookies_dir, exist_ok=True)
+            os.replace(mcp_cookies_file, user_cookies_file)
+            logger.info(f"cookies已移回用户目录: {mcp_cookies_file} -> {user_cookies_file}")
+            return
+        except OSError as e:
+            logger.debug("cookies 无法直接移动（{}），改为复制后删除", e)
+
+        try:
+            shutil.copy2(mcp_cookies_file, user_cookies_file)
+            logger.info(f"cookies反向复制完成: {mcp_cookies_file} -> {user_cookies_file}")
+        except Exception as e:
+            logger.error(f"cookies反向复制失败: {e}")
+            # 因为是收尾工作，只记录错误不抛出异常
         
         # 3. 删除 xhs_mcp/cookies.json，确保下次执行时需要重新登录
         # 注意：虽然删除了 MCP 目录的 cookies，但用户专属目录的 cookies 已保存
         # 下次执行时，会再次将用户专属目录的 cookies 复制到 MCP 目录
         # 如果用户专属目录的 cookies 仍然有效，则不需要重新登录
-        if os.path.exists(mcp_cookies_file) and os.path.isfile(mcp_cookies_file):
-            try:
-                os.remove(mcp_cookies_file)
-                logger.info(f"已删除 MCP cookies: {mcp_cookies_file}")
-            except Exception as e:
-                logger.warning(f"删除 MCP cookies 失败: {e}")
-                # 因为是收尾工作，只记录警告不抛出异常
+        try:
+            os.remove(mcp_cookies_file)
+            logger.info(f"已删除 MCP cookies: {mcp_cookies_file}")
+        except Exception as e:
+            logger.warning(f"删除 MCP cookies 失败: {e}")
+            # 因为是收尾工作，只记录警告不抛出异常
 
-    def _check_time_valid(self):
+    def _check_time_valid(self, now: Optional[datetime.datetime] = None):
         """
         判断小时数是否在范围内（仅限同日，不处理跨夜）。
         
         如果 valid_time_range 为 None，表示无限制，返回 True。
 
         Args:
-            time_range: [开始小时, 结束小时], e.g., [9, 18]，或 None 表示无限制
-            target_hour: 待判断的小时数，默认当前时间
+            now: 用于判断的当前时间，默认读取系统时间（run_once 传入本轮开始时读取的时间）
         """
         # None 表示无限制，直接返回 True
         if self.valid_time_range is None:
@@ -382,19 +443,31 @@ class TaskManager:
         if not isinstance(self.valid_time_range, list) or len(self.valid_time_range) < 2:
             logger.warning(f"任务 {self.task_id} 的 valid_time_range 无效，默认返回 True（允许执行）")
             self.valid_time_range = [8, 22]  # 设置默认值
-            self.context.save({"valid_time_range": self.valid_time_range})
+            self._pending_step["valid_time_range"] = self.valid_time_range
         
-        target_hour = datetime.datetime.now().hour
+        target_hour = (now or datetime.datetime.now()).hour
         start, end = self.valid_time_range[0], self.valid_time_range[1]
 
         # Python 特有的链式比较，等同于 start <= target_hour and target_hour <= end
         return start <= target_hour <= end
+    def _flush_context(self):
+        """将本轮累积的 context 变更一次性写入本地文件"""
+        pending_step, pending_meta = self._pending_step, self._pending_meta
+        if not pending_step and not pending_meta:
+            return
+        self._pending_step, self._pending_meta = {}, {}
+        if pending_step:
+            # 有 meta 更新时由 update_meta 统一落盘，避免写两次文件
+            self.context.save(pending_step, persist=not pending_meta)
+        if pending_meta:
+            self.context.update_meta(**pending_meta)
+
     async def run_once(self, skip_time_check: bool = False) -> bool:
         """
         执行一次任务（单次执行，不包含循环）
         
         每次调用只执行一次任务，然后返回。调度器负责管理任务的生命周期
-        和下次执行时间的计算。
+        和下次执行时间的计算。本轮对 context 的修改先累积在内存中，结束时统一落盘一次。
         
         Args:
             skip_time_check: 是否跳过时间范围检查（用于立即执行场景）
@@ -404,68 +477,83 @@ class TaskManager:
                 - True: 任务未到期，可以继续调度
                 - False: 任务已到期（now >= task_end_time），不应再执行
         """
+        try:
+            return await self._run_round(skip_time_check)
+        finally:
+            self._flush_context()
+
+    async def _run_round(self, skip_time_check: bool) -> bool:
+        """run_once 的实际执行逻辑"""
+        # 本轮只读取一次时钟，到期判断在整轮内保持一致
+        now = datetime.datetime.now()
+        today = now.date()
+        
         # 1. 检查任务是否已到期
         # 确保 task_end_time 不为 None
         if self.task_end_time is None:
             logger.warning(f"任务 {self.task_id} 的 task_end_time 为 None，使用默认值（30天后）")
-            self.task_end_time = datetime.date.today() + datetime.timedelta(days=30)
+            self.task_end_time = today + datetime.timedelta(days=30)
             # 保存更新后的 task_end_time 到 context
             if self.task_end_time:
-                self.context.save({"task_end_time": self.task_end_time.isoformat()})
+                self._pending_step["task_end_time"] = self.task_end_time.isoformat()
         
         # 再次检查，确保 task_end_time 不为 None（防御性编程）
         if self.task_end_time is None:
             logger.error(f"任务 {self.task_id} 的 task_end_time 仍然为 None，无法继续执行")
             return False
         
-        if datetime.date.today() >= self.task_end_time:
+        if today >= self.task_end_time:
             logger.info(f"任务 {self.task_id} 已到期（结束时间: {self.task_end_time}），不再执行")
             return False
         
         # 2. 在执行前重新从context读取最新的mode和interaction_note_count（因为可能在任务执行过程中被更新）
-        from app.data.constants import TaskMode, LogBindType
         mode_str = self.context.get('mode', TaskMode.STANDARD.value)
-        try:
-            updated_mode = TaskMode(mode_str) if isinstance(mode_str, str) else (mode_str if isinstance(mode_str, TaskMode) else TaskMode.STANDARD)
-            if updated_mode != self.mode:
+        # 原始值未变化时（绝大多数情况）无需再次转换
+        if mode_str != self._last_mode_raw:
+            updated_mode = _lookup_mode(mode_str) if isinstance(mode_str, str) else TaskMode.STANDARD
+            if updated_mode is None:
+                logger.warning(f"任务 {self.task_id} 的模式值无效: {mode_str}，使用当前值 {self.mode.value}")
+            elif updated_mode != self.mode:
                 logger.info(f"任务 {self.task_id} 模式已更新: {self.mode.value} -> {updated_mode.value}")
                 self.mode = updated_mode
-        except (ValueError, TypeError) as e:
-            logger.warning(f"任务 {self.task_id} 的模式值无效: {mode_str}，使用当前值 {self.mode.value}")
+            self._last_mode_raw = mode_str
         
         # 更新互动笔记数量
-        updated_interaction_note_count = self.context.get('interaction_note_count', 3)
-        updated_interaction_note_count = max(1, min(5, int(updated_interaction_note_count))) if updated_interaction_note_count else 3
+        updated_interaction_note_count = _clamp_interaction_note_count(self.context.get('interaction_note_count', 3))
         if updated_interaction_note_count != self.interaction_note_count:
             logger.info(f"任务 {self.task_id} 互动笔记数量已更新: {self.interaction_note_count} -> {updated_interaction_note_count}")
             self.interaction_note_count = updated_interaction_note_count
         
-        # 3. 检查任务是否是暂停状态
-        if self.task_switch.get('state') == 'PAUSE':
-            logger.debug(f"任务 {self.task_id} 第 {self.round_num} 轮次暂停，跳过本次执行")
+        # 3. 检查任务是否是暂停状态（构造时总会登记开关，缺失说明任务已删除）
+        if TaskManager._switch_registry.get(self.task_id, 'PAUSE') == 'PAUSE':
+            logger.debug("任务 {} 第 {} 轮次暂停，跳过本次执行", self.task_id, self.round_num)
             return True  # 返回True表示任务未到期，但本次因暂停未执行
         
         # 4. 检查任务是否在执行时间区间内（立即执行时跳过此检查）
         if not skip_time_check:
-            if not self._check_time_valid():
-                logger.debug(f"任务 {self.task_id} 第 {self.round_num} 轮次未执行，不在执行时间范围内")
+            if not self._check_time_valid(now):
+                logger.debug("任务 {} 第 {} 轮次未执行，不在执行时间范围内", self.task_id, self.round_num)
                 return True  # 返回True表示任务未到期，但本次因时间范围未执行
         else:
-            logger.debug(f"任务 {self.task_id} 立即执行，跳过时间范围检查")
+            logger.debug("任务 {} 立即执行，跳过时间范围检查", self.task_id)
         
-        # 5. 如果mode或interaction_note_count已更新，重新初始化agent以确保使用最新参数
-        if hasattr(self, 'agent') and self.agent is not None:
-            # 检查agent的mode是否需要更新
-            if hasattr(self.agent, 'mode') and self.agent.mode != self.mode:
-                logger.info(f"任务 {self.task_id} agent模式已更新，重新初始化agent")
-                self.agent = self._init_agent(**self.context.get_xhs_params())
-            elif hasattr(self.agent, 'interaction_note_count') and self.agent.interaction_note_count != self.interaction_note_count:
-                logger.info(f"任务 {self.task_id} agent互动笔记数量已更新，重新初始化agent")
-                self.agent = self._init_agent(**self.context.get_xhs_params())
+        # 5. 如果mode或interaction_note_count已更新，同步到agent以确保使用最新参数
+        # agent 只在 run() 时读取这两个属性，直接原地更新即可，无需重建 agent（新的 Context、MCP 客户端等）
+        agent = getattr(self, 'agent', None)
+        if agent is not None:
+            if getattr(agent, 'mode', self.mode) != self.mode:
+                logger.info(f"任务 {self.task_id} agent模式已更新: {agent.mode} -> {self.mode}")
+                agent.mode = self.mode
+            if getattr(agent, 'interaction_note_count', self.interaction_note_count) != self.interaction_note_count:
+                logger.info(
+                    f"任务 {self.task_id} agent互动笔记数量已更新: "
+                    f"{agent.interaction_note_count} -> {self.interaction_note_count}"
+                )
+                agent.interaction_note_count = self.interaction_note_count
         
         # 6. 执行任务
-        # 绑定 task_id 和 bindtype 到 logger，使得所有日志都会被收集到 TaskLogCollector
-        task_logger = logger.bind(task_id=self.task_id, bindtype=LogBindType.TASK_LOG)
+        # 使用绑定了 task_id 和 bindtype 的 logger，使得所有日志都会被收集到 TaskLogCollector
+        task_logger = self.task_logger
         task_logger.info(f"任务 {self.task_id} 第 {self.round_num} 轮次开始执行")
         
         try:
@@ -473,13 +561,8 @@ class TaskManager:
             self._mcp_service_check()
             
             # 4.2 将用户专属cookies.json文件复制到MCP服务目录
-            from app.data.constants import COOKIE_SOURCE_PATH
-            
-            user_cookies_file = os.path.join(
-                get_user_cookies_path(self.xhs_account_id), 
-                "cookies.json"
-            )
-            task_logger.debug(f"用户专属cookie地址: {user_cookies_file}")
+            user_cookies_file = self._user_cookies_file
+            task_logger.debug("用户专属cookie地址: {}", user_cookies_file)
             
             try:
                 # 尝试部署账号cookies到MCP服务目录（xhs_mcp/cookies.json）
@@ -501,12 +584,13 @@ class TaskManager:
                 
                 # 更新 TaskInfo 的登录状态
                 self.task_info.login_status = is_logged_in
-                self.task_info.login_status_checked_at = datetime.datetime.now()
+                checked_at = datetime.datetime.now()
+                self.task_info.login_status_checked_at = checked_at
                 
-                # 保存到 context.meta 中
-                self.context.update_meta(
+                # 保存到 context.meta 中（本轮结束时统一落盘）
+                self._pending_meta.update(
                     login_status=is_logged_in,
-                    login_status_checked_at=datetime.datetime.now().isoformat()
+                    login_status_checked_at=checked_at.isoformat()
                 )
                 
                 task_logger.info(f"登录状态检查完成: {'已登录' if is_logged_in else '未登录'}")
@@ -521,6 +605,8 @@ class TaskManager:
                 await self.agent.run()
             except Exception as e:
                 task_logger.warning(f"agent任务执行失败，错误：{e}")
+                # agent 失败可能是 MCP 服务异常，下一轮强制重新检查
+                self._mcp_last_check = None
                 # 即使agent执行失败，也继续执行收尾工作
             
             # 4.4 任务执行完成后，进行收尾工作
@@ -539,7 +625,7 @@ class TaskManager:
         except Exception as e:
             task_logger.error(f"任务 {self.task_id} 执行过程中发生异常: {e}", exc_info=True)
             # 即使发生异常，如果任务未到期，仍然可以继续调度
-            return datetime.date.today() < self.task_end_time
+            return today < self.task_end_time
 
 if __name__ == '__main__':
     task_test = TaskManager(
@@ -16,7 +16,7 @@ import uuid
 from pydantic import BaseModel, Field
 
 from app.utils.simple_config import get, get_int, get_bool, get_float, get_list
-from app.core.llm import LLMService
+from app.core.llm import LLMService, get_llm_service as get_shared_llm_service
 from app.core.context import Context
 
 
@@ -615,7 +615,7 @@ def get_llm_service() -> LLMService:
     """Get or create LLM service instance"""
     global _llm_service_instance
     if _llm_service_instance is None:
-        _llm_service_instance = LLMService()
+        _llm_service_instance = get_shared_llm_service()
         logger.info("✅ LLMService instance created for ContextStorage")
     return _llm_service_instance
 
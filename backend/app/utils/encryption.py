@@ -11,6 +11,7 @@ import os
 from pathlib import Path
 from typing import Any, Dict
 
+import msgpack
 from cryptography.fernet import Fernet
 
 from app.core.logger import logger
@@ -98,15 +99,18 @@ def encrypt_dict(data: Dict[str, Any]) -> bytes:
     加密字典数据，返回字节串。
     """
     f = get_fernet()
-    raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
-    return f.encrypt(raw)
+    return f.encrypt(msgpack.packb(data, use_bin_type=True))
 
 
 def decrypt_dict(token: bytes) -> Dict[str, Any]:
     """
     解密字节串为字典。
+
+    兼容旧版 JSON 明文：JSON 对象以 "{" 开头，而 msgpack 的 map 不会以该字节开头。
     """
     f = get_fernet()
     raw = f.decrypt(token)
-    return json.loads(raw.decode("utf-8"))
+    if raw[:1] == b"{":
+        return json.loads(raw.decode("utf-8"))
+    return msgpack.unpackb(raw, raw=False)
 
@@ -7,7 +7,6 @@
 
 import asyncio
 import json
-import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -17,7 +16,7 @@ from app.core.logger import logger as base_logger
 from app.data.constants import LogBindType, TASK_DATA_BASE_PATH
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """日志条目数据类"""
     timestamp: str
@@ -51,9 +50,9 @@ class TaskLogCollector:
         """
         if log_base_dir is None:
             # 默认日志目录：app/data/logs/
-            # TASK_DATA_BASE_PATH = './app/data/task_data/'
-            # 所以日志目录应该是：./app/data/logs/
-            log_base_dir = os.path.join(os.path.dirname(TASK_DATA_BASE_PATH.rstrip('/')), 'logs')
+            # TASK_DATA_BASE_PATH = <APP_DATA_DIR>/task_data
+            # 所以日志目录应该是：<APP_DATA_DIR>/logs
+            log_base_dir = TASK_DATA_BASE_PATH.parent / 'logs'
         
         self.log_base_dir = Path(log_base_dir)
         self.max_logs_per_file = max_logs_per_file
@@ -3,12 +3,26 @@ Context Module Usage Examples.
 
 This file demonstrates how to use the Context module in various scenarios
 including basic usage, agent coordination, and state management.
+
+Development-only: lives outside the ``app`` package so it is never bundled
+into the packaged backend. Run with ``python examples/context_usage.py``.
 """
 
+import asyncio
 import json
+import sys
 import time
-from datetime import datetime
-from context import Context, StepStatus
+from pathlib import Path
+
+# Add the backend root to the Python path so ``app`` is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.context import Context, StepState
+
+# Blackboard keys shared between the example agents
+CUSTOMER_INFO_KEY = "customer_info"
+ANALYSIS_RESULT_KEY = "analysis_result"
+FINAL_REPORT_KEY = "final_report"
 
 
 def basic_context_usage_example():
@@ -42,53 +56,62 @@ def basic_context_usage_example():
     print(json.dumps(summary, indent=2, default=str))
 
 
-def runtime_management_example():
+async def runtime_management_example():
     """Runtime state management example."""
     print("\n=== Runtime Management Example ===")
 
     context = Context.create_new("Analyze website performance")
 
-    # Add some steps
+    # Add some steps: (description, agent, index of the step it depends on)
     steps = [
-        ("Navigate to website", "web_agent"),
-        ("Measure load times", "analyzer"),
-        ("Generate report", "reporter")
+        ("Navigate to website", "web_agent", None),
+        ("Measure load times", "analyzer", 0),
+        ("Check broken links", "analyzer", 0),
+        ("Generate report", "reporter", 1)
     ]
 
     step_ids = []
-    for description, agent in steps:
+    for description, agent, _ in steps:
         step_id = context.runtime.add_step(description, agent)
         step_ids.append(step_id)
 
-    # Simulate step execution
-    for i, step_id in enumerate(step_ids):
+    # One completion event per step, so dependents wait only on their predecessor
+    done_events = [asyncio.Event() for _ in step_ids]
+
+    async def run_step(i: int):
+        depends_on = steps[i][2]
+        if depends_on is not None:
+            await done_events[depends_on].wait()
+
+        step_id = step_ids[i]
+        step = context.runtime.execution_plan[i]
         print(f"\n--- Step {i+1} ---")
 
         # Start step
-        context.runtime.set_step_status(step_id, "running")
-        current_step = context.runtime.get_current_step()
-        print(f"Starting: {current_step.description}")
+        context.runtime.set_step_status(step_id, StepState.RUNNING)
+        print(f"Starting: {step.description}")
 
         # Simulate work
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
 
         # Complete step
         result = {"output": f"Step {i+1} completed successfully", "metrics": {"time": 0.1}}
-        context.runtime.set_step_status(step_id, "success", result=result)
+        context.runtime.set_step_status(step_id, StepState.SUCCESS, result=result)
 
         # Log action
         context.log_action(
-            agent_name=current_step.agent_name,
-            action=current_step.description,
+            agent_name=step.agent_name,
+            action=step.description,
             result=result,
             duration_ms=100
         )
 
-        print(f"Completed: {current_step.description}")
+        print(f"Completed: {step.description}")
+        done_events[i].set()
 
-        # Move to next step
-        if not context.runtime.advance_to_next_step():
-            break
+    # Independent steps run concurrently; dependent ones start once their predecessor is done
+    await asyncio.gather(*(run_step(i) for i in range(len(step_ids))))
+    context.runtime.current_step_index = len(step_ids) - 1
 
     # Mark execution as completed
     context.runtime.is_completed = True
@@ -111,30 +134,30 @@ def blackboard_communication_example():
         "email": "john@example.com",
         "preferences": ["tech", "business"]
     }
-    context.set_shared_data("customer_info", web_data)
+    context.set_shared_data(CUSTOMER_INFO_KEY, web_data)
     context.log_action("web_agent", "Collected customer information", web_data)
 
-    print(f"Web Agent stored: {context.get_shared_data('customer_info')}")
+    print(f"Web Agent stored: {context.get_shared_data(CUSTOMER_INFO_KEY)}")
 
     # Analyzer Agent processes data
-    customer_info = context.get_shared_data("customer_info")
+    customer_info = context.get_shared_data(CUSTOMER_INFO_KEY)
     analysis_result = {
         "customer_segment": "premium",
         "engagement_score": 85,
         "recommendations": ["tech_news", "business_insights"]
     }
-    context.set_shared_data("analysis_result", analysis_result)
+    context.set_shared_data(ANALYSIS_RESULT_KEY, analysis_result)
     context.log_action("analyzer", "Analyzed customer data", analysis_result)
 
-    print(f"Analyzer Agent stored: {context.get_shared_data('analysis_result')}")
+    print(f"Analyzer Agent stored: {context.get_shared_data(ANALYSIS_RESULT_KEY)}")
 
     # Reporter Agent uses both data sources
     combined_data = {
-        "customer": context.get_shared_data("customer_info"),
-        "analysis": context.get_shared_data("analysis_result"),
-        "report_generated_at": datetime.now().isoformat()
+        "customer": context.get_shared_data(CUSTOMER_INFO_KEY),
+        "analysis": context.get_shared_data(ANALYSIS_RESULT_KEY),
+        "report_generated_at": time.time_ns()
     }
-    context.set_shared_data("final_report", combined_data)
+    context.set_shared_data(FINAL_REPORT_KEY, combined_data)
     context.log_action("reporter", "Generated final report", combined_data)
 
     print(f"Final Report: {json.dumps(combined_data, indent=2)}")
@@ -190,18 +213,15 @@ def memory_and_checkpoint_example():
     for i, memory in enumerate(context.history.short_term_memory, 1):
         print(f"  {i}. {memory}")
 
-    # Create checkpoint
-    checkpoint_id = context.create_checkpoint()
-    print(f"\nCreated checkpoint: {checkpoint_id}")
-    print(f"Checkpoint data available in blackboard: checkpoint_{checkpoint_id}")
-
-    # Add more actions after checkpoint
+    # Log actions before checkpointing
     context.log_action("processor", "Processing data", {"records": 150})
     context.log_action("validator", "Validating results", {"valid": 148, "invalid": 2})
 
-    # Create snapshot
-    snapshot = context.create_snapshot()
-    print(f"\nCreated snapshot with {len(snapshot)} keys")
+    # Create checkpoint and snapshot in one pass
+    checkpoint_id, snapshot = context.create_checkpoint_and_snapshot()
+    print(f"\nCreated checkpoint: {checkpoint_id}")
+    print(f"Checkpoint data available in blackboard: checkpoint_{checkpoint_id}")
+    print(f"Created snapshot with {len(snapshot)} keys")
     print(f"Snapshot includes history: {'history' in snapshot}")
 
     # Get recent actions
@@ -241,6 +261,16 @@ def serialization_example():
     print(f"Action log count: {len(restored_context.history.action_log)}")
     print(f"Memory entries: {len(restored_context.history.short_term_memory)}")
 
+    # Delta restore: keep a base snapshot and replay only later mutations
+    base = original_context.snapshot_base()
+    original_context.add_step("Test delta restore", "test_agent")
+    original_context.log_action("test_agent", "Testing delta restore")
+    mutations = original_context.get_mutations()
+    delta_context = Context.restore(base, mutations)
+    print(f"Mutations since base: {len(mutations)}")
+    print(f"Delta-restored steps: {len(delta_context.runtime.execution_plan)}")
+    print(f"Delta-restored action log count: {len(delta_context.history.action_log)}")
+
 
 def main():
     """Run all context usage examples."""
@@ -248,7 +278,7 @@ def main():
     print("=" * 50)
 
     basic_context_usage_example()
-    runtime_management_example()
+    asyncio.run(runtime_management_example())
     blackboard_communication_example()
     interrupt_handling_example()
     memory_and_checkpoint_example()
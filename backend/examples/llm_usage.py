@@ -0,0 +1,57 @@
+"""
+LLM Service Usage Example.
+
+Runs a health check and one structured generation against the configured
+provider (requires an API key in config or environment).
+
+Development-only: lives outside the ``app`` package so it is never bundled
+into the packaged backend. Run with ``python examples/llm_usage.py``.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from pydantic import BaseModel
+
+# Add the backend root to the Python path so ``app`` is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.llm import get_llm_service
+
+
+class Poem(BaseModel):
+    """Example structured output model."""
+    title: str
+    verses: list[str]
+    sentiment: str
+
+
+async def main():
+    """Test the LLM service with a simple example."""
+    llm_service = get_llm_service()
+    try:
+        # Health check
+        health = await llm_service.health_check()
+        print("Health check:", health)
+
+        # Test structured generation
+        poem = await llm_service.generate(
+            prompt="Write a short haiku about artificial intelligence",
+            response_model=Poem,
+            system_prompt="You are a creative poet who writes concise, meaningful poems."
+        )
+
+        print("Generated poem:")
+        print(f"Title: {poem.title}")
+        print(f"Verses: {poem.verses}")
+        print(f"Sentiment: {poem.sentiment}")
+
+    except Exception as e:
+        print(f"Error testing LLM service: {e}")
+    finally:
+        await llm_service.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
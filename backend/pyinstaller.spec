@@ -109,7 +109,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['examples'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -0,0 +1,34 @@
+"""
+调度器测试共用的辅助函数
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Optional
+
+from app.manager.task_dispatcher import TaskDispatcher
+from app.manager.task_info import TaskInfo
+
+
+def make_task(task_id: str, account_id: Optional[str] = None, next_time: Optional[datetime] = None) -> TaskInfo:
+    """构造一个不依赖真实 TaskManager 的任务信息（task_manager 只提供调度器用到的属性）"""
+    return TaskInfo(
+        task_id=task_id,
+        account_id=account_id or f"account-{task_id}",
+        account_name="",
+        task_type="xiaohongshu",
+        task_manager=SimpleNamespace(round_num=0, task_remove=lambda: None),
+        interval=3600,
+        valid_time_range=[8, 22],
+        task_end_time=date.today() + timedelta(days=30),
+        next_execution_time=next_time,
+    )
+
+
+def register_task(dispatcher: TaskDispatcher, task_info: TaskInfo) -> TaskInfo:
+    """把任务登记到调度器的注册表和状态索引中（跳过 add_task 的 TaskManager 创建）"""
+    dispatcher.all_tasks[task_info.task_id] = task_info
+    dispatcher._tasks_by_status[task_info.status][task_info.task_id] = task_info
+    dispatcher.account_tasks.setdefault(task_info.account_id, set()).add(task_info.task_id)
+    dispatcher._account_index[(task_info.task_type, task_info.account_id)] = task_info.task_id
+    return task_info
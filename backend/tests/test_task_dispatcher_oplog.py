@@ -0,0 +1,127 @@
+"""
+调度器状态持久化测试：快照 + 操作日志（JSONL）的回放、跳过与压缩
+"""
+
+import json
+
+import pytest
+
+from app.manager.task_dispatcher import TaskDispatcher
+from tests.dispatcher_helpers import make_task, register_task
+
+
+def _write_snapshot(dispatcher: TaskDispatcher, oplog_seq: int, tasks: list):
+    dispatcher._config_file.write_text(json.dumps({"version": "1.0", "oplog_seq": oplog_seq, "tasks": tasks}))
+
+
+def _write_oplog(dispatcher: TaskDispatcher, records: list, tail: bytes = b""):
+    lines = b"".join(json.dumps(record).encode() + b"\n" for record in records)
+    dispatcher._oplog_file.write_bytes(lines + tail)
+
+
+def _tasks_by_id(config_data: dict) -> dict:
+    return {task["task_id"]: task for task in config_data["tasks"]}
+
+
+@pytest.mark.asyncio
+async def test_replay_applies_upserts_and_removes_on_top_of_snapshot(tmp_path):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    kept = register_task(dispatcher, make_task("kept"))
+    removed = register_task(dispatcher, make_task("removed"))
+    dispatcher._compact_state_sync()
+
+    # 快照之后：修改一个任务、删除一个任务、新增一个任务，只写操作日志
+    kept.interval = 7200
+    del dispatcher.all_tasks[removed.task_id]
+    register_task(dispatcher, make_task("added"))
+    await dispatcher._append_oplog()
+
+    restored = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    config_data = restored._read_state_data()
+    tasks = _tasks_by_id(config_data)
+    assert set(tasks) == {"kept", "added"}
+    assert tasks["kept"]["interval"] == 7200
+    assert config_data["account_tasks"] == {"account-kept": ["kept"], "account-added": ["added"]}
+    assert restored._oplog_seq == 3
+
+
+def test_replay_skips_records_already_in_snapshot(tmp_path):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    _write_snapshot(dispatcher, 2, [{"task_id": "a", "account_id": "x", "interval": 1}])
+    _write_oplog(dispatcher, [
+        {"seq": 1, "op": "remove", "task_id": "a"},
+        {"seq": 2, "op": "upsert", "task": {"task_id": "b", "account_id": "y", "interval": 2}},
+        {"seq": 3, "op": "upsert", "task": {"task_id": "a", "account_id": "x", "interval": 5}},
+    ])
+
+    config_data = dispatcher._read_state_data()
+
+    tasks = _tasks_by_id(config_data)
+    assert set(tasks) == {"a"}
+    assert tasks["a"]["interval"] == 5
+    assert dispatcher._oplog_seq == 3
+
+
+def test_replay_ignores_truncated_last_line(tmp_path):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    _write_snapshot(dispatcher, 0, [])
+    # 崩溃时只写了一半的最后一行
+    _write_oplog(
+        dispatcher,
+        [{"seq": 1, "op": "upsert", "task": {"task_id": "a", "account_id": "x"}}],
+        tail=b'{"seq": 2, "op": "upsert", "task": {"task_id": "b"',
+    )
+
+    config_data = dispatcher._read_state_data()
+
+    assert set(_tasks_by_id(config_data)) == {"a"}
+    assert dispatcher._oplog_seq == 1
+
+
+@pytest.mark.asyncio
+async def test_compaction_writes_snapshot_and_truncates_oplog(tmp_path):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    register_task(dispatcher, make_task("a"))
+    await dispatcher._append_oplog()
+    assert dispatcher._oplog_file.exists()
+    assert dispatcher._oplog_lines == 1
+
+    await dispatcher._compact_state(fsync=True)
+
+    assert not dispatcher._oplog_file.exists()
+    assert dispatcher._oplog_lines == 0
+    snapshot = json.loads(dispatcher._config_file.read_bytes())
+    assert snapshot["oplog_seq"] == 1
+    assert [task["task_id"] for task in snapshot["tasks"]] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_truncation_keeps_records_appended_after_the_snapshot(tmp_path):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    register_task(dispatcher, make_task("a"))
+    await dispatcher._append_oplog()
+
+    # 快照序列化时日志序号为 0，之后又追加了记录：日志必须保留
+    dispatcher._truncate_oplog(0)
+
+    assert dispatcher._oplog_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_append_keeps_changes_for_the_next_save(tmp_path, monkeypatch):
+    dispatcher = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    register_task(dispatcher, make_task("a"))
+
+    def fail(data: bytes):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dispatcher, "_write_oplog_bytes", fail)
+    await dispatcher._append_oplog()
+    assert dispatcher._oplog_seq == 0
+    assert not dispatcher._oplog_file.exists()
+
+    monkeypatch.undo()
+    await dispatcher._append_oplog()
+    assert dispatcher._oplog_seq == 1
+    restored = TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+    assert set(_tasks_by_id(restored._read_state_data())) == {"a"}
@@ -0,0 +1,89 @@
+"""
+调度时间轮测试：按版本号惰性失效、删除任务、当前分钟桶内的到期判断与压缩
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.manager.task_dispatcher import TaskDispatcher
+from tests.dispatcher_helpers import make_task, register_task
+
+# 对齐到分钟桶起点的基准时间，便于构造同一桶内的时间点
+BASE = datetime.fromtimestamp(60 * 29_000_000)
+
+
+@pytest.fixture
+def dispatcher(tmp_path):
+    return TaskDispatcher(dispatcher_dir=str(tmp_path), load_state=False)
+
+
+def _schedule(dispatcher: TaskDispatcher, task_id: str, next_time: datetime):
+    task_info = dispatcher.all_tasks.get(task_id) or register_task(dispatcher, make_task(task_id))
+    dispatcher._reschedule(task_info, next_time)
+    return task_info
+
+
+def test_rescheduled_task_skips_stale_entry(dispatcher):
+    task_info = _schedule(dispatcher, "a", BASE - timedelta(minutes=5))
+    _schedule(dispatcher, "a", BASE + timedelta(hours=1))
+
+    # 旧条目已到期但版本号过期，不能再被取出
+    assert dispatcher._pop_due(BASE) == []
+    assert dispatcher._next_due_ts() == (BASE + timedelta(hours=1)).timestamp()
+    assert dispatcher._pop_due(BASE + timedelta(hours=1)) == [task_info]
+    assert dispatcher._pop_due(BASE + timedelta(hours=2)) == []
+
+
+def test_rescheduled_earlier_task_is_popped_once(dispatcher):
+    task_info = _schedule(dispatcher, "a", BASE - timedelta(minutes=5))
+    _schedule(dispatcher, "a", BASE - timedelta(minutes=1))
+
+    assert dispatcher._pop_due(BASE) == [task_info]
+    assert dispatcher._next_due_ts() is None
+
+
+@pytest.mark.asyncio
+async def test_removed_task_is_never_due(dispatcher):
+    _schedule(dispatcher, "a", BASE - timedelta(minutes=1))
+    kept = _schedule(dispatcher, "b", BASE)
+
+    assert await dispatcher.remove_task("a")
+
+    assert dispatcher._next_due_ts() == BASE.timestamp()
+    assert dispatcher._pop_due(BASE) == [kept]
+
+
+def test_task_due_in_current_minute_bucket(dispatcher):
+    due = _schedule(dispatcher, "due", BASE + timedelta(seconds=10))
+    later = _schedule(dispatcher, "later", BASE + timedelta(seconds=50))
+    now = BASE + timedelta(seconds=30)
+
+    # 同一分钟桶内只取出已到期的条目，未到期的留在桶中
+    assert dispatcher._pop_due(now) == [due]
+    assert dispatcher._next_due_ts() == later.next_execution_time.timestamp()
+    assert dispatcher._pop_due(later.next_execution_time) == [later]
+    assert dispatcher._min_bucket is None
+
+
+def test_due_tasks_are_ordered_by_time(dispatcher):
+    second = _schedule(dispatcher, "second", BASE - timedelta(seconds=10))
+    first = _schedule(dispatcher, "first", BASE - timedelta(minutes=3))
+
+    assert dispatcher._pop_due(BASE) == [first, second]
+
+
+def test_next_due_ts_after_compaction(dispatcher):
+    _schedule(dispatcher, "b", BASE + timedelta(minutes=30))
+    # 反复调整远期任务会堆积失效条目，超过阈值时自动压缩
+    for minutes in range(60, 0, -1):
+        _schedule(dispatcher, "a", BASE + timedelta(hours=2, minutes=minutes))
+    assert dispatcher._wheel_size <= 2 * len(dispatcher._schedule_version) + 16
+
+    dispatcher._compact_wheel()
+
+    assert dispatcher._wheel_size == 2
+    assert dispatcher._min_bucket == min(dispatcher._wheel)
+    assert dispatcher._next_due_ts() == (BASE + timedelta(minutes=30)).timestamp()
+    assert [task.task_id for task in dispatcher._pop_due(BASE + timedelta(hours=3))] == ["b", "a"]
+    assert dispatcher.all_tasks["a"].next_execution_time == BASE + timedelta(hours=2, minutes=1)